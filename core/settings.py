@@ -51,6 +51,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'forum_app.api.instrumentation.InstrumentationMiddleware',
+    'forum_app.replicas.ReplicaMiddleware',
 ]
 
 CSRF_TRUSTED_ORIGINS = [
@@ -90,9 +92,23 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Verbindungen über Requests hinweg wiederverwenden (PRAGMAs nur einmal pro Verbindung).
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Lokales Lesereplikat: Kopie von db.sqlite3, aktualisiert per ``manage.py sync_replicas``.
+# Genutzt wird es erst, wenn es in FORUM_REPLICAS['DATABASES'] steht. In Tests
+# spiegelt es die Testdatenbank.
+DATABASES['replica'] = {
+    **DATABASES['default'],
+    'NAME': BASE_DIR / 'db.replica.sqlite3',
+    'TEST': {'MIRROR': 'default'},
+}
+
+DATABASE_ROUTERS = ['forum_app.replicas.ReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -137,20 +153,19 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'forum_app.api.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'forum_app.api.throttling.SharedAnonRateThrottle',
+        'forum_app.api.throttling.SharedUserRateThrottle'
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '50/day',
         'user': '60/day',
         'question': '5/day',
-        'question-scope': '10/day',
         'question-get': '10/day',
         'question-post': '2/day',
         'question-put': '2/day',
@@ -160,5 +175,117 @@ REST_FRAMEWORK = {
     },
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend'
-    ]
+    ],
+    # Wie JSONRenderer, aber mit orjson, falls installiert (siehe forum_app/api/renderers.py).
+    'DEFAULT_RENDERER_CLASSES': [
+        'forum_app.api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
+# Response-Cache für lesende Forum-Endpunkte (siehe forum_app/api/caching.py).
+# Für mehrere Worker-Prozesse: 'forum_app.api.caching.FileLRUBackend' mit 'location', einem
+# privaten Verzeichnis des Server-Users (0700, nicht unter /tmp).
+FORUM_RESPONSE_CACHE = {
+    'ENABLED': True,
+    'BACKEND': 'forum_app.api.caching.LocMemLRUBackend',
+    'OPTIONS': {'max_entries': 1000},
+}
+
+# Request-Instrumentierung der Forum-API (siehe forum_app/api/instrumentation.py).
+# In Produktion SAMPLE_RATE senken, z.B. 0.05.
+FORUM_INSTRUMENTATION = {
+    'ENABLED': True,
+    'SAMPLE_RATE': 1.0,
+    'SERVER_TIMING': DEBUG,
+    'DUPLICATE_QUERY_THRESHOLD': 5,
+}
+
+# Geteilter Zustand der Throttles (siehe forum_app/api/throttling.py). Die Datei
+# muss für alle Worker-Prozesse auf dem Host erreichbar sein.
+FORUM_THROTTLE = {
+    'BACKEND': 'forum_app.api.throttling.SQLiteThrottleStore',
+    'OPTIONS': {},
+}
+
+# Tests drosseln im Prozessspeicher statt in der Datei von FORUM_THROTTLE.
+TEST_RUNNER = 'forum_app.tests.runner.ForumTestRunner'
+
+# Cache für die Token->User-Auflösung (siehe forum_app/api/authentication.py).
+# 'CACHE' sollte bei mehreren Workern auf einen geteilten Cache zeigen; bei einem
+# prozesslokalen LocMemCache gilt statt 'TIMEOUT' nur 'LOCAL_TTL'.
+FORUM_TOKEN_CACHE = {
+    'CACHE': 'default',
+    'TIMEOUT': 300,
+    'LOCAL_TTL': 30,
+    'MAX_ENTRIES': 10000,
+}
+
+# Hot-Ranking der Fragen (siehe forum_app/ranking.py). Nach Änderungen an
+# Halbwertszeit oder Gewichten ``manage.py rebuild_hot_scores`` ausführen.
+FORUM_HOT = {
+    'HALF_LIFE_HOURS': 24,
+    'QUESTION_WEIGHT': 1.0,
+    'LIKE_WEIGHT': 1.0,
+    'ANSWER_WEIGHT': 2.0,
+}
+
+# PRAGMAs für jede SQLite-Verbindung (siehe forum_app/sqlite.py).
+FORUM_SQLITE = {
+    'JOURNAL_MODE': 'WAL',
+    'SYNCHRONOUS': 'NORMAL',
+    'BUSY_TIMEOUT_MS': 5000,
+    'MMAP_SIZE': 256 * 1024 * 1024,
+    'CACHE_SIZE_KIB': 64 * 1024,
+    # Nur forum_app.sqlite.write_transaction; lesende Transaktionen bleiben DEFERRED.
+    'WRITE_TRANSACTION_MODE': 'IMMEDIATE',
+}
+
+# Lesereplikate (siehe forum_app/replicas.py), z.B. 'DATABASES': ['replica'] nach
+# ``manage.py sync_replicas``.
+FORUM_REPLICAS = {
+    'DATABASES': [],
+    'PIN_SECONDS': 5,
+    # Muss ein geteilter Cache sein (z.B. Redis), sonst gilt die Bindung nur im jeweiligen Worker.
+    'CACHE': 'default',
+    'ALLOW_LOCAL_CACHE': False,
+}
+
+# Listen aus values()-Zeilen statt über die Serializer (siehe forum_app/api/fastpath.py).
+FORUM_FAST_PATH = {
+    'ENABLED': True,
+}
+
+# Write-behind für Likes (siehe forum_app/likequeue.py). Bei ENABLED True muss
+# ``manage.py process_like_queue --interval 1`` laufen.
+FORUM_LIKE_QUEUE = {
+    'ENABLED': False,
+    'PATH': BASE_DIR / 'like_queue.sqlite3',
+    'BATCH_SIZE': 500,
+    'SYNCHRONOUS': 'FULL',
+}
+
+# Hintergrundaufgaben (siehe forum_app/tasks.py). Bei DEFERRED True pflegt
+# ``manage.py run_tasks --interval 1`` Zähler, Hot-Ranking und Suchindex.
+FORUM_TASKS = {
+    'DEFERRED': False,
+    'BATCH_SIZE': 100,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_DELAY_SECONDS': 10,
+    'LEASE_SECONDS': 300,
+}
+
+# Server-Sent Events je Frage (siehe forum_app/events.py, nur unter ASGI).
+FORUM_EVENTS = {
+    'BUFFER_SIZE': 100,
+    'QUEUE_SIZE': 1000,
+    'MAX_BUFFERED_QUESTIONS': 10000,
+    'HEARTBEAT_SECONDS': 15,
+}
+
+# Änderungsprotokoll für GET /api/forum/changes/ (siehe forum_app/changes.py).
+# ``manage.py compact_changes`` entfernt überholte Einträge.
+FORUM_CHANGES = {
+    'PAGE_SIZE': 500,
+    'MAX_PAGE_SIZE': 1000,
 }
@@ -1,31 +1,91 @@
 from django.contrib import admin
-from forum_app.models import Question, Answer, Like
+from django.core.paginator import Paginator
+from django.db.models import F
+from django.db.models.functions import Substr
+from django.utils.functional import cached_property
+from forum_app.models import Question, Answer, Like, Task
 
 # Register your models here.
 # admin.site.register(Question),
 # admin.site.register(Answer),
 # admin.site.register(Like),
 
+# Länge der Textvorschau in den Listen; gekürzt wird schon in SQL.
+PREVIEW_LENGTH = 80
+
+
+class CappedCountPaginator(Paginator):
+    """
+    Zählt höchstens ``max_count`` + 1 Zeilen statt COUNT(*) über die ganze Tabelle.
+    Bei mehr Treffern zeigt die Liste ``max_count`` an; weiter hinten liegende
+    Zeilen erreicht man über Filter und Suche.
+    """
+    max_count = 10000
+
+    @cached_property
+    def count(self):
+        # Nur die IDs, ohne Sortierung: Annotationen wie die Textvorschau würden sonst mitlaufen.
+        rows = self.object_list.values('pk').order_by()[:self.max_count + 1]
+        return min(rows.count(), self.max_count)
+
+
+class ForumModelAdmin(admin.ModelAdmin):
+    paginator = CappedCountPaginator
+    # Kein zusätzliches COUNT(*) über die ungefilterte Tabelle ("x von y").
+    show_full_result_count = False
+
 
 @admin.register(Question)
-class BoardAdmin(admin.ModelAdmin):
-    list_display = ('id', 'title', 'content', 'author', 'created_at', 'category')
+class QuestionAdmin(ForumModelAdmin):
+    list_display = ('id', 'title', 'content_preview', 'author', 'created_at', 'category')
     list_filter = ["category"]
+    list_select_related = ('author',)
+    # Passend zum Index (category, created_at, id): Filtern und Sortieren ohne Sortierschritt.
+    ordering = ('-created_at', '-id')
+
+    def get_queryset(self, request):
+        return (super().get_queryset(request).defer('content')
+                .annotate(content_preview=Substr('content', 1, PREVIEW_LENGTH)))
+
+    def content_preview(self, obj):
+        return obj.content_preview
+    content_preview.short_description = 'Content'
 
 
 @admin.register(Answer)
-class BoardAdmin(admin.ModelAdmin):
-    list_display = ('id', 'content', 'author', 'question_title', 'created_at')
-    
+class AnswerAdmin(ForumModelAdmin):
+    list_display = ('id', 'content_preview', 'author', 'question_title', 'created_at')
+    list_select_related = ('author',)
+
+    def get_queryset(self, request):
+        return (super().get_queryset(request).defer('content')
+                .annotate(content_preview=Substr('content', 1, PREVIEW_LENGTH),
+                          question_title=F('question__title')))
+
+    def content_preview(self, obj):
+        return obj.content_preview
+    content_preview.short_description = 'Content'
+
     def question_title(self, obj):
-        return obj.question.title
+        return obj.question_title
     question_title.short_description = 'Question'
 
 
 @admin.register(Like)
-class BoardAdmin(admin.ModelAdmin):
+class LikeAdmin(ForumModelAdmin):
     list_display = ('id', 'user', 'question_title', 'created_at')
-    
+    list_select_related = ('user',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(question_title=F('question__title'))
+
     def question_title(self, obj):
-        return obj.question.title
+        return obj.question_title
     question_title.short_description = 'Question'
+
+
+@admin.register(Task)
+class TaskAdmin(ForumModelAdmin):
+    list_display = ('id', 'name', 'args', 'status', 'attempts', 'run_after', 'last_error')
+    list_filter = ['status']
+    ordering = ('run_after', 'id')
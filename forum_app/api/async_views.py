@@ -0,0 +1,189 @@
+"""
+Native Async-Lesepfade für Fragen und Antworten (für den Betrieb unter ASGI).
+
+Die DRF-Views sind synchron; unter ASGI belegt jeder Request für seine ganze
+Laufzeit einen Thread. Diese Views laden die Daten über Djangos Async-ORM
+(aiterator/aget) und serialisieren mit denselben Serializern, sodass die
+Antworten den synchronen Endpunkten entsprechen. Die Listen sind immer
+keyset-paginiert (``cursor``/``page_size``), Fragen nach (created_at, id),
+Antworten nach id; ``?fields=`` und ``?expand=`` funktionieren wie gewohnt.
+
+Djangos Async-ORM führt die eigentlichen Queries weiterhin in einem
+Datenbank-Thread aus; zwischen den Queries (Middleware, Serialisierung,
+Rendering, Warten auf den Client) hält ein Request aber keinen Thread mehr.
+"""
+import base64
+import binascii
+
+from asgiref.sync import sync_to_async
+from django.db.models import Q
+from django.http import HttpResponse
+from django.utils.dateparse import parse_datetime
+from django.views import View
+from rest_framework.utils.urls import replace_query_param
+
+from forum_app.models import Question, Answer
+from .mixins import SparseFieldsetMixin
+from .renderers import FastJSONRenderer
+from .serializers import QuestionSerializer, AnswerSerializer
+from .throttling import AsyncAnonRateThrottle
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class AsyncReadView(SparseFieldsetMixin, View):
+    http_method_names = ['get', 'head', 'options']
+    serializer_class = None
+    throttle_classes = [AsyncAnonRateThrottle]
+    action = None
+    page_size = 20
+    max_page_size = 100
+
+    def get_serializer_class(self):
+        return self.serializer_class
+
+    def get_throttles(self):
+        return [throttle() for throttle in self.throttle_classes]
+
+    def serialize(self, instance, many=False):
+        context = {'request': self.request, 'fields': self.get_sparse_fields(), 'expand': self.get_expand()}
+        return self.get_serializer_class()(instance, many=many, context=context).data
+
+    def render(self, data, status=200, headers=None):
+        return HttpResponse(FastJSONRenderer().render(data), status=status,
+                            content_type='application/json', headers=headers)
+
+    async def get(self, request, *args, **kwargs):
+        for throttle in self.get_throttles():
+            # Der SQLite-Store blockiert (UPSERT, ggf. Warten auf die Sperre); nicht in der Event-Loop.
+            if not await sync_to_async(throttle.allow_request)(request, self):
+                wait = throttle.wait()
+                return self.render(
+                    {'detail': f'Request was throttled. Expected available in {wait} seconds.'},
+                    status=429, headers={'Retry-After': str(wait)} if wait else None)
+        try:
+            return await self.handle(request, *args, **kwargs)
+        except InvalidCursor:
+            return self.render({'detail': 'Invalid cursor'}, status=404)
+
+    async def handle(self, request, *args, **kwargs):
+        raise NotImplementedError
+
+    def get_page_size(self):
+        try:
+            size = int(self.request.GET.get('page_size', self.page_size))
+        except ValueError:
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+
+class AsyncListView(AsyncReadView):
+    action = 'list'
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def cursor_filter(self, position):
+        """Filter für alle Zeilen nach ``position`` (dekodierter Cursor)."""
+        raise NotImplementedError
+
+    def cursor_position(self, instance):
+        raise NotImplementedError
+
+    def decode_cursor(self):
+        encoded = self.request.GET.get('cursor')
+        if not encoded:
+            return None
+        try:
+            return base64.urlsafe_b64decode(encoded.encode()).decode()
+        except (binascii.Error, UnicodeDecodeError):
+            raise InvalidCursor(encoded)
+
+    async def handle(self, request, *args, **kwargs):
+        queryset = self.narrow_queryset(self.get_queryset())
+        position = self.decode_cursor()
+        if position is not None:
+            queryset = queryset.filter(self.cursor_filter(position))
+        page_size = self.get_page_size()
+        # Eine Zeile mehr laden, um zu wissen, ob es eine nächste Seite gibt.
+        items = [item async for item in queryset[:page_size + 1].aiterator(chunk_size=page_size + 1)]
+
+        next_url = None
+        if len(items) > page_size:
+            items = items[:page_size]
+            cursor = base64.urlsafe_b64encode(self.cursor_position(items[-1]).encode()).decode()
+            next_url = replace_query_param(request.build_absolute_uri(), 'cursor', cursor)
+        return self.render({'next': next_url, 'previous': None, 'results': self.serialize(items, many=True)})
+
+
+class AsyncDetailView(AsyncReadView):
+    action = 'retrieve'
+    model = None
+
+    async def handle(self, request, pk):
+        queryset = self.narrow_queryset(self.model.objects.all())
+        try:
+            instance = await queryset.aget(pk=pk)
+        except self.model.DoesNotExist:
+            return self.render(
+                {'detail': f'No {self.model._meta.object_name} matches the given query.'}, status=404)
+        return self.render(self.serialize(instance))
+
+
+class AsyncQuestionListView(AsyncListView):
+    serializer_class = QuestionSerializer
+    # Wie QuestionViewSet: die Liste liefert ohne ?expand= keine Relationen.
+    default_expand = {'list': ()}
+    required_columns = ('created_at', 'id')
+
+    def get_queryset(self):
+        return Question.objects.order_by('created_at', 'id')
+
+    def cursor_filter(self, position):
+        created_at, _, pk = position.rpartition('|')
+        try:
+            # Wohlgeformt, aber unmöglich (z.B. Monat 13) wirft ValueError statt None.
+            created_at = parse_datetime(created_at)
+        except (ValueError, TypeError):
+            raise InvalidCursor(position)
+        if created_at is None or not pk.isdigit():
+            raise InvalidCursor(position)
+        return Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=int(pk))
+
+    def cursor_position(self, instance):
+        return f'{instance.created_at.isoformat()}|{instance.pk}'
+
+
+class AsyncQuestionDetailView(AsyncDetailView):
+    serializer_class = QuestionSerializer
+    model = Question
+
+
+class AsyncAnswerListView(AsyncListView):
+    serializer_class = AnswerSerializer
+    required_columns = ('id',)
+
+    def get_queryset(self):
+        queryset = Answer.objects.order_by('id')
+        author = self.request.GET.get('author')
+        if author is not None:
+            queryset = queryset.filter(author__username=author)
+        question = self.request.GET.get('question')
+        if question is not None and question.isdigit():
+            queryset = queryset.filter(question_id=int(question))
+        return queryset
+
+    def cursor_filter(self, position):
+        if not position.isdigit():
+            raise InvalidCursor(position)
+        return Q(id__gt=int(position))
+
+    def cursor_position(self, instance):
+        return str(instance.pk)
+
+
+class AsyncAnswerDetailView(AsyncDetailView):
+    serializer_class = AnswerSerializer
+    model = Answer
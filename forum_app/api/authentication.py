@@ -0,0 +1,150 @@
+"""
+Token-Authentifizierung mit Cache für die Token->User-Auflösung.
+
+TokenAuthentication lädt bei jedem Request Token und User per Join aus der
+Datenbank. CachedTokenAuthentication schaut zuerst in ein begrenztes LRU im
+Prozess (mit TTL), dann in einen geteilten Django-Cache und erst danach in die
+Datenbank. Gecacht werden nur die User-ID und die Flags is_active, is_staff
+und is_superuser, kein Passwort-Hash; request.user ist ein User mit
+zurückgestellten Feldern, alles Weitere lädt Django beim ersten Zugriff nach.
+
+Löschen eines Tokens und Änderungen am User (z.B. Deaktivierung) entfernen die
+Einträge über forum_app.signals aus dem LRU dieses Prozesses und aus dem
+geteilten Cache. LRUs anderer Prozesse laufen spätestens nach 'LOCAL_TTL'
+Sekunden ab; das ist die maximale Verzögerung, bis ein gelöschtes Token
+überall abgelehnt wird. Das gilt nur, wenn 'CACHE' wirklich geteilt ist (Redis,
+Memcached, Datenbank). Ein prozesslokaler LocMemCache erreicht die
+Invalidierung anderer Worker nie; Einträge dort leben deshalb ebenfalls nur
+'LOCAL_TTL' statt 'TIMEOUT' Sekunden.
+
+Konfiguration über settings.FORUM_TOKEN_CACHE:
+    'CACHE': Alias in settings.CACHES, 'TIMEOUT': TTL im geteilten Cache,
+    'LOCAL_TTL': TTL im Prozess (0 = kein LRU), 'MAX_ENTRIES': Größe des LRU.
+"""
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+DEFAULT_SETTINGS = {
+    'CACHE': 'default',
+    'TIMEOUT': 300,
+    'LOCAL_TTL': 30,
+    'MAX_ENTRIES': 10000,
+}
+
+
+class TokenCache:
+    def __init__(self, cache_alias, timeout, local_ttl, max_entries):
+        self.cache_alias = cache_alias
+        self.timeout = timeout
+        self.local_ttl = local_ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._local = OrderedDict()
+
+    @property
+    def shared(self):
+        return caches[self.cache_alias]
+
+    @property
+    def shared_timeout(self):
+        if isinstance(self.shared, LocMemCache):
+            # Nicht geteilt: Invalidierungen aus anderen Workern kommen hier nie an.
+            return min(self.timeout, self.local_ttl)
+        return self.timeout
+
+    @staticmethod
+    def shared_key(key):
+        # Keine Klartext-Tokens als Cache-Schlüssel, z.B. in Memcached-Statistiken.
+        return 'forum:token:' + hashlib.sha256(key.encode()).hexdigest()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None:
+                token, expires = entry
+                if now < expires:
+                    self._local.move_to_end(key)
+                    # Jeder Request bekommt eigene Instanzen, wie bei einem Datenbank-Lookup.
+                    return copy.deepcopy(token)
+                del self._local[key]
+
+        token = self.shared.get(self.shared_key(key))
+        if token is not None:
+            self._remember(key, token, now)
+        return token
+
+    def set(self, key, token):
+        self.shared.set(self.shared_key(key), token, self.shared_timeout)
+        self._remember(key, token, time.monotonic())
+
+    def _remember(self, key, token, now):
+        if self.local_ttl <= 0:
+            return
+        # Eigene Kopie, damit Änderungen im Request das LRU nicht verfälschen.
+        token = copy.deepcopy(token)
+        with self._lock:
+            self._local[key] = (token, now + self.local_ttl)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def invalidate(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._local.pop(key, None)
+        self.shared.delete_many([self.shared_key(key) for key in keys])
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+
+
+def _build_cache():
+    config = {**DEFAULT_SETTINGS, **getattr(settings, 'FORUM_TOKEN_CACHE', {})}
+    return TokenCache(config['CACHE'], config['TIMEOUT'], config['LOCAL_TTL'], config['MAX_ENTRIES'])
+
+
+token_cache = _build_cache()
+
+
+# Felder des Users im Cache; alle anderen (Passwort-Hash, E-Mail, ...) bleiben zurückgestellt.
+USER_FIELDS = ('id', 'is_active', 'is_staff', 'is_superuser')
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    def authenticate_credentials(self, key):
+        entry = token_cache.get(key)
+        if entry is not None:
+            return self._from_entry(key, entry)
+
+        model = self.get_model()
+        try:
+            token = model.objects.select_related('user').get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        if not token.user.is_active:
+            # Inaktive User werden nicht gecacht, damit eine Reaktivierung sofort greift.
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        token_cache.set(key, {name: getattr(token.user, name) for name in USER_FIELDS})
+        return (token.user, token)
+
+    def _from_entry(self, key, entry):
+        # from_db wie bei .only(): save() schreibt nur diese Felder zurück.
+        user_model = get_user_model()
+        user = user_model.from_db(user_model.objects.db, list(USER_FIELDS), [entry[name] for name in USER_FIELDS])
+        model = self.get_model()
+        token = model.from_db(model.objects.db, ['key', 'user_id'], [key, user.pk])
+        token.user = user
+        return (user, token)
@@ -0,0 +1,290 @@
+"""
+Response-Cache für lesende Endpunkte mit versionsbasierter Invalidierung.
+
+Jede gecachte Antwort hängt an einer oder mehreren Versionen (z.B. 'questions'
+für die Liste, 'question:5' für eine Detailansicht). Schreibzugriffe erhöhen
+nur die betroffenen Versionen (siehe forum_app.signals); alte Einträge werden
+dadurch unerreichbar und fallen per LRU aus dem Speicher. Aus den Versionen
+entstehen ETag und Last-Modified, sodass bedingte Requests (304) ganz ohne
+Datenbankzugriff beantwortet werden können. Gefüllt wird der Cache nur aus
+Lesezugriffen auf den Primary, nie aus Replikaten (siehe forum_app.replicas).
+
+Treffer und Fehlschläge des Prozesses zählt ``stats()``; MetricsView liefert sie aus.
+
+Konfiguration über settings.FORUM_RESPONSE_CACHE:
+    'ENABLED': bool, 'BACKEND': Dotted Path einer Backend-Klasse, 'OPTIONS': kwargs.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils.http import http_date, parse_http_date_safe
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.response import Response
+
+from forum_app import replicas
+
+NS_PER_SECOND = 1_000_000_000
+
+DEFAULT_SETTINGS = {
+    'ENABLED': True,
+    'BACKEND': 'forum_app.api.caching.LocMemLRUBackend',
+    'OPTIONS': {},
+}
+
+
+class LocMemLRUBackend:
+    """Prozesslokaler Speicher mit fester Obergrenze und LRU-Verdrängung."""
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class FileLRUBackend:
+    """
+    Dateibasierter Speicher, den sich mehrere Worker-Prozesse teilen können.
+    Die mtime einer Datei dient als Zeitpunkt des letzten Zugriffs; wird die
+    Obergrenze überschritten, fliegen die am längsten unbenutzten Einträge raus.
+    Geprüft wird nur alle ``cull_frequency`` Schreibvorgänge, die Grenze ist
+    daher eine Näherung.
+
+    Die Einträge werden mit pickle gelesen. Wer in ``location`` schreiben kann,
+    kann also Code im Server ausführen; das Verzeichnis muss deshalb dem
+    Server-User gehören und darf für niemanden sonst zugänglich sein (0700).
+    Ein fehlendes Verzeichnis wird so angelegt, ein anderes abgelehnt.
+    """
+
+    def __init__(self, location, max_entries=1000, cull_frequency=32):
+        self.location = str(location)
+        self.max_entries = max_entries
+        self.cull_frequency = cull_frequency
+        self._writes = 0
+        os.makedirs(self.location, mode=0o700, exist_ok=True)
+        self._check_private()
+
+    def _check_private(self):
+        info = os.stat(self.location)
+        if info.st_uid != os.getuid() or info.st_mode & 0o077:
+            raise ImproperlyConfigured(
+                f'Response cache directory {self.location} must be owned by this user with mode 0700.')
+
+    def _path(self, key):
+        return os.path.join(self.location, hashlib.sha1(key.encode()).hexdigest() + '.cache')
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as fh:
+                value = fh.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return value
+
+    def set(self, key, value):
+        fd, tmp_path = tempfile.mkstemp(dir=self.location, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(value)
+        os.replace(tmp_path, self._path(key))
+        self._writes += 1
+        if self._writes % self.cull_frequency == 0:
+            self._cull()
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        for entry in self._entries():
+            self.delete_path(entry.path)
+
+    def delete_path(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _entries(self):
+        with os.scandir(self.location) as it:
+            return [entry for entry in it if entry.name.endswith('.cache')]
+
+    def _cull(self):
+        entries = self._entries()
+        overflow = len(entries) - self.max_entries
+        if overflow <= 0:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:overflow]:
+            self.delete_path(entry.path)
+
+    def __len__(self):
+        return len(self._entries())
+
+
+class ResponseCache:
+    VERSION_PREFIX = 'version:'
+    DATA_PREFIX = 'data:'
+
+    def __init__(self, backend, enabled=True):
+        self.backend = backend
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get_version(self, scope):
+        key = self.VERSION_PREFIX + scope
+        version = self.backend.get(key)
+        if version is None:
+            # Unbekannte (oder verdrängte) Version: neu anlegen. Da Versionen
+            # Zeitstempel sind, kann dabei keine alte Version wieder auftauchen.
+            version = str(time.time_ns()).encode()
+            self.backend.set(key, version)
+        return int(version)
+
+    def bump(self, *scopes):
+        now = str(time.time_ns()).encode()
+        for scope in scopes:
+            self.backend.set(self.VERSION_PREFIX + scope, now)
+
+    def get(self, key):
+        value = self.backend.get(self.DATA_PREFIX + key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return None if value is None else pickle.loads(value)
+
+    def set(self, key, data):
+        self.backend.set(self.DATA_PREFIX + key, pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
+
+    def clear(self):
+        self.backend.clear()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.backend)}
+
+
+def _build_cache():
+    config = {**DEFAULT_SETTINGS, **getattr(settings, 'FORUM_RESPONSE_CACHE', {})}
+    backend = import_string(config['BACKEND'])(**config['OPTIONS'])
+    return ResponseCache(backend, enabled=config['ENABLED'])
+
+
+response_cache = _build_cache()
+
+
+def invalidate(*scopes):
+    """
+    Erhöht die Versionen sofort und nochmals nach dem Commit. Der zweite Schritt
+    verhindert, dass ein paralleler Leser den alten Stand unter der neuen
+    Version ablegt, solange die Transaktion noch offen ist.
+    """
+    response_cache.bump(*scopes)
+    transaction.on_commit(lambda: response_cache.bump(*scopes))
+
+
+class CachedResponseMixin:
+    """
+    Cacht die Daten von list/retrieve abhängig von Versionen.
+    ``cache_scope`` ist die Version der Liste, ``cache_detail_scope`` das Präfix
+    für Detailversionen ('<prefix>:<pk>').
+    """
+    cache_scope = None
+    cache_detail_scope = None
+
+    def list(self, request, *args, **kwargs):
+        return self._cached_response(
+            [self.cache_scope], super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        scope = f"{self.cache_detail_scope}:{kwargs[self.lookup_url_kwarg or self.lookup_field]}"
+        return self._cached_response(
+            [scope], super().retrieve, request, *args, **kwargs)
+
+    def _cached_response(self, scopes, handler, request, *args, **kwargs):
+        if not response_cache.enabled:
+            return handler(request, *args, **kwargs)
+
+        versions = [response_cache.get_version(scope) for scope in scopes]
+        key = f"{request.get_host()}{request.get_full_path()}|" + ','.join(map(str, versions))
+        etag = '"%s"' % hashlib.sha1(key.encode()).hexdigest()
+        version = max(versions)
+        headers = {'ETag': etag}
+        # Last-Modified hat nur Sekunden: aufrunden und erst senden, wenn die Sekunde
+        # vorbei ist. Sonst trüge eine weitere Änderung in derselben Sekunde dasselbe
+        # Datum, und If-Modified-Since bekäme fälschlich 304.
+        last_modified = -(-version // NS_PER_SECOND)
+        if time.time_ns() >= last_modified * NS_PER_SECOND:
+            headers['Last-Modified'] = http_date(last_modified)
+
+        if self._not_modified(request, etag, version):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        data = response_cache.get(key)
+        if data is not None:
+            return Response(data, headers={**headers, 'X-Cache': 'HIT'})
+
+        response = handler(request, *args, **kwargs)
+        if replicas.reading_from_replica():
+            # Ein nachhängendes Replikat liefert womöglich den Stand vor der aktuellen
+            # Version; weder cachen noch ETag/Last-Modified dieser Version vergeben.
+            response['X-Cache'] = 'BYPASS'
+        elif response.status_code == status.HTTP_200_OK:
+            response_cache.set(key, response.data)
+            for name, value in {**headers, 'X-Cache': 'MISS'}.items():
+                response[name] = value
+        return response
+
+    def _not_modified(self, request, etag, version):
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match is not None:
+            candidates = {tag.strip() for tag in if_none_match.split(',')}
+            return etag in candidates or '*' in candidates
+        if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+        # Strikt: nur Änderungen vor Beginn der genannten Sekunde gelten als bekannt.
+        return if_modified_since is not None and version < if_modified_since * NS_PER_SECOND
@@ -0,0 +1,72 @@
+"""
+Server-Sent Events je Frage (für den Betrieb unter ASGI).
+
+GET /api/forum/questions/<id>/events/ hält die Verbindung offen und schickt die
+Deltas aus forum_app.events als text/event-stream:
+
+    id: 5f0c2a9e81d4-42
+    event: answer.created
+    data: {"id": 7, "content": "...", "author": 1, "created_at": "...", "question": 3}
+
+Nach einem Verbindungsabbruch setzt der Browser (EventSource) mit dem Header
+Last-Event-ID fort; ``?last_event_id=`` geht ebenso. Ist die Lücke nicht mehr
+im Puffer, kommt ``event: reset`` und der Client lädt die Frage neu. Alle
+'HEARTBEAT_SECONDS' kommt eine Kommentarzeile. Nach question.deleted endet der
+Stream.
+"""
+import asyncio
+
+from django.http import StreamingHttpResponse
+
+from forum_app import events
+from forum_app.models import Question
+from .async_views import AsyncReadView
+from .renderers import FastJSONRenderer
+
+
+def format_event(event):
+    data = FastJSONRenderer().render(event.data).decode()
+    return f'id: {events.broker.event_id(event)}\nevent: {event.name}\ndata: {data}\n\n'
+
+
+class QuestionEventsView(AsyncReadView):
+    # Wartezeit, die EventSource vor dem Neuverbinden einhalten soll (ms).
+    retry_ms = 3000
+
+    def get_last_event_id(self):
+        return self.request.headers.get('Last-Event-ID') or self.request.GET.get('last_event_id') or None
+
+    async def handle(self, request, pk):
+        if not await Question.objects.filter(pk=pk).aexists():
+            return self.render({'detail': 'No Question matches the given query.'}, status=404)
+        response = StreamingHttpResponse(self.stream(pk, self.get_last_event_id()),
+                                         content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # Nginx würde den Stream sonst puffern.
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    async def stream(self, question_id, last_event_id):
+        heartbeat = events.get_settings()['HEARTBEAT_SECONDS']
+        last_id = 0
+        # Erst hier abonnieren: Wird der Stream nie gestartet, läuft auch kein finally.
+        subscription, backlog = events.broker.subscribe(
+            question_id, asyncio.get_running_loop(), asyncio.Event(), last_event_id)
+        try:
+            yield f'retry: {self.retry_ms}\n\n'
+            while True:
+                for event in backlog:
+                    # Was schon aus dem Puffer kam, kann auch noch zugestellt werden.
+                    if event.id <= last_id and event.name != events.RESET:
+                        continue
+                    last_id = event.id
+                    yield format_event(event)
+                    if event.name in (events.RESET, 'question.deleted'):
+                        return
+                try:
+                    await asyncio.wait_for(subscription.ready.wait(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield ': heartbeat\n\n'
+                backlog = subscription.drain()
+        finally:
+            subscription.close()
@@ -0,0 +1,121 @@
+"""
+Schneller Lesepfad für Listen: Zeilen aus values() statt ModelSerializer.
+
+Bei großen Listen kostet DRF vor allem die Instanziierung der Modelle und das
+feldweise to_representation der (verschachtelten) Serializer. RowSerializer
+leitet aus einer ModelSerializer-Klasse und ihrem Context (?fields=/?expand=)
+die Spalten ab, lädt sie per values() und baut daraus direkt die Dicts, in
+derselben Feldreihenfolge und mit denselben Formaten (Datumsfelder laufen über
+das to_representation des jeweiligen Serializer-Felds, Relationen liefern die
+ID). Verschachtelte Listen (answers, likes) kommen mit einer Query pro
+Relation für die ganze Seite. test_fastpath vergleicht die Ausgabe mit den
+Serializern.
+
+FastListMixin nutzt den Pfad für list() lesender Requests. Ausschalten über
+settings.FORUM_FAST_PATH = {'ENABLED': False}.
+"""
+from django.conf import settings
+from django.db.models import F
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from .instrumentation import profile_serializer
+
+DEFAULT_SETTINGS = {
+    'ENABLED': True,
+}
+
+# Name der Spalte mit der ID des Elternobjekts in verschachtelten Listen.
+_PARENT = 'fast_parent'
+
+
+def get_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'FORUM_FAST_PATH', {})}
+
+
+class RowSerializer:
+    def __init__(self, serializer_class, context=None):
+        serializer = serializer_class(context=context or {})
+        self.model = serializer_class.Meta.model
+        # 'id' statt 'pk': unter diesem Namen suchen die Cursor-Paginations die Position.
+        self.pk = self.model._meta.pk.attname
+        self.columns = []
+        # (Feldname, Spalte, Formatierer oder None, verschachtelter RowSerializer oder None)
+        self.plan = []
+        for name, field in serializer.fields.items():
+            if isinstance(field, serializers.ListSerializer):
+                relation = self.model._meta.get_field(field.source)
+                # ?fields= gilt wie in SparseFieldsMixin nur für die äußere Ebene.
+                child = RowSerializer(type(field.child))
+                self.plan.append((name, relation.field.name, None, child))
+            elif isinstance(field, serializers.RelatedField):
+                # values() liefert für Fremdschlüssel schon die ID.
+                self.columns.append(field.source)
+                self.plan.append((name, field.source, None, None))
+            else:
+                self.columns.append(field.source)
+                self.plan.append((name, field.source, field.to_representation, None))
+
+    def values(self, queryset, extra=()):
+        return queryset.prefetch_related(None).values(*self._columns(extra))
+
+    def _columns(self, extra=()):
+        return list(dict.fromkeys([self.pk, *self.columns, *extra]))
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        nested = {}
+        for name, parent_field, _, child in self.plan:
+            if child is not None:
+                nested[name] = child.children_of(parent_field, [row[self.pk] for row in rows])
+        # Wie bei ProfiledSerializerMixin zählen die Queries nicht zur Serializer-Zeit.
+        return profile_serializer(self._format, rows, nested)
+
+    def _format(self, rows, nested):
+        data = []
+        for row in rows:
+            item = {}
+            for name, source, formatter, child in self.plan:
+                if child is not None:
+                    item[name] = nested[name].get(row[self.pk], [])
+                    continue
+                value = row[source]
+                item[name] = value if formatter is None or value is None else formatter(value)
+            data.append(item)
+        return data
+
+    def children_of(self, parent_field, parent_ids):
+        """Alle Zeilen zu ``parent_ids``, gruppiert nach Elternobjekt, je Gruppe nach id sortiert."""
+        if not parent_ids:
+            return {}
+        rows = (self.model.objects.filter(**{f'{parent_field}__in': parent_ids}).order_by(self.pk)
+                .values(*self._columns(), **{_PARENT: F(parent_field)}))
+        rows = list(rows)
+        groups = {}
+        for row, item in zip(rows, self.to_representation(rows)):
+            groups.setdefault(row[_PARENT], []).append(item)
+        return groups
+
+
+class FastListMixin:
+    """
+    View-Mixin: list() lesender Requests über RowSerializer. Pagination-Klassen
+    bekommen die values()-Dicts; ``required_columns`` der View werden mitgeladen,
+    damit Cursor-Positionen bestimmt werden können.
+    """
+
+    def use_fast_path(self):
+        return get_settings()['ENABLED'] and self.request.method in ('GET', 'HEAD')
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_fast_path():
+            return super().list(request, *args, **kwargs)
+        return self.fast_list_response(self.filter_queryset(self.get_queryset()), self.paginator)
+
+    def fast_list_response(self, queryset, paginator):
+        row_serializer = RowSerializer(self.get_serializer_class(), self.get_serializer_context())
+        rows = row_serializer.values(queryset, extra=getattr(self, 'required_columns', ()))
+        page = paginator.paginate_queryset(rows, self.request, view=self) if paginator is not None else None
+        if page is not None:
+            return paginator.get_paginated_response(row_serializer.to_representation(page))
+        return Response(row_serializer.to_representation(rows))
@@ -0,0 +1,31 @@
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+from forum_app import search
+
+
+def full_text_filter(queryset, index, text):
+    """
+    Filtert einen Queryset auf die Treffer im FTS5-Index ``index``.
+    Ohne FTS5 (andere Datenbank) wird auf content__icontains zurückgefallen.
+    """
+    match = search.build_match_query(text)
+    if not match:
+        return queryset
+    if not search.is_available():
+        return queryset.filter(content__icontains=text)
+    return queryset.filter(pk__in=RawSQL(search.matching_ids_sql(index), [match]))
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter für ?search=, der den FTS5-Index der View (``search_index``)
+    statt LIKE '%...%' über ``search_fields`` verwendet.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        index = getattr(view, 'search_index', None)
+        if index is None or not search.is_available():
+            return super().filter_queryset(request, queryset, view)
+        text = request.query_params.get(self.search_param, '')
+        return full_text_filter(queryset, index, text)
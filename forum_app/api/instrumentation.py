@@ -0,0 +1,278 @@
+"""
+Instrumentierung der Forum-API pro Request.
+
+InstrumentationMiddleware misst für Requests auf forum_app.api-Views die Anzahl
+der Queries, die Datenbankzeit, die Serializer-Zeit (ProfiledSerializerMixin
+bzw. profile_serializer für den RowSerializer des schnellen Lesepfads) und die
+View-Zeit. Gleiche SQL-Statements, die innerhalb eines Requests
+mehrfach laufen, werden als N+1-Verdacht geloggt. Die Werte landen pro
+Methode und URL-Name (z.B. 'question-detail') in Histogrammen (``metrics``),
+die MetricsView für Admins ausliefert, und auf Wunsch im ``Server-Timing``-Header.
+
+Konfiguration über settings.FORUM_INSTRUMENTATION:
+    'ENABLED': bool, 'SAMPLE_RATE': Anteil gemessener Requests (0.0-1.0),
+    'SERVER_TIMING': Header setzen, 'DUPLICATE_QUERY_THRESHOLD': ab wie vielen
+    gleichen Statements ein Request als N+1 gilt.
+Die Histogramme liegen im Speicher des jeweiligen Prozesses.
+"""
+import logging
+import random
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'ENABLED': True,
+    'SAMPLE_RATE': 1.0,
+    'SERVER_TIMING': False,
+    'DUPLICATE_QUERY_THRESHOLD': 5,
+}
+
+# Obergrenzen der Histogramm-Buckets in Millisekunden; der letzte Bucket ist offen.
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# IN-Listen unterschiedlicher Länge sollen dasselbe Statement ergeben.
+_PLACEHOLDER_LIST = re.compile(r'%s(?:\s*,\s*%s)+')
+
+_current = ContextVar('forum_request_profile', default=None)
+
+
+def get_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'FORUM_INSTRUMENTATION', {})}
+
+
+class RequestProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.route = None
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.view_time = 0.0
+        self.statements = Counter()
+        self._serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Execute-Wrapper für die Datenbankverbindung."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+            self.statements[_PLACEHOLDER_LIST.sub('%s, ...', sql)] += 1
+
+    def duplicates(self, threshold):
+        return {sql: count for sql, count in self.statements.items() if count >= threshold}
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.started
+
+
+class RouteMetrics:
+    """Thread-sichere Aggregation der Profile pro (Methode, Route)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, key, profile, total, n_plus_one):
+        with self._lock:
+            entry = self._routes.get(key)
+            if entry is None:
+                entry = self._routes[key] = {
+                    'count': 0, 'total_ms': 0.0, 'db_ms': 0.0, 'serializer_ms': 0.0,
+                    'view_ms': 0.0, 'queries': 0, 'max_queries': 0, 'n_plus_one': 0,
+                    'histogram': [0] * (len(BUCKETS_MS) + 1),
+                }
+            total_ms = total * 1000
+            entry['count'] += 1
+            entry['total_ms'] += total_ms
+            entry['db_ms'] += profile.db_time * 1000
+            entry['serializer_ms'] += profile.serializer_time * 1000
+            entry['view_ms'] += profile.view_time * 1000
+            entry['queries'] += profile.queries
+            entry['max_queries'] = max(entry['max_queries'], profile.queries)
+            entry['n_plus_one'] += int(n_plus_one)
+            entry['histogram'][bisect_left(BUCKETS_MS, total_ms)] += 1
+
+    def snapshot(self):
+        with self._lock:
+            routes = {key: {**entry, 'histogram': list(entry['histogram'])}
+                      for key, entry in self._routes.items()}
+        result = []
+        for (method, route), entry in sorted(routes.items(), key=lambda item: item[0][1]):
+            count = entry['count']
+            labels = [f'le_{bound}' for bound in BUCKETS_MS] + ['inf']
+            result.append({
+                'method': method,
+                'route': route,
+                'count': count,
+                'mean_ms': round(entry['total_ms'] / count, 3),
+                'mean_db_ms': round(entry['db_ms'] / count, 3),
+                'mean_serializer_ms': round(entry['serializer_ms'] / count, 3),
+                'mean_view_ms': round(entry['view_ms'] / count, 3),
+                'mean_queries': round(entry['queries'] / count, 2),
+                'max_queries': entry['max_queries'],
+                'n_plus_one': entry['n_plus_one'],
+                'histogram_ms': dict(zip(labels, entry['histogram'])),
+            })
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+metrics = RouteMetrics()
+
+
+def _add_wrapper(profile):
+    # Im Sync-Thread aufrufen: ``connections`` liefert die Verbindungen des aktuellen Threads.
+    # Alle Aliase, damit auch Lesezugriffe auf Replikate (forum_app.replicas) zählen.
+    for db in connections.all():
+        db.execute_wrappers.append(profile)
+
+
+def _remove_wrapper(profile):
+    for db in connections.all():
+        db.execute_wrappers.remove(profile)
+
+
+def _is_api_view(view_func):
+    view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    return view_class is not None and view_class.__module__.startswith('forum_app.api')
+
+
+class InstrumentationMiddleware:
+    """
+    Nicht gesampelte Requests kosten nur einen Zufallswert; für gesampelte
+    Requests wird ein Execute-Wrapper auf die Verbindungen aller Aliase gelegt.
+
+    Unter ASGI läuft die Middleware async, damit die Async-Views nicht in einen
+    Thread gezwungen werden. Synchrone Views und das Async-ORM laufen dann im
+    Sync-Thread des Requests (thread_sensitive); der Execute-Wrapper wird auf die
+    Verbindungen dieses Threads gelegt.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = get_settings()
+        self.enabled = config['ENABLED']
+        self.sample_rate = config['SAMPLE_RATE']
+        self.server_timing = config['SERVER_TIMING']
+        self.duplicate_threshold = config['DUPLICATE_QUERY_THRESHOLD']
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+            # Sonst würde Django process_view per sync_to_async in einen Thread verlagern.
+            self.process_view = self._aprocess_view
+
+    def _sampled(self):
+        return self.enabled and random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+        _add_wrapper(profile)
+        try:
+            response = self.get_response(request)
+        finally:
+            _remove_wrapper(profile)
+            _current.reset(token)
+
+        if profile.route is not None:
+            self._finish(request, response, profile)
+        return response
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+        await sync_to_async(_add_wrapper)(profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(_remove_wrapper)(profile)
+            _current.reset(token)
+
+        if profile.route is not None:
+            self._finish(request, response, profile)
+        return response
+
+    async def _aprocess_view(self, request, view_func, view_args, view_kwargs):
+        return self._start_view(request, view_func)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        return self._start_view(request, view_func)
+
+    def _start_view(self, request, view_func):
+        profile = _current.get()
+        if profile is not None and _is_api_view(view_func):
+            profile.route = request.resolver_match.view_name
+            profile.view_started = time.perf_counter()
+        return None
+
+    def _finish(self, request, response, profile):
+        profile.view_time = time.perf_counter() - profile.view_started
+        total = profile.total_time
+        duplicates = profile.duplicates(self.duplicate_threshold)
+        if duplicates:
+            logger.warning(
+                'Possible N+1 query pattern on %s %s: %s', request.method, request.path,
+                '; '.join(f'{count}x {sql[:200]}' for sql, count in duplicates.items()))
+        metrics.record((request.method, profile.route), profile, total, bool(duplicates))
+
+        if self.server_timing:
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={profile.db_time * 1000:.2f};desc="{profile.queries} queries"',
+                f'serializer;dur={profile.serializer_time * 1000:.2f}',
+                f'view;dur={profile.view_time * 1000:.2f}',
+                f'total;dur={total * 1000:.2f}',
+            ])
+
+
+def profile_serializer(method, *args):
+    """
+    Ruft ``method(*args)`` auf und verbucht die Dauer als Serializer-Zeit des
+    laufenden Requests. Verschachtelte Aufrufe laufen innerhalb des äußeren und
+    werden nicht doppelt gezählt.
+    """
+    profile = _current.get()
+    if profile is None:
+        return method(*args)
+    profile._serializer_depth += 1
+    started = time.perf_counter()
+    try:
+        return method(*args)
+    finally:
+        profile._serializer_depth -= 1
+        if profile._serializer_depth == 0:
+            profile.serializer_time += time.perf_counter() - started
+
+
+class ProfiledSerializerMixin:
+    """Misst die Zeit in to_representation (siehe profile_serializer)."""
+
+    def to_representation(self, instance):
+        return profile_serializer(super().to_representation, instance)
@@ -0,0 +1,53 @@
+from rest_framework import permissions
+
+
+class SparseFieldsetMixin:
+    """
+    View-Mixin für ?fields= und ?expand= (nur bei lesenden Requests).
+
+    Die gewünschten Felder landen im Serializer-Context (siehe SparseFieldsMixin),
+    und der Queryset lädt nur die passenden Spalten (only()) sowie nur die
+    expandierten Relationen (prefetch_related()).
+    """
+    # Relationen, die ohne ?expand= mitgeliefert werden, je Aktion.
+    default_expand = {}
+    # Spalten, die immer geladen werden müssen (z.B. für Cursor-Positionen).
+    required_columns = ()
+
+    def _query_param_set(self, name):
+        if self.request is None or self.request.method not in permissions.SAFE_METHODS:
+            return None
+        # DRF-Request (query_params) oder Djangos HttpRequest (GET) bei den Async-Views.
+        params = getattr(self.request, 'query_params', self.request.GET)
+        param = params.get(name)
+        if param is None:
+            return None
+        return {item.strip() for item in param.split(',') if item.strip()}
+
+    def get_sparse_fields(self):
+        return self._query_param_set('fields')
+
+    def get_expand(self):
+        expandable = self.get_serializer_class().EXPANDABLE_FIELDS
+        expand = self._query_param_set('expand')
+        if expand is None:
+            expand = self.default_expand.get(getattr(self, 'action', None), expandable)
+        return {name for name in expand if name in expandable}
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.get_sparse_fields()
+        context['expand'] = self.get_expand()
+        return context
+
+    def narrow_queryset(self, queryset):
+        expand = self.get_expand()
+        if expand:
+            queryset = queryset.prefetch_related(*sorted(expand))
+
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            concrete = {field.name for field in queryset.model._meta.concrete_fields}
+            columns = (fields | set(self.required_columns)) & concrete
+            queryset = queryset.only(*sorted(columns)) if columns else queryset.only('pk')
+        return queryset
@@ -0,0 +1,184 @@
+import base64
+import binascii
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+class QuestionCursorPagination(CursorPagination):
+    """
+    Cursor-Pagination für die Fragenliste, sortiert nach (created_at, id).
+
+    Der Modus ist opt-in: Ohne ``cursor`` oder ``page_size`` in der Query
+    bleibt die Liste unpaginiert, damit bestehende Clients weiter funktionieren.
+    Cursor-Pagination braucht kein COUNT(*) und bleibt auch bei tiefen Seiten
+    gleich schnell.
+    """
+    ordering = ('created_at', 'id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def get_page_size(self, request):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().get_page_size(request)
+
+
+class QuestionFeedPagination(CursorPagination):
+    """
+    Cursor-Pagination für /questions/feed/<category>/, neueste zuerst.
+    Wie beim Hot-Ranking immer aktiv.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class HotQuestionPagination(CursorPagination):
+    """
+    Cursor-Pagination für /questions/hot/, sortiert nach (hot_score, id) absteigend.
+    Anders als die Fragenliste ist sie immer aktiv.
+    """
+    ordering = ('-hot_score', '-id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class AnswerKeysetPagination(BasePagination):
+    """
+    Keyset-Pagination für die Antwortliste ohne COUNT(*).
+
+    Sortiert wird nach dem Feld aus ?ordering= (content, author__username, mit
+    oder ohne '-') und bei Gleichstand nach id in derselben Richtung. Der Cursor
+    enthält (Wert, id) der letzten Zeile; die nächste Seite beginnt per
+    Bereichs-Scan direkt dahinter, egal wie tief geblättert wird.
+
+    Längere Werte als ``max_cursor_value`` (z.B. lange Antworttexte) kommen nur
+    gekürzt in den Cursor; den vollen Wert liest die nächste Seite per id nach.
+    Ist die Zeile inzwischen gelöscht oder geändert, setzt sie am Präfix an:
+    Einzelne Zeilen können dann doppelt kommen, übersprungen wird keine.
+
+    Wie bei der Fragenliste ist der Modus opt-in (``cursor`` oder ``page_size``).
+    Mit ``?count=approx`` enthält die Antwort zusätzlich ``count_estimate``: die
+    Anzahl der Treffer, höchstens ``count_cache_timeout`` Sekunden alt.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    count_cache_timeout = 300
+    default_ordering = 'id'
+    max_cursor_value = 64
+
+    def get_page_size(self, request):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        try:
+            size = int(params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def get_ordering(self, queryset):
+        # Die Sortierung setzt der OrderingFilter; hier zählt nur das erste Feld.
+        ordering = queryset.query.order_by or (self.default_ordering,)
+        field = ordering[0]
+        return field.lstrip('-'), field.startswith('-')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if page_size is None:
+            return None
+        self.request = request
+        self.count_queryset = queryset
+        field, descending = self.get_ordering(queryset)
+        sign = '-' if descending else ''
+        queryset = queryset.annotate(cursor_value=F(field)).order_by(f'{sign}{field}', f'{sign}id')
+
+        position = self.decode_cursor(field)
+        if position is not None:
+            queryset = queryset.filter(self.cursor_filter(queryset.model, field, descending, *position))
+
+        # Eine Zeile mehr laden, um zu wissen, ob es eine nächste Seite gibt.
+        page = list(queryset[:page_size + 1])
+        self.next_position = None
+        if len(page) > page_size:
+            page = page[:page_size]
+            last = page[-1]
+            # Instanzen oder values()-Dicts (siehe forum_app/api/fastpath.py).
+            if isinstance(last, dict):
+                value, pk = last['cursor_value'], last['id']
+            else:
+                value, pk = last.cursor_value, last.pk
+            if isinstance(value, str) and len(value) > self.max_cursor_value:
+                self.next_position = (field, value[:self.max_cursor_value], pk, True)
+            else:
+                self.next_position = (field, value, pk)
+        return page
+
+    def cursor_filter(self, model, field, descending, value, pk, truncated):
+        if truncated:
+            full = model._base_manager.filter(pk=pk).values_list(field, flat=True).first()
+            if full is None or not full.startswith(value):
+                # Zeile weg oder geändert: ab dem Präfix weiter (inklusive), damit nichts fehlt.
+                if descending:
+                    return Q(**{f'{field}__lte': value + chr(0x10FFFF)})
+                return Q(**{f'{field}__gte': value})
+            value = full
+        if descending:
+            return Q(**{f'{field}__lte': value}) & (Q(**{f'{field}__lt': value}) | Q(id__lt=pk))
+        return Q(**{f'{field}__gte': value}) & (Q(**{f'{field}__gt': value}) | Q(id__gt=pk))
+
+    def decode_cursor(self, field):
+        encoded = self.request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor_field, value, pk, *truncated = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+            raise NotFound('Invalid cursor')
+        # Ein Cursor gilt nur für die Sortierung, mit der er erzeugt wurde.
+        if cursor_field != field or not _is_int(pk) or not (isinstance(value, str) or _is_int(value)):
+            raise NotFound('Invalid cursor')
+        if truncated not in ([], [True]) or (truncated and not isinstance(value, str)):
+            raise NotFound('Invalid cursor')
+        return value, pk, bool(truncated)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        cursor = base64.urlsafe_b64encode(json.dumps(self.next_position).encode()).decode()
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def get_count_estimate(self):
+        sql, params = self.count_queryset.order_by().values('pk').query.sql_with_params()
+        key = 'forum:answer-count:' + hashlib.sha1(f'{sql}|{params}'.encode()).hexdigest()
+        count = cache.get(key)
+        if count is None:
+            count = self.count_queryset.order_by().count()
+            cache.set(key, count, self.count_cache_timeout)
+        return count
+
+    def get_paginated_response(self, data):
+        payload = {'next': self.get_next_link(), 'previous': None}
+        if self.request.query_params.get(self.count_query_param) == 'approx':
+            payload['count_estimate'] = self.get_count_estimate()
+        payload['results'] = data
+        return Response(payload)
+
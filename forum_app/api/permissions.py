@@ -67,7 +67,7 @@ class CustomQuestionPermission(permissions.BasePermission):
         # Für Aktionen, die keine spezifische Instanz betreffen (wie 'list' oder 'create'),
         # erlauben wir den Zugriff, wenn die Anfrage lesend ist oder wenn der Benutzer
         # für eine 'create'-Aktion authentifiziert ist.
-        if view.action == 'list':
+        if view.action in ['list', 'hot', 'feed']:
             return True
         elif view.action == 'create':
             return request.user.is_authenticated
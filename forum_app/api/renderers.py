@@ -0,0 +1,37 @@
+"""
+JSON-Renderer mit orjson, falls installiert.
+
+Kompakt, UTF-8 und mit maskiertem U+2028/U+2029 wie DRFs JSONRenderer mit den
+Standardeinstellungen. Datums-, Dezimal- und Lazy-Werte gehen an DRFs
+JSONEncoder, damit deren Format gleich bleibt. Floats schreibt orjson selbst:
+gleicher Wert, aber andere Exponentenschreibweise (``-1.375e-6`` statt
+``-1.375e-06``, ``1e16`` statt ``1e+16``), z.B. im ``rank`` der Suche. NaN und
+Infinity werden zu ``null``, wo JSONRenderer (STRICT_JSON) einen Fehler wirft.
+Ohne orjson oder bei eingerückter Ausgabe (``Accept: application/json; indent=2``)
+übernimmt JSONRenderer.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # optional
+    orjson = None
+
+_OPTIONS = 0
+if orjson is not None:
+    _OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or self.encoder_class is not encoders.JSONEncoder
+                or self.get_indent(accepted_media_type, renderer_context or {})):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=encoders.JSONEncoder().default, option=_OPTIONS)
+        except TypeError:
+            # z.B. Integer außerhalb von 64 Bit; der Standard-Encoder kann das.
+            return super().render(data, accepted_media_type, renderer_context)
+        # Wie JSONRenderer: in JavaScript ungültige Zeilentrenner maskieren.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
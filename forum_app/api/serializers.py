@@ -1,35 +1,78 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from forum_app.models import Like, Answer, Question
+from .instrumentation import ProfiledSerializerMixin
 
 
-class AnswerSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """
+    Reduziert die Felder anhand des Serializer-Contexts:
+    - 'fields': Menge der gewünschten Felder (None = alle).
+    - 'expand': Menge der verschachtelten Relationen aus EXPANDABLE_FIELDS (None = alle).
+    Expandierte Relationen bleiben auch erhalten, wenn sie nicht in 'fields' stehen.
+    """
+    EXPANDABLE_FIELDS = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get('fields')
+        expand = self.context.get('expand')
+        if expand is None:
+            expand = set(self.EXPANDABLE_FIELDS)
+
+        for name in list(self.fields):
+            if name in self.EXPANDABLE_FIELDS:
+                keep = name in expand
+            else:
+                keep = fields is None or name in fields
+            if not keep:
+                self.fields.pop(name)
+
+
+class AnswerSerializer(ProfiledSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Answer
         fields = ['id', 'content', 'author', 'created_at', 'question']
 
 
-class LikeSerializer(serializers.ModelSerializer):
+class LikeSerializer(ProfiledSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Like
         fields = ['id', 'user', 'question', 'created_at']
         read_only_fields = ['user']
-
-    def validate(self, data):
-        user = self.context['request'].user
-        question = data['question']
-
-        if Like.objects.filter(user=user, question=question).exists():
-            raise serializers.ValidationError("You have already liked this question.")
-
-        return data
+        # Doppelte Likes erkennt der unique_together-Constraint beim INSERT
+        # (siehe LikeViewSet.perform_create), nicht ein vorheriges exists().
 
 
-class QuestionSerializer(serializers.ModelSerializer):
+class QuestionSerializer(ProfiledSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     answers = AnswerSerializer(many=True, read_only=True)
     likes = LikeSerializer(many=True, read_only=True)
     # author = serializers.PrimaryKeyRelatedField(queryset=User.objects.all())  # nicht read_only!
 
+    EXPANDABLE_FIELDS = ('answers', 'likes')
+
     class Meta:
         model = Question
-        fields = ['id', 'title', 'content', 'author', 'created_at', 'answers', 'likes']
+        fields = ['id', 'title', 'content', 'author', 'created_at',
+                  'like_count', 'answer_count', 'answers', 'likes']
+        read_only_fields = ['like_count', 'answer_count']
+
+
+class BulkLikeSerializer(serializers.Serializer):
+    """Eingabe für /likes/bulk/: Liste von Frage-IDs."""
+    questions = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=100)
+
+
+class QueuedLikeSerializer(serializers.Serializer):
+    """Eingabe für POST /likes/ mit Write-behind-Queue: die Frage nur als ID, ohne Query."""
+    question = serializers.IntegerField(min_value=1)
+
+
+class BulkAnswerItemSerializer(serializers.Serializer):
+    """
+    Ein Eintrag für /answers/bulk/. Die Frage wird nur als ID geprüft; ob sie
+    existiert, klärt die View mit einer Query für alle Einträge zusammen.
+    """
+    question = serializers.IntegerField(min_value=1)
+    content = serializers.CharField()
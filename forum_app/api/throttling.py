@@ -1,27 +1,284 @@
-from rest_framework.throttling import UserRateThrottle
+"""
+Throttling mit prozessübergreifend geteiltem Zustand.
 
+DRFs SimpleRateThrottle speichert pro Schlüssel die komplette Liste der
+Zeitstempel im (standardmäßig prozesslokalen) Django-Cache und schreibt sie bei
+jedem Request neu. Die Klassen hier nutzen stattdessen einen gleitenden
+Fenster-Zähler: pro Schlüssel nur Fensternummer, Zähler des aktuellen und des
+vorherigen Fensters. Die Anfragen im gleitenden Fenster werden geschätzt als
 
-class QuestionThrottle(UserRateThrottle):
+    vorheriger * (1 - Anteil des verstrichenen Fensters) + aktueller
+
+Der Zustand liegt im ``throttle_store``; SQLiteThrottleStore teilt ihn über eine
+lokale SQLite-Datei zwischen allen Worker-Prozessen, ein Check ist ein einziges
+UPSERT. Abgelehnte Schlüssel merkt sich jeder Prozess bis zum Ablauf der
+Wartezeit, sodass ein Client im Limit den Store nicht weiter belastet.
+
+Konfiguration über settings.FORUM_THROTTLE:
+    'BACKEND': Dotted Path einer Store-Klasse, 'OPTIONS': kwargs.
+Die Tests laufen mit LocMemThrottleStore (siehe forum_app/tests/runner.py),
+damit sie nie den Zustand einer laufenden Instanz in der SQLite-Datei ändern.
+"""
+import math
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import NamedTuple
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from rest_framework import throttling
+
+DEFAULT_SETTINGS = {
+    'BACKEND': 'forum_app.api.throttling.SQLiteThrottleStore',
+    'OPTIONS': {},
+}
+
+
+class Hit(NamedTuple):
+    allowed: bool
+    current: int
+    previous: int
+    elapsed: float
+
+
+def _window(now, duration):
+    window = int(now // duration)
+    return window, (now - window * duration) / duration
+
+
+def retry_after(hit, limit, duration):
+    """Sekunden, bis die Schätzung wieder unter dem Limit liegt."""
+    if hit.current >= limit:
+        # Erst im nächsten Fenster, wenn der jetzige Zähler weit genug abgeklungen ist.
+        return (1 - hit.elapsed) * duration + duration * max(0.0, 1 - limit / hit.current)
+    if hit.previous:
+        needed = 1 - (limit - hit.current) / hit.previous
+        return max(0.0, needed - hit.elapsed) * duration
+    return 0.0
+
+
+class LocMemThrottleStore:
+    """Store im Prozessspeicher, z.B. für Einzelprozess-Setups und Tests."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}
+
+    def hit(self, key, limit, duration, now=None):
+        window, elapsed = _window(time.time() if now is None else now, duration)
+        with self._lock:
+            stored_window, current, previous = self._data.get(key, (window, 0, 0))
+            if stored_window != window:
+                previous = current if stored_window == window - 1 else 0
+                current = 0
+            allowed = previous * (1 - elapsed) + current < limit
+            current += int(allowed)
+            self._data[key] = (window, current, previous)
+        return Hit(allowed, current, previous, elapsed)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SQLiteThrottleStore:
+    """
+    Store in einer SQLite-Datei (WAL), geteilt von allen Prozessen auf dem Host.
+    Die Berechnung läuft komplett im UPSERT, daher ohne Lese-/Schreib-Race.
+    """
+    # Anteil der Checks, die abgelaufene Schlüssel aufräumen.
+    cleanup_probability = 0.001
+
+    UPSERT = '''
+        INSERT INTO throttle (key, window, current, previous, allowed, expires)
+        VALUES (:key, :window, 1, 0, 1, :expires)
+        ON CONFLICT (key) DO UPDATE SET
+            previous = CASE WHEN window = :window THEN previous
+                            WHEN window = :window - 1 THEN current ELSE 0 END,
+            current = (CASE WHEN window = :window THEN current ELSE 0 END)
+                      + (:limit > (CASE WHEN window = :window THEN previous
+                                        WHEN window = :window - 1 THEN current ELSE 0 END) * :weight
+                                  + (CASE WHEN window = :window THEN current ELSE 0 END)),
+            allowed = :limit > (CASE WHEN window = :window THEN previous
+                                     WHEN window = :window - 1 THEN current ELSE 0 END) * :weight
+                               + (CASE WHEN window = :window THEN current ELSE 0 END),
+            window = :window,
+            expires = :expires
+        RETURNING allowed, current, previous
+    '''
+
+    def __init__(self, location=None, timeout=5.0):
+        self.location = str(location or os.path.join(tempfile.gettempdir(), 'forum_throttle.sqlite3'))
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.location, timeout=self.timeout,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS throttle (
+                    key TEXT PRIMARY KEY, window INTEGER NOT NULL, current INTEGER NOT NULL,
+                    previous INTEGER NOT NULL, allowed INTEGER NOT NULL, expires REAL NOT NULL
+                ) WITHOUT ROWID
+            ''')
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key, limit, duration, now=None):
+        now = time.time() if now is None else now
+        window, elapsed = _window(now, duration)
+        conn = self._connection()
+        allowed, current, previous = conn.execute(self.UPSERT, {
+            'key': key, 'window': window, 'limit': limit, 'weight': 1 - elapsed,
+            # Nach zwei Fenstern trägt ein Schlüssel nichts mehr zur Schätzung bei.
+            'expires': (window + 2) * duration,
+        }).fetchone()
+        if random.random() < self.cleanup_probability:
+            conn.execute('DELETE FROM throttle WHERE expires < ?', (now,))
+        return Hit(bool(allowed), current, previous, elapsed)
+
+    def clear(self):
+        self._connection().execute('DELETE FROM throttle')
+
+
+def _build_store():
+    config = {**DEFAULT_SETTINGS, **getattr(settings, 'FORUM_THROTTLE', {})}
+    return import_string(config['BACKEND'])(**config['OPTIONS'])
+
+
+throttle_store = _build_store()
+
+# Schlüssel -> Zeitpunkt, bis zu dem dieser Prozess ohne Store-Zugriff ablehnt.
+_blocked = {}
+_blocked_lock = threading.Lock()
+MAX_BLOCKED_KEYS = 10000
+
+
+def reload_store():
+    """Baut ``throttle_store`` nach einer Änderung von settings.FORUM_THROTTLE neu."""
+    global throttle_store
+    throttle_store = _build_store()
+    with _blocked_lock:
+        _blocked.clear()
+
+
+def clear_throttles():
+    """Setzt den geteilten Store und die lokale Sperrliste zurück."""
+    throttle_store.clear()
+    with _blocked_lock:
+        _blocked.clear()
+
+
+def _blocked_for(key, now):
+    with _blocked_lock:
+        blocked_until = _blocked.get(key)
+        if blocked_until is not None and now >= blocked_until:
+            del _blocked[key]
+            return None
+        return blocked_until
+
+
+def _block(key, until, now):
+    with _blocked_lock:
+        if len(_blocked) >= MAX_BLOCKED_KEYS:
+            for expired in [key for key, blocked_until in _blocked.items() if blocked_until <= now]:
+                del _blocked[expired]
+        _blocked[key] = until
+
+
+class SlidingWindowThrottleMixin:
+    """Ersetzt die Zeitstempel-Historie von SimpleRateThrottle durch ``throttle_store``."""
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        if self.num_requests <= 0:
+            self._wait = self.duration
+            return False
+
+        now = self.timer()
+        blocked_until = _blocked_for(self.key, now)
+        if blocked_until is not None:
+            self._wait = blocked_until - now
+            return False
+
+        hit = throttle_store.hit(self.key, self.num_requests, self.duration, now=now)
+        if hit.allowed:
+            return True
+        self._wait = retry_after(hit, self.num_requests, self.duration)
+        _block(self.key, now + self._wait, now)
+        return False
+
+    def wait(self):
+        return math.ceil(self._wait) if getattr(self, '_wait', None) else None
+
+
+class SharedAnonRateThrottle(SlidingWindowThrottleMixin, throttling.AnonRateThrottle):
+    pass
+
+
+class AsyncAnonRateThrottle(SharedAnonRateThrottle):
+    """
+    Für die Async-Views (forum_app.api.async_views): drosselt nach IP, ohne
+    request.user anzufassen, da dessen Auflösung eine synchrone Query wäre.
+    Teilt sich das Kontingent mit SharedAnonRateThrottle.
+    """
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class SharedUserRateThrottle(SlidingWindowThrottleMixin, throttling.UserRateThrottle):
+    pass
+
+
+class SharedScopedRateThrottle(SlidingWindowThrottleMixin, throttling.ScopedRateThrottle):
+    def allow_request(self, request, view):
+        # Wie ScopedRateThrottle: ohne Scope an der View wird nicht gedrosselt.
+        self.scope = self.get_scope(request, view)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+    def get_scope(self, request, view):
+        return getattr(view, self.scope_attr, None)
+
+
+class MethodScopedRateThrottle(SharedScopedRateThrottle):
+    """
+    Wählt den Scope anhand der HTTP-Methode: '<throttle_scope>-<methode>', falls
+    dafür eine Rate konfiguriert ist, sonst ``throttle_scope`` selbst. Auch GET
+    wird gedrosselt ('question-get'), wie im auskommentierten get_throttles der
+    QuestionViewSet mit QuestionGetThrottle vorgesehen; QuestionThrottle ließ
+    GET dagegen ungedrosselt.
+    """
+
+    def get_scope(self, request, view):
+        base_scope = super().get_scope(request, view)
+        method_scope = f'{base_scope}-{request.method.lower()}'
+        return method_scope if base_scope and method_scope in self.THROTTLE_RATES else base_scope
+
+
+class QuestionThrottle(SharedUserRateThrottle):
     scope = 'question'
-    
-    # def allow_request(self, request, view):
-        
-    #     if request.method == "GET":
-    #         return True
-        
-    #     new_scope = 'question-' + request.method.lower()
-    #     if new_scope in self.THROTTLE_RATES:
-    #         self.scope = new_scope
-    #         self.rate = self.get_rate()
-    #         self.num_requests, self.duration = self.parse_rate(self.rate)
-    #         print(self.scope)
-        
-    #     return super().allow_request(request, view)
-
-
-class QuestionGetThrottle(UserRateThrottle):
+
+
+class QuestionGetThrottle(SharedUserRateThrottle):
     scope = 'question-get'
 
 
-class QuestionPostThrottle(UserRateThrottle):
+class QuestionPostThrottle(SharedUserRateThrottle):
     scope = 'question-post'
@@ -1,6 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import LikeViewSet, QuestionViewSet, AnswerListCreateView, AnswerDetailView
+from .async_views import (
+    AsyncQuestionListView, AsyncQuestionDetailView, AsyncAnswerListView, AsyncAnswerDetailView)
+from .events import QuestionEventsView
+from .views import (
+    LikeViewSet, QuestionViewSet, AnswerListCreateView, AnswerDetailView, AnswerBulkCreateView,
+    SearchView, MetricsView, ExportView, ChangesView)
 
 router = DefaultRouter()
 router.register(r'questions', QuestionViewSet, basename='question')
@@ -10,4 +15,16 @@ urlpatterns = [
     path('', include(router.urls)),
     path('answers/', AnswerListCreateView.as_view(), name='answer-list-create'),
     path('answers/<int:pk>/', AnswerDetailView.as_view(), name='answer-detail'),
+    path('answers/bulk/', AnswerBulkCreateView.as_view(), name='answer-bulk-create'),
+    path('search/', SearchView.as_view(), name='search'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
+    path('export/<str:kind>/', ExportView.as_view(), name='export'),
+    path('changes/', ChangesView.as_view(), name='changes'),
+    # Native Async-Lesepfade für den Betrieb unter ASGI (siehe async_views.py).
+    path('async/questions/', AsyncQuestionListView.as_view(), name='async-question-list'),
+    path('async/questions/<int:pk>/', AsyncQuestionDetailView.as_view(), name='async-question-detail'),
+    path('async/answers/', AsyncAnswerListView.as_view(), name='async-answer-list'),
+    path('async/answers/<int:pk>/', AsyncAnswerDetailView.as_view(), name='async-answer-detail'),
+    # Server-Sent Events statt Polling der Detailansicht (siehe events.py).
+    path('questions/<int:pk>/events/', QuestionEventsView.as_view(), name='question-events'),
 ]
@@ -1,24 +1,95 @@
-from rest_framework import viewsets, generics, permissions, filters
+from collections import Counter
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import IntegrityError
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import viewsets, generics, permissions, filters, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.throttling import ScopedRateThrottle
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 
-from forum_app.models import Like, Question, Answer
-from .serializers import QuestionSerializer, AnswerSerializer, LikeSerializer
+from forum_app import changes, events, export, likequeue, ranking, search, sqlite, tasks
+from forum_app.models import Like, Question, Answer, Change
+from forum_app.counters import adjust_question_counters, adjust_many_question_counters
+from .serializers import (
+    QuestionSerializer, AnswerSerializer, LikeSerializer, BulkLikeSerializer, BulkAnswerItemSerializer,
+    QueuedLikeSerializer)
 from .permissions import IsOwnerOrAdmin, CustomQuestionPermission
-from .throttling import QuestionThrottle, QuestionGetThrottle, QuestionPostThrottle
+from .throttling import MethodScopedRateThrottle
+from .pagination import (
+    QuestionCursorPagination, QuestionFeedPagination, HotQuestionPagination, AnswerKeysetPagination)
+from .mixins import SparseFieldsetMixin
+from .fastpath import FastListMixin
+from .filters import FullTextSearchFilter, full_text_filter
+from .caching import CachedResponseMixin, invalidate, response_cache
+from .instrumentation import metrics
 
 
-class QuestionViewSet(viewsets.ModelViewSet):
+class QuestionViewSet(CachedResponseMixin, FastListMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Question.objects.all()
     serializer_class = QuestionSerializer
     permission_classes = [CustomQuestionPermission]
-    # throttle_classes = [QuestionThrottle]
-    throttle_classes = [ScopedRateThrottle]
-    throttle_scope = 'question-scope'
+    # Scope pro Methode: 'question-get', 'question-post', ... (Fallback 'question').
+    throttle_classes = [MethodScopedRateThrottle]
+    throttle_scope = 'question'
+    pagination_class = QuestionCursorPagination
+    # ?category= nutzt den Index (category, created_at, id).
+    filterset_fields = ['category']
+    # Die Liste liefert standardmäßig nur die Zähler, verschachtelte Antworten/Likes
+    # gibt es per ?expand=answers,likes. Alle anderen Aktionen liefern alles.
+    default_expand = {'list': (), 'hot': (), 'feed': ()}
+    required_columns = QuestionCursorPagination.ordering + ('hot_score',)
+    cache_scope = 'questions'
+    cache_detail_scope = 'question'
+    # Lesende Requests dürfen von einem Replikat lesen (siehe forum_app/replicas.py).
+    use_read_replica = True
+
+    def get_queryset(self):
+        # Angeforderte Relationen gesammelt laden: 1 Query für die Fragen + je 1 Query
+        # pro Relation, unabhängig von der Seitengröße (kein N+1).
+        return self.narrow_queryset(Question.objects.all())
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
+
+    @action(detail=False, methods=['get'])
+    def hot(self, request):
+        """
+        GET /api/forum/questions/hot/?category=<category>
+        Fragen nach hot_score (siehe forum_app.ranking), immer cursor-paginiert.
+        Der Index (category, hot_score, id) liefert eine Seite ohne Sortierung aller Fragen.
+        """
+        return self._cached_response([self.cache_scope], self._hot, request)
+
+    @action(detail=False, methods=['get'], url_path=r'feed/(?P<category>\w+)')
+    def feed(self, request, category):
+        """
+        GET /api/forum/questions/feed/<category>/
+        Neueste Fragen einer Kategorie, immer cursor-paginiert. Jede Seite ist ein
+        Bereichs-Scan über den Index (category, created_at, id), unabhängig von
+        der Größe der Kategorie.
+        """
+        if category not in dict(Question.CATEGORY_CHOICES):
+            raise NotFound(f'Unknown category "{category}".')
+        return self._cached_response([self.cache_scope], self._paginated, request,
+                                     QuestionFeedPagination, category=category)
+
+    def _hot(self, request):
+        return self._paginated(request, HotQuestionPagination)
+
+    def _paginated(self, request, pagination_class, **filters):
+        # filter_queryset wertet ?category= über filterset_fields aus (400 bei unbekannten Werten).
+        queryset = self.filter_queryset(self.get_queryset()).filter(**filters)
+        paginator = pagination_class()
+        if self.use_fast_path():
+            return self.fast_list_response(queryset, paginator)
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
     '''
     Kann man so machen, besser aber in der throttling.py!
@@ -32,44 +103,350 @@ class QuestionViewSet(viewsets.ModelViewSet):
     #     return []
 
 
-class AnswerListCreateView(generics.ListCreateAPIView):
+class AnswerListCreateView(CachedResponseMixin, FastListMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     queryset = Answer.objects.all()
     serializer_class = AnswerSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, filters.OrderingFilter]
     filterset_fields = ['author__username']
     search_fields = ['content']
+    search_index = search.ANSWER_INDEX
+    cache_scope = 'answers'
+    use_read_replica = True
     ordering_fields = ['content', 'author__username']
     ordering = ['content']
+    pagination_class = AnswerKeysetPagination
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user)
+        with sqlite.write_transaction():
+            answer = serializer.save(author=self.request.user)
+            adjust_question_counters(answer.question_id, answers=1)
+            ranking.record_answer(answer.question_id, answer.created_at)
         
     def get_queryset(self):
         queryset = Answer.objects.all()
         
         content_param = self.request.query_params.get('content', None)
         if content_param is not None:
-            queryset = queryset.filter(content__icontains=content_param)
+            queryset = full_text_filter(queryset, search.ANSWER_INDEX, content_param)
             
         username_param = self.request.query_params.get('author', None)
         if username_param is not None:
              queryset = queryset.filter(author__username=username_param)
         
-        return queryset
+        return self.narrow_queryset(queryset)
     
 
 
-class AnswerDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AnswerDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Answer.objects.all()
     serializer_class = AnswerSerializer
     permission_classes = [IsOwnerOrAdmin]
 
+    def get_queryset(self):
+        return self.narrow_queryset(Answer.objects.all())
+
+    def perform_update(self, serializer):
+        old_question_id = serializer.instance.question_id
+        with sqlite.write_transaction():
+            answer = serializer.save()
+            # Wird die Antwort einer anderen Frage zugeordnet, wandert der Zähler mit.
+            if answer.question_id != old_question_id:
+                adjust_question_counters(old_question_id, answers=-1)
+                adjust_question_counters(answer.question_id, answers=1)
+                ranking.record_answer(old_question_id, answer.created_at, remove=True)
+                ranking.record_answer(answer.question_id, answer.created_at)
+
+    def perform_destroy(self, instance):
+        with sqlite.write_transaction():
+            instance.delete()
+            adjust_question_counters(instance.question_id, answers=-1)
+            ranking.record_answer(instance.question_id, instance.created_at, remove=True)
+
 
-class LikeViewSet(viewsets.ModelViewSet):
+class LikeViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Like.objects.all()
     serializer_class = LikeSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrAdmin]
 
+    def get_queryset(self):
+        return self.narrow_queryset(Like.objects.all())
+
+    def create(self, request, *args, **kwargs):
+        if not likequeue.is_enabled():
+            return super().create(request, *args, **kwargs)
+        # Write-behind (siehe forum_app/likequeue.py): ob die Frage existiert, prüft erst der Worker.
+        serializer = QueuedLikeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        question_id = serializer.validated_data['question']
+        likequeue.enqueue(request.user.pk, [question_id], likequeue.LIKE)
+        return Response({'question': question_id, 'status': 'queued', 'action': likequeue.LIKE},
+                        status=status.HTTP_202_ACCEPTED)
+
+    def destroy(self, request, *args, **kwargs):
+        if not likequeue.is_enabled():
+            return super().destroy(request, *args, **kwargs)
+        like = self.get_object()
+        likequeue.enqueue(like.user_id, [like.question_id], likequeue.UNLIKE)
+        return Response({'question': like.question_id, 'status': 'queued', 'action': likequeue.UNLIKE},
+                        status=status.HTTP_202_ACCEPTED)
+
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        try:
+            with sqlite.write_transaction():
+                like = serializer.save(user=self.request.user)
+                adjust_question_counters(like.question_id, likes=1)
+                ranking.record_like(like.question_id, like.created_at)
+        except IntegrityError:
+            # unique_together (user, question) greift auch bei gleichzeitigen Requests.
+            raise ValidationError({'non_field_errors': ['You have already liked this question.']})
+
+    def perform_destroy(self, instance):
+        with sqlite.write_transaction():
+            instance.delete()
+            adjust_question_counters(instance.question_id, likes=-1)
+            ranking.record_like(instance.question_id, instance.created_at, remove=True)
+
+    @action(detail=False, methods=['post', 'delete'], url_path='bulk')
+    def bulk(self, request):
+        """
+        POST/DELETE /api/forum/likes/bulk/ {"questions": [1, 2, ...]}
+        Liked bzw. entfernt Likes für alle Fragen auf einmal und liefert pro
+        Frage einen Status: created/exists/not_found bzw. deleted/not_liked.
+        """
+        serializer = BulkLikeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        question_ids = list(dict.fromkeys(serializer.validated_data['questions']))
+        if likequeue.is_enabled():
+            action = likequeue.UNLIKE if request.method == 'DELETE' else likequeue.LIKE
+            likequeue.enqueue(request.user.pk, question_ids, action)
+            return Response({'results': [{'question': pk, 'status': 'queued'} for pk in question_ids]},
+                            status=status.HTTP_202_ACCEPTED)
+        if request.method == 'DELETE':
+            return self._bulk_unlike(request.user, question_ids)
+
+        existing = set(Question.objects.filter(pk__in=question_ids).values_list('pk', flat=True))
+        with sqlite.write_transaction():
+            # write_transaction beginnt mit BEGIN IMMEDIATE und hält schon die Schreibsperre;
+            # zwischen dieser Abfrage und dem INSERT kommt kein anderer Like dazu.
+            liked = set(Like.objects.filter(user=request.user, question_id__in=existing)
+                        .values_list('question_id', flat=True))
+            created = {pk for pk in existing if pk not in liked}
+            Like.objects.bulk_create([Like(user=request.user, question_id=pk) for pk in question_ids
+                                      if pk in created], ignore_conflicts=True)
+            # ignore_conflicts liefert keine IDs.
+            new_likes = list(Like.objects.filter(user=request.user, question_id__in=created))
+            adjust_many_question_counters(likes=dict.fromkeys(created, 1))
+            ranking.record_many(likes=dict.fromkeys(created, 1), when=timezone.now())
+            # bulk_create löst keine Signale aus, auch nicht für die Server-Sent Events.
+            changes.record_many(new_likes, Change.UPSERT)
+            for like in new_likes:
+                events.publish_on_commit(like.question_id, 'like.created', LikeSerializer(like).data)
+        # bulk_create löst keine Signale aus.
+        if created:
+            invalidate('questions', *(f'question:{pk}' for pk in created))
+
+        results = [{'question': pk,
+                    'status': 'created' if pk in created else 'exists' if pk in existing else 'not_found'}
+                   for pk in question_ids]
+        return Response({'results': results},
+                        status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'])
+    def pending(self, request):
+        """
+        GET /api/forum/likes/pending/?question=1,2
+        Likes/Unlikes des Users, die noch in der Write-behind-Queue liegen.
+        """
+        if not likequeue.is_enabled():
+            return Response({'results': []})
+        question_ids = request.query_params.get('question')
+        if question_ids is not None:
+            try:
+                question_ids = [int(pk) for pk in question_ids.split(',') if pk.strip()]
+            except ValueError:
+                return Response({'question': 'Expected a comma-separated list of ids.'},
+                                status=status.HTTP_400_BAD_REQUEST)
+        entries = likequeue.pending(request.user.pk, question_ids)
+        results = [{'question': pk, 'action': action,
+                    'queued_at': datetime.fromtimestamp(queued_at, dt_timezone.utc)}
+                   for pk, (action, queued_at) in entries.items()]
+        return Response({'results': results})
+
+    def _bulk_unlike(self, user, question_ids):
+        with sqlite.write_transaction():
+            likes = Like.objects.filter(user=user, question_id__in=question_ids)
+            removed = list(likes.values_list('question_id', 'created_at'))
+            deleted = {question_id for question_id, _ in removed}
+            # Die Like-Signale (Cache, Server-Sent Events) laufen beim delete() je Zeile.
+            likes.delete()
+            adjust_many_question_counters(likes=dict.fromkeys(deleted, -1))
+            for question_id, created_at in removed:
+                ranking.record_like(question_id, created_at, remove=True)
+        results = [{'question': pk, 'status': 'deleted' if pk in deleted else 'not_liked'}
+                   for pk in question_ids]
+        return Response({'results': results})
+
+
+class AnswerBulkCreateView(APIView):
+    """
+    POST /api/forum/answers/bulk/ [{"question": 1, "content": "..."}, ...]
+    Legt alle gültigen Antworten in einer Transaktion an und liefert pro Eintrag
+    created (mit id) oder invalid (mit errors).
+    """
+    permission_classes = [IsAuthenticated]
+    max_items = 100
+
+    def post(self, request):
+        if not isinstance(request.data, list) or not request.data:
+            return Response({'detail': 'Expected a non-empty list of answers.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if len(request.data) > self.max_items:
+            return Response({'detail': f'At most {self.max_items} answers per request.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        results, valid = [], []
+        for index, item in enumerate(request.data):
+            serializer = BulkAnswerItemSerializer(data=item)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+                results.append(None)
+            else:
+                results.append({'index': index, 'status': 'invalid', 'errors': serializer.errors})
+
+        # Eine Query prüft die Fragen aller Einträge.
+        existing = set(Question.objects.filter(pk__in={data['question'] for _, data in valid})
+                       .values_list('pk', flat=True))
+        pending = []
+        for index, data in valid:
+            if data['question'] in existing:
+                pending.append((index, Answer(question_id=data['question'], content=data['content'],
+                                              author=request.user)))
+            else:
+                results[index] = {'index': index, 'status': 'invalid',
+                                  'errors': {'question': [f'Invalid pk "{data["question"]}" - object does not exist.']}}
+
+        answers = [answer for _, answer in pending]
+        if answers:
+            with sqlite.write_transaction():
+                Answer.objects.bulk_create(answers)
+                counts = Counter(answer.question_id for answer in answers)
+                adjust_many_question_counters(answers=counts)
+                ranking.record_many(answers=counts, when=answers[0].created_at)
+                if tasks.is_deferred():
+                    tasks.enqueue_many(search.refresh_answer, [(answer.pk,) for answer in answers])
+                else:
+                    search.index_answers(answers)
+                changes.record_many(answers, Change.UPSERT)
+                for answer in answers:
+                    events.publish_on_commit(answer.question_id, 'answer.created', AnswerSerializer(answer).data)
+            invalidate('answers', 'questions',
+                       *(f'question:{pk}' for pk in {answer.question_id for answer in answers}))
+        for index, answer in pending:
+            results[index] = {'index': index, 'status': 'created', 'id': answer.pk}
+
+        return Response({'results': results},
+                        status=status.HTTP_201_CREATED if answers else status.HTTP_400_BAD_REQUEST)
+
+
+class SearchView(APIView):
+    """
+    Gerankte Volltextsuche über Fragen und Antworten.
+    GET /api/forum/search/?q=<text>&type=question|answer&limit=<n>
+    """
+    permission_classes = [permissions.AllowAny]
+    max_limit = 100
+
+    def get(self, request):
+        text = request.query_params.get('q', '')
+        kinds = request.query_params.get('type')
+        kinds = kinds.split(',') if kinds else ('question', 'answer')
+        try:
+            limit = min(int(request.query_params.get('limit', 20)), self.max_limit)
+        except ValueError:
+            return Response({'limit': 'A valid integer is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not search.is_available():
+            return Response({'detail': 'Full-text search is not available on this database.'},
+                            status=status.HTTP_501_NOT_IMPLEMENTED)
+        return Response(search.search(text, kinds=kinds, limit=max(limit, 1)))
+
+
+class ChangesView(APIView):
+    """
+    Inkrementelle Synchronisation über das Änderungsprotokoll (siehe forum_app/changes.py).
+    GET /api/forum/changes/?since=<cursor>&limit=<n>
+    Liefert geänderte Objekte im aktuellen Stand, gelöschte unter ``deleted`` und den
+    nächsten ``cursor``; bei ``has_more`` sofort erneut abfragen.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        config = changes.get_settings()
+        since = request.query_params.get('since', '0')
+        if not since.isdigit():
+            return Response({'since': 'A valid integer is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(int(request.query_params.get('limit', config['PAGE_SIZE'])), config['MAX_PAGE_SIZE'])
+        except ValueError:
+            return Response({'limit': 'A valid integer is required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        context = {'request': request, 'expand': set(), 'fields': None}
+        serializers = {
+            'question': lambda objects: QuestionSerializer(objects, many=True, context=context).data,
+            'answer': lambda objects: AnswerSerializer(objects, many=True, context=context).data,
+            'like': lambda objects: LikeSerializer(objects, many=True, context=context).data,
+        }
+        return Response(changes.changes_since(int(since), max(limit, 1), serializers))
+
+
+class MetricsView(APIView):
+    """
+    Aggregierte Request-Metriken pro Route (siehe forum_app/api/instrumentation.py)
+    und Treffer des Response-Caches. GET liefert die Werte des aktuellen
+    Prozesses, DELETE setzt sie zurück.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response({'routes': metrics.snapshot(), 'response_cache': response_cache.stats()})
+
+    def delete(self, request):
+        metrics.reset()
+        response_cache.reset_stats()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ExportView(APIView):
+    """
+    Streamt eine komplette Tabelle als NDJSON oder CSV, ohne sie in den Speicher zu laden.
+    GET /api/forum/export/<questions|answers|likes>/?output=ndjson|csv&since=<datum>&after_id=<id>
+    ``output`` statt ``format``, da DRF ``format`` selbst auswertet.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, kind):
+        if kind not in export.EXPORTS:
+            return Response({'detail': f'Unknown export "{kind}".'}, status=status.HTTP_404_NOT_FOUND)
+        output = request.query_params.get('output', 'ndjson')
+        if output not in export.FORMATS:
+            return Response({'output': f'Choose one of {", ".join(export.FORMATS)}.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        since = request.query_params.get('since')
+        if since is not None:
+            try:
+                since = export.parse_since(since)
+            except ValueError:
+                raise ValidationError({'since': 'Expected a valid ISO 8601 date or datetime.'})
+        after_id = request.query_params.get('after_id')
+        if after_id is not None:
+            if not after_id.isdigit():
+                return Response({'after_id': 'A valid integer is required.'},
+                                status=status.HTTP_400_BAD_REQUEST)
+            after_id = int(after_id)
+
+        fields, rows = export.export_rows(kind, since=since, after_id=after_id)
+        response = StreamingHttpResponse(export.render(output, fields, rows),
+                                         content_type=export.FORMATS[output])
+        response['Content-Disposition'] = f'attachment; filename="{kind}.{output}"'
+        return response
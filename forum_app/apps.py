@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ForumAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'forum_app'
+
+    def ready(self):
+        from forum_app import signals  # noqa: F401
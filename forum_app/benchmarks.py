@@ -0,0 +1,491 @@
+"""
+Reproduzierbare API-Benchmarks.
+
+Die Szenarien laufen in-process über den echten URL-Router (core.urls) gegen
+die konfigurierte Datenbank. Für jedes Szenario werden Latenz-Perzentile,
+Queries pro Request und Bytes pro Response gemessen. Ergebnisse lassen sich
+als JSON speichern und mit einem früheren Lauf vergleichen (compare_results).
+run_server_comparison misst den Durchsatz bei hoher Parallelität unter WSGI
+und ASGI. Aufruf über ``manage.py benchmark_api``. run_stress misst gemischte
+Lese-/Schreiblast auf einer eigenen SQLite-Datei mit und ohne Tuning-Profil
+(``manage.py stress_sqlite``).
+"""
+import asyncio
+import json
+import math
+import platform
+import random
+import statistics
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+from unittest import mock
+
+import django
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connection, connections
+from django.db.models import Count, F
+from django.test import AsyncClient, Client, override_settings
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+
+from django.contrib.auth.models import User
+from forum_app import sqlite
+from forum_app.api.async_views import AsyncReadView
+from forum_app.api.caching import response_cache
+from forum_app.models import Question, Like
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    # Liefert (url, data) für die i-te Wiederholung.
+    request: Callable[[int], tuple]
+    authenticated: bool = False
+    expected_status: tuple = (200,)
+
+
+@dataclass
+class Fixtures:
+    """Zufällig, aber reproduzierbar gewählte Objekte, auf die sich die Szenarien beziehen."""
+    user: User
+    question_ids: list
+    search_terms: list
+    author_name: str
+    like_targets: list = field(default_factory=list)
+
+
+def percentile(values, pct):
+    """Perzentil nach der Nearest-Rank-Methode."""
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def build_fixtures(seed=0, sample_size=200):
+    rng = random.Random(seed)
+    all_ids = list(Question.objects.order_by('id').values_list('id', flat=True))
+    if not all_ids:
+        raise RuntimeError('No questions in the database; seed it with generate_forum_data first.')
+    # Ein Autor mit mittlerer Aktivität, damit die Sortierung nicht über alle Antworten läuft.
+    authors = list(User.objects.annotate(answers=Count('answer')).filter(answers__gt=0)
+                   .order_by('-answers', 'id').values_list('username', flat=True)[:50])
+    user = User.objects.filter(username='benchmark').first() or User.objects.create_user('benchmark')
+    Token.objects.get_or_create(user=user)
+    liked = set(Like.objects.filter(user=user).values_list('question_id', flat=True))
+    candidates = rng.sample(all_ids, min(len(all_ids), 5000))
+    return Fixtures(user=user,
+                    question_ids=rng.sample(all_ids, min(len(all_ids), sample_size)),
+                    search_terms=['django', 'cache', 'query', 'react', 'index'],
+                    author_name=authors[len(authors) // 2] if authors else '',
+                    like_targets=[pk for pk in candidates if pk not in liked])
+
+
+def default_scenarios(fixtures):
+    questions = fixtures.question_ids
+
+    def pick(i):
+        return questions[i % len(questions)]
+
+    return [
+        Scenario('question_list', 'get', lambda i: (reverse('question-list') + '?page_size=20', None)),
+        Scenario('question_list_expanded', 'get',
+                 lambda i: (reverse('question-list') + '?page_size=20&expand=answers,likes', None)),
+        Scenario('question_detail', 'get',
+                 lambda i: (reverse('question-detail', kwargs={'pk': pick(i)}), None)),
+        Scenario('answer_search', 'get',
+                 lambda i: (reverse('answer-list-create') + '?search='
+                            + fixtures.search_terms[i % len(fixtures.search_terms)]
+                            + '&author=' + fixtures.author_name, None)),
+        Scenario('answer_ordering', 'get',
+                 lambda i: (reverse('answer-list-create') + '?ordering=-content&author='
+                            + fixtures.author_name, None)),
+        Scenario('like_create', 'post',
+                 lambda i: (reverse('like-list'),
+                            {'question': fixtures.like_targets[i % len(fixtures.like_targets)]}),
+                 authenticated=True, expected_status=(201,)),
+    ]
+
+
+@contextmanager
+def benchmark_environment(use_cache=False):
+    """
+    Schaltet Throttling ab (sonst misst man nach wenigen Requests nur noch 429)
+    und standardmäßig auch den Response-Cache, damit der eigentliche Request-Pfad
+    gemessen wird. DEBUG ist aus, damit Django keine Query-Logs mitschreibt.
+    """
+    enabled = response_cache.enabled
+    response_cache.enabled = use_cache
+    response_cache.clear()
+    try:
+        with override_settings(DEBUG=False, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']), \
+                mock.patch.object(APIView, 'get_throttles', lambda self: []), \
+                mock.patch.object(AsyncReadView, 'get_throttles', lambda self: []):
+            yield
+    finally:
+        response_cache.enabled = enabled
+
+
+def run_scenario(scenario, client, iterations, warmup):
+    latencies, query_counts, sizes = [], [], []
+    queries = 0
+
+    def count_queries(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count_queries):
+        for i in range(warmup + iterations):
+            url, data = scenario.request(i)
+            queries = 0
+            started = time.perf_counter()
+            response = getattr(client, scenario.method)(url, data, format='json')
+            elapsed = time.perf_counter() - started
+            if response.status_code not in scenario.expected_status:
+                raise RuntimeError(
+                    f'{scenario.name}: {scenario.method.upper()} {url} returned '
+                    f'{response.status_code}: {response.content[:200]!r}')
+            if i >= warmup:
+                latencies.append(elapsed * 1000)
+                query_counts.append(queries)
+                sizes.append(len(response.content))
+
+    return {
+        'iterations': iterations,
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'mean_ms': round(statistics.fmean(latencies), 3),
+        'queries_per_request': round(statistics.fmean(query_counts), 2),
+        'bytes_per_response': round(statistics.fmean(sizes)),
+    }
+
+
+def run_benchmarks(iterations=200, warmup=20, seed=0, only=None, use_cache=False):
+    """
+    Jeder Request committet wie im Betrieb in seiner eigenen Transaktion, samt
+    fsync und on_commit-Hooks; deshalb nur gegen einen Wegwerf-Datensatz laufen
+    lassen. Die von like_create angelegten Likes werden danach über die API
+    wieder gelöscht, damit Zähler und Ranking stimmen.
+    """
+    with benchmark_environment(use_cache=use_cache):
+        fixtures = build_fixtures(seed=seed)
+        anonymous = APIClient()
+        authenticated = APIClient()
+        authenticated.credentials(HTTP_AUTHORIZATION='Token ' + fixtures.user.auth_token.key)
+        last_like = Like.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+
+        results = {}
+        try:
+            for scenario in default_scenarios(fixtures):
+                if only and scenario.name not in only:
+                    continue
+                client = authenticated if scenario.authenticated else anonymous
+                results[scenario.name] = run_scenario(scenario, client, iterations, warmup)
+        finally:
+            # AUTOINCREMENT: neue Likes haben größere IDs als alle vorhandenen.
+            created = Like.objects.filter(user=fixtures.user, pk__gt=last_like).values_list('pk', flat=True)
+            for pk in list(created):
+                authenticated.delete(reverse('like-detail', kwargs={'pk': pk}))
+    return {'meta': environment_metadata(iterations, warmup, seed, use_cache), 'scenarios': results}
+
+
+def _measure_wsgi(paths, concurrency):
+    """Synchrone Views über WSGI, ein Thread pro gleichzeitigem Request (wie gthread-Worker)."""
+    local = threading.local()
+
+    def fetch(path):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = Client()
+        started = time.perf_counter()
+        response = client.get(path)
+        elapsed = time.perf_counter() - started
+        if response.status_code != 200:
+            raise RuntimeError(f'GET {path} returned {response.status_code}')
+        return elapsed
+
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = list(pool.map(fetch, paths))
+        return time.perf_counter() - started, latencies
+    finally:
+        # Die Worker-Threads haben eigene Verbindungen geöffnet.
+        connections.close_all()
+
+
+def _measure_asgi(paths, concurrency):
+    """Alle Requests über einen ASGI-Handler in einer Event-Loop, höchstens ``concurrency`` gleichzeitig."""
+
+    async def run():
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(path):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(path)
+                elapsed = time.perf_counter() - started
+            if response.status_code != 200:
+                raise RuntimeError(f'GET {path} returned {response.status_code}')
+            return elapsed
+
+        started = time.perf_counter()
+        latencies = await asyncio.gather(*(fetch(path) for path in paths))
+        return time.perf_counter() - started, latencies
+
+    return asyncio.run(run())
+
+
+def run_server_comparison(concurrency=50, requests=1000, seed=0):
+    """
+    Vergleicht den Durchsatz derselben Lesezugriffe bei hoher Parallelität:
+    synchrone Views unter WSGI (Threads), synchrone Views unter ASGI und die
+    Async-Views unter ASGI. Liefert pro Endpunkt und Modus Requests/s und Latenzen.
+    """
+    with benchmark_environment():
+        rng = random.Random(seed)
+        ids = list(Question.objects.order_by('id').values_list('id', flat=True))
+        if not ids:
+            raise RuntimeError('No questions in the database; seed it with generate_forum_data first.')
+        picks = [rng.choice(ids) for _ in range(requests)]
+        endpoints = {
+            'question_list': (
+                lambda pk: reverse('question-list') + '?page_size=20',
+                lambda pk: reverse('async-question-list') + '?page_size=20'),
+            'question_detail': (
+                lambda pk: reverse('question-detail', kwargs={'pk': pk}),
+                lambda pk: reverse('async-question-detail', kwargs={'pk': pk})),
+        }
+
+        results = {}
+        for name, (sync_path, async_path) in endpoints.items():
+            sync_paths = [sync_path(pk) for pk in picks]
+            async_paths = [async_path(pk) for pk in picks]
+            for mode, measure, paths in (('wsgi_sync', _measure_wsgi, sync_paths),
+                                         ('asgi_sync', _measure_asgi, sync_paths),
+                                         ('asgi_async', _measure_asgi, async_paths)):
+                wall, latencies = measure(paths, concurrency)
+                latencies = [latency * 1000 for latency in latencies]
+                results[f'{name}:{mode}'] = {
+                    'requests': requests,
+                    'concurrency': concurrency,
+                    'requests_per_second': round(requests / wall, 1),
+                    'p50_ms': round(percentile(latencies, 50), 3),
+                    'p95_ms': round(percentile(latencies, 95), 3),
+                    'p99_ms': round(percentile(latencies, 99), 3),
+                }
+    return {'meta': environment_metadata(requests, 0, seed, False), 'servers': results}
+
+
+def format_server_table(results):
+    header = f"{'endpoint:mode':<32}{'req/s':>10}{'p50':>9}{'p95':>9}{'p99':>9}"
+    lines = [header, '-' * len(header)]
+    for name, result in results['servers'].items():
+        lines.append(f"{name:<32}{result['requests_per_second']:>10.1f}{result['p50_ms']:>9.2f}"
+                     f"{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}")
+    return '\n'.join(lines)
+
+
+STRESS_ALIAS = 'forum_stress'
+
+# Profil -> FORUM_SQLITE. None übernimmt settings.FORUM_SQLITE.
+STRESS_PROFILES = {
+    # SQLite-Standard: Rollback-Journal, synchronous=FULL, deferred Transaktionen.
+    'baseline': {'JOURNAL_MODE': 'DELETE', 'SYNCHRONOUS': 'FULL', 'BUSY_TIMEOUT_MS': None,
+                 'MMAP_SIZE': 0, 'CACHE_SIZE_KIB': None, 'WRITE_TRANSACTION_MODE': None},
+    'tuned': None,
+}
+
+
+@contextmanager
+def stress_database(path, users=50, questions=500):
+    """
+    Legt unter einem eigenen Alias eine frisch migrierte SQLite-Datei ``path``
+    mit Usern und Fragen an. Die konfigurierte Datenbank bleibt unberührt.
+    Liefert (alias, user_ids, question_ids).
+    """
+    for suffix in ('', '-wal', '-shm'):
+        Path(f'{path}{suffix}').unlink(missing_ok=True)
+    connections.settings[STRESS_ALIAS] = {
+        **connections.settings[DEFAULT_DB_ALIAS], 'NAME': str(path), 'OPTIONS': {}}
+    try:
+        call_command('migrate', database=STRESS_ALIAS, verbosity=0)
+        User.objects.using(STRESS_ALIAS).bulk_create(
+            User(username=f'stress{i}') for i in range(users))
+        user_ids = list(User.objects.using(STRESS_ALIAS).values_list('id', flat=True))
+        categories = [choice[0] for choice in Question.CATEGORY_CHOICES]
+        Question.objects.using(STRESS_ALIAS).bulk_create(
+            Question(title=f'Question {i}', content='Content', author_id=user_ids[i % len(user_ids)],
+                     category=categories[i % len(categories)])
+            for i in range(questions))
+        question_ids = list(Question.objects.using(STRESS_ALIAS).values_list('id', flat=True))
+        yield STRESS_ALIAS, user_ids, question_ids
+    finally:
+        connections[STRESS_ALIAS].close()
+        del connections[STRESS_ALIAS]
+        del connections.settings[STRESS_ALIAS]
+
+
+def _toggle_like(alias, user_id, question_id):
+    """Schreibpfad wie bei Like/Unlike: Like anlegen oder löschen und den Zähler anpassen."""
+    with sqlite.write_transaction(using=alias):
+        deleted, _ = Like.objects.using(alias).filter(user_id=user_id, question_id=question_id).delete()
+        delta = -1 if deleted else 1
+        if not deleted:
+            Like.objects.using(alias).create(user_id=user_id, question_id=question_id)
+        Question.objects.using(alias).filter(pk=question_id).update(like_count=F('like_count') + delta)
+
+
+def _stress_worker(alias, deadline, write_ratio, user_ids, question_ids, seed):
+    rng = random.Random(seed)
+    categories = [choice[0] for choice in Question.CATEGORY_CHOICES]
+    reads, writes, errors = [], [], 0
+    try:
+        while time.perf_counter() < deadline:
+            write = rng.random() < write_ratio
+            started = time.perf_counter()
+            try:
+                if write:
+                    _toggle_like(alias, rng.choice(user_ids), rng.choice(question_ids))
+                else:
+                    list(Question.objects.using(alias).filter(category=rng.choice(categories))
+                         .order_by('-created_at', '-id').values_list('id', 'title', 'like_count')[:20])
+            except OperationalError:
+                # "database is locked" nach Ablauf des busy_timeout.
+                errors += 1
+                continue
+            (writes if write else reads).append((time.perf_counter() - started) * 1000)
+    finally:
+        # Auch die Standardverbindung, die transaction.on_commit der Signal-Handler öffnet.
+        connections.close_all()
+    return reads, writes, errors
+
+
+def run_stress(path, threads=8, duration=5.0, write_ratio=0.2, users=50, questions=500, seed=0,
+               profiles=tuple(STRESS_PROFILES)):
+    """
+    Gemischte Last aus Kategorie-Feeds (lesen) und Like/Unlike (schreiben) mit
+    ``threads`` Threads für ``duration`` Sekunden je Profil. Liefert pro Profil
+    Operationen/s und Latenzen getrennt nach Lesen und Schreiben sowie die Anzahl
+    der an Sperren gescheiterten Operationen.
+    """
+    results = {}
+    with stress_database(path, users, questions) as (alias, user_ids, question_ids):
+        for name in profiles:
+            pragma_config = STRESS_PROFILES[name]
+            connections[alias].close()
+            overrides = {} if pragma_config is None else {'FORUM_SQLITE': pragma_config}
+            with override_settings(**overrides):
+                transaction_mode = sqlite.get_settings()['WRITE_TRANSACTION_MODE']
+                # Die erste Verbindung stellt den (persistenten) Journal-Modus der Datei um.
+                connections[alias].ensure_connection()
+                started = time.perf_counter()
+                deadline = started + duration
+                with ThreadPoolExecutor(max_workers=threads) as pool:
+                    outcomes = list(pool.map(
+                        lambda i: _stress_worker(alias, deadline, write_ratio, user_ids, question_ids, seed + i),
+                        range(threads)))
+                wall = time.perf_counter() - started
+                journal_mode = connections[alias].cursor().execute('PRAGMA journal_mode').fetchone()[0]
+                connections[alias].close()
+
+            reads = [latency for outcome in outcomes for latency in outcome[0]]
+            writes = [latency for outcome in outcomes for latency in outcome[1]]
+            results[name] = {
+                'journal_mode': journal_mode,
+                'transaction_mode': transaction_mode or 'DEFERRED',
+                'operations_per_second': round((len(reads) + len(writes)) / wall, 1),
+                'reads_per_second': round(len(reads) / wall, 1),
+                'writes_per_second': round(len(writes) / wall, 1),
+                'read_p95_ms': round(percentile(reads, 95), 3) if reads else None,
+                'write_p95_ms': round(percentile(writes, 95), 3) if writes else None,
+                'locked_errors': sum(outcome[2] for outcome in outcomes),
+            }
+    meta = {'threads': threads, 'duration_s': duration, 'write_ratio': write_ratio,
+            'users': users, 'questions': questions, 'seed': seed}
+    return {'meta': meta, 'profiles': results}
+
+
+def format_stress_table(results):
+    header = f"{'profile':<12}{'journal':>9}{'ops/s':>10}{'reads/s':>10}{'writes/s':>10}" \
+             f"{'read p95':>10}{'write p95':>11}{'locked':>8}"
+    lines = [header, '-' * len(header)]
+    for name, result in results['profiles'].items():
+        read_p95 = f"{result['read_p95_ms']:.2f}" if result['read_p95_ms'] is not None else '-'
+        write_p95 = f"{result['write_p95_ms']:.2f}" if result['write_p95_ms'] is not None else '-'
+        lines.append(f"{name:<12}{result['journal_mode']:>9}{result['operations_per_second']:>10.1f}"
+                     f"{result['reads_per_second']:>10.1f}{result['writes_per_second']:>10.1f}"
+                     f"{read_p95:>10}{write_p95:>11}{result['locked_errors']:>8}")
+    return '\n'.join(lines)
+
+
+def environment_metadata(iterations, warmup, seed, use_cache):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database_rows': {
+            'questions': Question.objects.count(),
+            'likes': Like.objects.count(),
+        },
+        'iterations': iterations,
+        'warmup': warmup,
+        'seed': seed,
+        'response_cache': use_cache,
+    }
+
+
+def compare_results(baseline, current, threshold=0.1, metrics=('p50_ms', 'p95_ms')):
+    """
+    Vergleicht zwei Ergebnisse und gibt eine Liste von Regressionen zurück.
+    Latenzen gelten als Regression, wenn sie um mehr als ``threshold`` (relativ)
+    steigen; Queries pro Request dürfen gar nicht steigen.
+    """
+    regressions = []
+    for name, result in current['scenarios'].items():
+        before = baseline.get('scenarios', {}).get(name)
+        if before is None:
+            continue
+        for metric in metrics:
+            if result[metric] > before[metric] * (1 + threshold):
+                regressions.append(
+                    f'{name}: {metric} {before[metric]} -> {result[metric]} '
+                    f'({(result[metric] / before[metric] - 1) * 100:+.0f}%)')
+        if result['queries_per_request'] > before['queries_per_request']:
+            regressions.append(
+                f"{name}: queries_per_request {before['queries_per_request']} -> "
+                f"{result['queries_per_request']}")
+    return regressions
+
+
+def load_results(path):
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def format_table(results):
+    header = f"{'scenario':<24}{'p50':>9}{'p95':>9}{'p99':>9}{'queries':>9}{'bytes':>10}"
+    lines = [header, '-' * len(header)]
+    for name, result in results['scenarios'].items():
+        lines.append(f"{name:<24}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}"
+                     f"{result['p99_ms']:>9.2f}{result['queries_per_request']:>9}"
+                     f"{result['bytes_per_response']:>10}")
+    return '\n'.join(lines)
@@ -0,0 +1,129 @@
+"""
+Änderungsprotokoll für die inkrementelle Synchronisation (GET /api/forum/changes/).
+
+Jedes Anlegen, Ändern und Löschen einer Frage, Antwort oder eines Likes
+schreibt in derselben Transaktion eine Zeile in forum_app_change (Signale in
+forum_app.signals, die Bulk-Pfade über record_many). Deren id ist der Cursor:
+Unter SQLite gibt es nur einen Schreiber gleichzeitig, und AUTOINCREMENT
+vergibt keine id doppelt, die ids werden also in aufsteigender Reihenfolge
+sichtbar. Gelöschte Objekte (auch per CASCADE) bleiben als Tombstone erhalten.
+
+changes_since(cursor) liest ab dem Cursor per Bereichs-Scan über den
+Primärschlüssel; die Kosten hängen nur von der Zahl der Änderungen ab. Für
+geänderte Objekte kommt der aktuelle Stand, für gelöschte nur die id. Zu
+geänderten Antworten und Likes wird auch die Frage mitgeliefert, deren Zähler
+sich dabei geändert haben.
+
+``manage.py compact_changes`` löscht Einträge, die von einem jüngeren Eintrag
+desselben Objekts überholt sind. Das ist für jeden Cursor verlustfrei; die
+Tabelle wächst so mit der Zahl der Objekte statt mit der Zahl der Änderungen.
+Cursor 0 liefert den kompletten Bestand (die Migration trägt alle Zeilen ein,
+die es vor dem Protokoll gab).
+
+Konfiguration über settings.FORUM_CHANGES: 'PAGE_SIZE', 'MAX_PAGE_SIZE'.
+"""
+from django.conf import settings
+from django.db import connection
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from forum_app.models import Answer, Change, Like, Question
+
+DEFAULT_SETTINGS = {
+    'PAGE_SIZE': 500,
+    'MAX_PAGE_SIZE': 1000,
+}
+
+# Name im Protokoll und in der Antwort je Modell.
+MODELS = {
+    Question: 'question',
+    Answer: 'answer',
+    Like: 'like',
+}
+
+
+def get_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'FORUM_CHANGES', {})}
+
+
+def _question_id(instance):
+    return instance.pk if isinstance(instance, Question) else instance.question_id
+
+
+def record(instance, action):
+    """Protokolliert ``instance`` in der Datenbank, aus der es stammt."""
+    record_many([instance], action, using=instance._state.db)
+
+
+def record_many(instances, action, using=None):
+    """Wie record für viele Objekte mit einem INSERT (z.B. nach bulk_create)."""
+    now = timezone.now()
+    entries = [Change(model=MODELS[type(instance)], object_id=instance.pk, action=action,
+                      question_id=_question_id(instance), created_at=now)
+               for instance in instances]
+    if entries:
+        Change.objects.using(using).bulk_create(entries)
+
+
+def record_new_rows(models=None, using=connection, change_model=Change):
+    """
+    Trägt Zeilen ein, deren id über der höchsten protokollierten id ihres Modells
+    liegt (Migration, Massenimporte per Raw-SQL). Gibt die Anzahl je Modell zurück.
+    """
+    models = models or {model._meta.db_table: (name, model is Question) for model, name in MODELS.items()}
+    change_table = using.ops.quote_name(change_model._meta.db_table)
+    counts = {}
+    with using.cursor() as cursor:
+        for table, (name, is_question) in models.items():
+            question_column = 'id' if is_question else 'question_id'
+            cursor.execute(
+                f"INSERT INTO {change_table} (model, object_id, action, question_id, created_at) "
+                f"SELECT %s, id, %s, {question_column}, %s FROM {using.ops.quote_name(table)} "
+                f"WHERE id > (SELECT COALESCE(MAX(object_id), 0) FROM {change_table} WHERE model = %s) "
+                f"ORDER BY id",
+                [name, Change.UPSERT, using.ops.adapt_datetimefield_value(timezone.now()), name])
+            counts[name] = cursor.rowcount
+    return counts
+
+
+def compact():
+    """Löscht überholte Einträge; gibt ihre Anzahl zurück."""
+    newer = Change.objects.filter(model=OuterRef('model'), object_id=OuterRef('object_id'), id__gt=OuterRef('id'))
+    deleted, _ = Change.objects.filter(Exists(newer)).delete()
+    return deleted
+
+
+def changes_since(cursor, limit, serializers):
+    """
+    Änderungen nach ``cursor`` (höchstens ``limit`` Protokolleinträge). ``serializers``
+    bildet die Modellnamen auf Funktionen ab, die eine Liste von Objekten serialisieren.
+    """
+    entries = list(Change.objects.filter(id__gt=cursor).order_by('id')
+                   .values_list('id', 'model', 'object_id', 'action', 'question_id')[:limit + 1])
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    # Pro Objekt zählt der jüngste Eintrag der Seite.
+    latest = {}
+    touched_questions = set()
+    for _, model, object_id, action, question_id in entries:
+        latest[model, object_id] = action
+        touched_questions.add(question_id)
+
+    deleted = {name: [] for name in MODELS.values()}
+    upserted = {name: set() for name in MODELS.values()}
+    for (model, object_id), action in latest.items():
+        if action == Change.DELETE:
+            deleted[model].append(object_id)
+        else:
+            upserted[model].add(object_id)
+    # Fragen, deren Antworten oder Likes sich geändert haben, haben neue Zähler.
+    upserted['question'] |= touched_questions - set(deleted['question'])
+
+    payload = {'cursor': entries[-1][0] if entries else cursor, 'has_more': has_more}
+    for model, name in MODELS.items():
+        # Inzwischen gelöschte Objekte fehlen hier; ihr Tombstone folgt auf einer späteren Seite.
+        objects = model.objects.filter(pk__in=upserted[name]).order_by('pk')
+        payload[f'{name}s'] = serializers[name](objects) if upserted[name] else []
+    payload['deleted'] = {f'{name}s': sorted(ids) for name, ids in deleted.items()}
+    return payload
@@ -0,0 +1,76 @@
+from collections import defaultdict
+
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from forum_app import changes, tasks
+from forum_app.api.caching import invalidate
+from forum_app.models import Question, Answer, Like, Change
+
+
+def _counter_changes(likes, answers):
+    changes = {}
+    for field, delta in (('like_count', likes), ('answer_count', answers)):
+        if delta > 0:
+            changes[field] = F(field) + delta
+        elif delta < 0:
+            # Nie unter 0 fallen, falls Zeilen am Zähler vorbei angelegt wurden.
+            changes[field] = Greatest(F(field) + delta, Value(0))
+    return changes
+
+
+def adjust_question_counters(question_id, likes=0, answers=0):
+    """
+    Passt die denormalisierten Zähler einer Frage atomar per F-Ausdruck an,
+    damit gleichzeitige Likes/Antworten keine Inkremente verlieren.
+    """
+    if tasks.is_deferred():
+        # Statt Deltas im Request: später aus den Zeilen neu zählen (siehe forum_app.tasks).
+        tasks.enqueue(refresh_question_counters, question_id)
+        return
+    changes = _counter_changes(likes, answers)
+    if changes:
+        Question.objects.filter(pk=question_id).update(**changes)
+
+
+def adjust_many_question_counters(likes=None, answers=None):
+    """
+    Wie adjust_question_counters für viele Fragen auf einmal. ``likes`` und
+    ``answers`` bilden question_id auf das Delta ab; Fragen mit gleichem Delta
+    teilen sich ein UPDATE.
+    """
+    likes, answers = likes or {}, answers or {}
+    if tasks.is_deferred():
+        tasks.enqueue_many(refresh_question_counters, [(pk,) for pk in sorted(likes.keys() | answers.keys())])
+        return
+    groups = defaultdict(list)
+    for question_id in likes.keys() | answers.keys():
+        groups[likes.get(question_id, 0), answers.get(question_id, 0)].append(question_id)
+    for (like_delta, answer_delta), question_ids in groups.items():
+        changes = _counter_changes(like_delta, answer_delta)
+        if changes:
+            Question.objects.filter(pk__in=question_ids).update(**changes)
+
+
+def _count_subquery(model):
+    counts = (model.objects.filter(question=OuterRef('pk'))
+              .order_by().values('question').annotate(total=Count('pk')).values('total'))
+    return Coalesce(Subquery(counts), Value(0))
+
+
+def rebuild_question_counters(queryset=None):
+    """
+    Berechnet like_count/answer_count aus den echten Zeilen neu, in einem
+    einzigen UPDATE für alle Fragen des Querysets. Gibt die Anzahl Fragen zurück.
+    """
+    if queryset is None:
+        queryset = Question.objects.all()
+    return queryset.update(like_count=_count_subquery(Like), answer_count=_count_subquery(Answer))
+
+
+def refresh_question_counters(question_id):
+    """Aufgabe für forum_app.tasks: Zähler einer Frage neu zählen (idempotent)."""
+    if rebuild_question_counters(Question.objects.filter(pk=question_id)):
+        invalidate('questions', f'question:{question_id}')
+        # Die Zähler ändern sich erst nach dem Eintrag der Antwort bzw. des Likes.
+        changes.record_many([Question(pk=question_id)], Change.UPSERT)
@@ -0,0 +1,197 @@
+"""
+In-Process-Pub/Sub für Änderungen an einer Frage (Server-Sent Events).
+
+Die Signale in forum_app.signals veröffentlichen nach dem Commit Deltas je
+Frage: answer.created/updated/deleted, like.created/deleted und
+question.deleted. QuestionEventsView (forum_app/api/events.py) streamt sie an
+die Abonnenten einer Frage, statt dass Clients die Detailansicht pollen.
+
+- Jedes Ereignis bekommt eine im Prozess fortlaufende Nummer; die ID für
+  Clients ist '<Epoche>-<Nummer>' mit einer zufälligen Epoche je Broker. Pro
+  Frage hält ein Ringpuffer die letzten 'BUFFER_SIZE' Ereignisse; Clients
+  setzen mit Last-Event-ID dort fort. Fehlt etwas dazwischen (Puffer
+  übergelaufen, Frage aus dem Speicher verdrängt) oder stammt die ID aus
+  einem anderen Prozess (Neustart, anderer Worker: andere Epoche), bekommt
+  der Client ein 'reset' und lädt die Frage neu.
+- Ein Abonnent ist nur ein Puffer mit asyncio.Event in seiner Event-Loop;
+  wartende Verbindungen belegen keinen Thread. Wer mehr als 'QUEUE_SIZE'
+  Ereignisse nicht abholt, bekommt ebenfalls ein 'reset'.
+- Gepuffert werden die Ereignisse von höchstens 'MAX_BUFFERED_QUESTIONS'
+  Fragen (LRU).
+
+Die Ereignisse gelten nur für den eigenen Prozess; bei mehreren Workern sieht
+ein Abonnent nur die Änderungen, die über seinen Worker liefen.
+
+Konfiguration über settings.FORUM_EVENTS:
+    'BUFFER_SIZE', 'QUEUE_SIZE', 'MAX_BUFFERED_QUESTIONS',
+    'HEARTBEAT_SECONDS': Kommentarzeile, damit Proxys die Verbindung offen halten.
+"""
+import itertools
+import threading
+import uuid
+from collections import OrderedDict, deque
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import transaction
+
+DEFAULT_SETTINGS = {
+    'BUFFER_SIZE': 100,
+    'QUEUE_SIZE': 1000,
+    'MAX_BUFFERED_QUESTIONS': 10000,
+    'HEARTBEAT_SECONDS': 15,
+}
+
+RESET = 'reset'
+
+
+def get_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'FORUM_EVENTS', {})}
+
+
+class Event(NamedTuple):
+    id: int
+    name: str
+    data: dict
+
+
+class _Topic:
+    def __init__(self, buffer_size, floor):
+        self.events = deque(maxlen=buffer_size)
+        # Ab dieser ID ist der Puffer lückenlos (ältere sind herausgefallen oder verdrängt).
+        self.floor = floor
+        self.subscribers = set()
+
+
+class Subscription:
+    """Abonnement einer Frage innerhalb einer Event-Loop."""
+
+    def __init__(self, broker, question_id, loop, ready):
+        self.broker = broker
+        self.question_id = question_id
+        self.loop = loop
+        self.ready = ready
+        self.pending = deque()
+        self.overflowed = False
+        self.last_id = 0
+
+    def _deliver(self, event, queue_size):
+        # Läuft in der Event-Loop des Abonnenten.
+        self.last_id = event.id
+        if len(self.pending) >= queue_size:
+            self.overflowed = True
+            self.pending.clear()
+        if not self.overflowed:
+            self.pending.append(event)
+        self.ready.set()
+
+    def drain(self):
+        """Bisher zugestellte Ereignisse; ein Überlauf liefert nur noch RESET."""
+        self.ready.clear()
+        if self.overflowed:
+            return [Event(self.last_id, RESET, {})]
+        events = list(self.pending)
+        self.pending.clear()
+        return events
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class Broker:
+    def __init__(self):
+        # Unterscheidet die IDs dieses Brokers von denen früherer oder anderer Prozesse.
+        self.epoch = uuid.uuid4().hex[:12]
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._last_id = 0
+        self._topics = OrderedDict()
+        # Höchste ID aller verdrängten Fragen: für diese ist keine Fortsetzung mehr möglich.
+        self._forgotten = 0
+
+    def publish(self, question_id, name, data):
+        config = get_settings()
+        with self._lock:
+            event = Event(next(self._ids), name, data)
+            self._last_id = event.id
+            topic = self._topic(question_id, config)
+            if len(topic.events) == topic.events.maxlen:
+                topic.floor = topic.events[0].id
+            topic.events.append(event)
+            subscribers = list(topic.subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, event, config['QUEUE_SIZE'])
+            except RuntimeError:
+                # Event-Loop schon beendet.
+                self.unsubscribe(subscription)
+        return event
+
+    def _topic(self, question_id, config):
+        topic = self._topics.get(question_id)
+        if topic is None:
+            topic = self._topics[question_id] = _Topic(config['BUFFER_SIZE'], self._forgotten)
+            while len(self._topics) > config['MAX_BUFFERED_QUESTIONS'] and self._evict(keep=question_id):
+                pass
+        self._topics.move_to_end(question_id)
+        return topic
+
+    def _evict(self, keep):
+        # Die am längsten unveränderte Frage ohne Abonnenten verdrängen. Haben alle
+        # Abonnenten, wächst die Zahl der Fragen über das Limit.
+        for question_id, topic in self._topics.items():
+            if question_id != keep and not topic.subscribers:
+                del self._topics[question_id]
+                if topic.events:
+                    self._forgotten = max(self._forgotten, topic.events[-1].id)
+                return True
+        return False
+
+    def event_id(self, event):
+        """ID des Ereignisses für Clients (SSE-Feld ``id``)."""
+        return f'{self.epoch}-{event.id}'
+
+    def _sequence(self, event_id):
+        epoch, _, number = event_id.rpartition('-')
+        return int(number) if epoch == self.epoch and number.isdigit() else None
+
+    def subscribe(self, question_id, loop, ready, last_event_id=None):
+        """
+        Abonniert ``question_id`` und liefert (Subscription, Ereignisse nach
+        ``last_event_id``, einer ID aus event_id). Ist eine lückenlose Fortsetzung
+        nicht möglich, besteht die Liste nur aus RESET.
+        """
+        with self._lock:
+            topic = self._topic(question_id, get_settings())
+            subscription = Subscription(self, question_id, loop, ready)
+            topic.subscribers.add(subscription)
+            if last_event_id is None:
+                return subscription, []
+            sequence = self._sequence(last_event_id)
+            if sequence is None or sequence > self._last_id or sequence < topic.floor:
+                return subscription, [Event(self._last_id, RESET, {})]
+            return subscription, [event for event in topic.events if event.id > sequence]
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            topic = self._topics.get(subscription.question_id)
+            if topic is not None:
+                topic.subscribers.discard(subscription)
+
+    def subscriber_count(self, question_id=None):
+        with self._lock:
+            topics = self._topics.values() if question_id is None else [self._topics.get(question_id)]
+            return sum(len(topic.subscribers) for topic in topics if topic is not None)
+
+    def clear(self):
+        with self._lock:
+            self._topics.clear()
+            self._forgotten = 0
+
+
+broker = Broker()
+
+
+def publish_on_commit(question_id, name, data):
+    """Veröffentlicht erst nach dem Commit, damit zurückgerollte Änderungen nie ankommen."""
+    transaction.on_commit(lambda: broker.publish(question_id, name, data))
@@ -0,0 +1,80 @@
+"""
+Streaming-Export von Fragen, Antworten und Likes als NDJSON oder CSV.
+
+Die Zeilen kommen per values_list().iterator() in Blöcken aus der Datenbank und
+werden sofort formatiert, sodass der Speicherbedarf unabhängig von der
+Tabellengröße bleibt. Sortiert wird immer nach id; die höchste exportierte id
+dient als Wasserzeichen für den nächsten inkrementellen Export (after_id).
+Genutzt von ExportView und ``manage.py export_forum``.
+"""
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.dateparse import parse_date, parse_datetime
+
+from forum_app.models import Question, Answer, Like
+
+# Exportierbare Tabellen und ihre Spalten; Relationen nur als ID, ohne Joins.
+EXPORTS = {
+    'questions': (Question, ('id', 'title', 'content', 'author_id', 'category', 'created_at',
+                             'like_count', 'answer_count')),
+    'answers': (Answer, ('id', 'question_id', 'author_id', 'content', 'created_at')),
+    'likes': (Like, ('id', 'question_id', 'user_id', 'created_at')),
+}
+
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+CHUNK_SIZE = 2000
+
+
+def parse_since(value):
+    """
+    ISO-8601-Datum oder -Zeitpunkt für ``since``. Wirft ValueError, wenn ``value``
+    kein solches Format hat oder ein unmögliches Datum (z.B. 2024-02-30) angibt.
+    """
+    parsed = parse_datetime(value) or parse_date(value)
+    if parsed is None:
+        raise ValueError(f'Invalid date: {value!r}')
+    return parsed
+
+
+def export_rows(kind, since=None, after_id=None, chunk_size=CHUNK_SIZE):
+    """Liefert (Spaltennamen, Iterator über Tupel) für ``kind``."""
+    model, fields = EXPORTS[kind]
+    queryset = model.objects.all()
+    if since is not None:
+        queryset = queryset.filter(created_at__gte=since)
+    if after_id is not None:
+        queryset = queryset.filter(id__gt=after_id)
+    rows = queryset.order_by('id').values_list(*fields).iterator(chunk_size=chunk_size)
+    return fields, rows
+
+
+def ndjson_lines(fields, rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(fields, row))) + '\n'
+
+
+class _Echo:
+    """Datei-Ersatz für csv.writer, der die Zeile direkt zurückgibt."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(fields, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([value.isoformat() if hasattr(value, 'isoformat') else value
+                               for value in row])
+
+
+def render(output, fields, rows):
+    if output == 'csv':
+        return csv_lines(fields, rows)
+    return ndjson_lines(fields, rows)
@@ -0,0 +1,212 @@
+"""
+Write-behind-Queue für Likes.
+
+Likes sind die häufigsten Schreibzugriffe; jeder einzelne braucht unter SQLite
+die Schreibsperre der Forum-Datenbank. Mit settings.FORUM_LIKE_QUEUE['ENABLED']
+bestätigt LikeViewSet Likes und Unlikes sofort mit 202 und legt sie nur in
+einem eigenen SQLite-Journal ('PATH') ab. ``manage.py process_like_queue``
+überträgt das Journal in Batches: eine Transaktion pro Batch, die Zähler und
+das Hot-Ranking mit einem UPDATE je Gruppe (wie die Bulk-Endpunkte).
+
+Pro (user, question) gibt es höchstens einen Eintrag; ein neuer Like/Unlike
+überschreibt per UPSERT den vorherigen (der letzte gewinnt) und erhöht
+``version``. Der Worker löscht nur Einträge, deren Version er übertragen hat,
+spätere Änderungen bleiben also liegen. Das Übertragen selbst ist idempotent
+(vorhandene Likes bleiben, fehlende Unlikes sind nichts), ein Abbruch zwischen
+Commit und Löschen schadet daher nicht. Likes auf inzwischen gelöschte Fragen
+verfallen.
+
+Offene Einträge eines Users liefert GET /api/forum/likes/pending/.
+
+Konfiguration über settings.FORUM_LIKE_QUEUE:
+    'ENABLED': Write-behind aktiv, 'PATH': Datei des Journals,
+    'BATCH_SIZE': Einträge pro Transaktion des Workers,
+    'SYNCHRONOUS': PRAGMA synchronous des Journals ('FULL': bestätigte Likes
+    überstehen auch einen Stromausfall, 'NORMAL': nur einen Prozessabsturz).
+"""
+import sqlite3
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Q
+from django.utils import timezone
+
+from forum_app import changes, events, ranking, sqlite
+from forum_app.api.caching import invalidate
+from forum_app.api.serializers import LikeSerializer
+from forum_app.counters import adjust_many_question_counters
+from forum_app.models import Change, Like, Question
+
+DEFAULT_SETTINGS = {
+    'ENABLED': False,
+    'PATH': 'like_queue.sqlite3',
+    'BATCH_SIZE': 500,
+    'SYNCHRONOUS': 'FULL',
+}
+
+LIKE = 'like'
+UNLIKE = 'unlike'
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS pending_like (
+    user_id INTEGER NOT NULL,
+    question_id INTEGER NOT NULL,
+    action TEXT NOT NULL,
+    queued_at REAL NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (user_id, question_id)
+)
+'''
+
+_UPSERT = '''
+INSERT INTO pending_like (user_id, question_id, action, queued_at) VALUES (?, ?, ?, ?)
+ON CONFLICT (user_id, question_id) DO UPDATE
+SET action = excluded.action, queued_at = excluded.queued_at, version = version + 1
+'''
+
+# Eine Verbindung pro Thread und Datei; sqlite3-Verbindungen sind nicht threadsicher.
+_local = threading.local()
+
+
+def get_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'FORUM_LIKE_QUEUE', {})}
+
+
+def is_enabled():
+    return get_settings()['ENABLED']
+
+
+def _connect():
+    config = get_settings()
+    path = str(config['PATH'])
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+    if path not in connections:
+        # Autocommit; Transaktionen nur dort, wo mehrere Statements zusammengehören.
+        db = sqlite3.connect(path, isolation_level=None)
+        db.execute('PRAGMA busy_timeout = 5000')
+        db.execute('PRAGMA journal_mode = WAL')
+        db.execute(f"PRAGMA synchronous = {config['SYNCHRONOUS']}")
+        db.execute(_SCHEMA)
+        connections[path] = db
+    return connections[path]
+
+
+def close():
+    """Schließt die Journal-Verbindungen des aktuellen Threads."""
+    for db in getattr(_local, 'connections', {}).values():
+        db.close()
+    _local.connections = {}
+
+
+def enqueue(user_id, question_ids, action):
+    """Legt Likes bzw. Unlikes eines Users ab; gibt den Zeitstempel der Einträge zurück."""
+    queued_at = time.time()
+    db = _connect()
+    with db:
+        db.execute('BEGIN IMMEDIATE')
+        db.executemany(_UPSERT, [(user_id, question_id, action, queued_at) for question_id in question_ids])
+    return queued_at
+
+
+def pending(user_id, question_ids=None):
+    """Offene Einträge eines Users als {question_id: (action, queued_at)}."""
+    sql = 'SELECT question_id, action, queued_at FROM pending_like WHERE user_id = ?'
+    params = [user_id]
+    if question_ids is not None:
+        question_ids = list(question_ids)
+        sql += f" AND question_id IN ({', '.join('?' * len(question_ids))})"
+        params += question_ids
+    rows = _connect().execute(sql + ' ORDER BY queued_at, question_id', params)
+    return {question_id: (action, queued_at) for question_id, action, queued_at in rows}
+
+
+def backlog():
+    return _connect().execute('SELECT COUNT(*) FROM pending_like').fetchone()[0]
+
+
+def process_batch(batch_size=None):
+    """
+    Überträgt bis zu ``batch_size`` Einträge (älteste zuerst) in einer Transaktion
+    und gibt ihre Anzahl zurück (0 = Journal leer).
+    """
+    batch_size = batch_size or get_settings()['BATCH_SIZE']
+    db = _connect()
+    entries = db.execute(
+        'SELECT user_id, question_id, action, version FROM pending_like ORDER BY queued_at LIMIT ?',
+        [batch_size]).fetchall()
+    if not entries:
+        return 0
+
+    likes = [(user_id, question_id) for user_id, question_id, action, _ in entries if action == LIKE]
+    unlikes = [(user_id, question_id) for user_id, question_id, action, _ in entries if action == UNLIKE]
+    with sqlite.write_transaction():
+        changed = _apply_likes(likes) | _apply_unlikes(unlikes)
+    if changed:
+        invalidate('questions', *(f'question:{pk}' for pk in changed))
+
+    with db:
+        db.execute('BEGIN IMMEDIATE')
+        db.executemany('DELETE FROM pending_like WHERE user_id = ? AND question_id = ? AND version = ?',
+                       [(user_id, question_id, version) for user_id, question_id, _, version in entries])
+    return len(entries)
+
+
+def _pairs_filter(pairs):
+    by_user = defaultdict(list)
+    for user_id, question_id in pairs:
+        by_user[user_id].append(question_id)
+    condition = Q()
+    for user_id, question_ids in by_user.items():
+        condition |= Q(user_id=user_id, question_id__in=question_ids)
+    return condition
+
+
+def _apply_likes(pairs):
+    if not pairs:
+        return set()
+    # Fragen oder User, die inzwischen gelöscht wurden, würden den ganzen Batch scheitern lassen.
+    questions = set(Question.objects.filter(pk__in={question_id for _, question_id in pairs})
+                    .values_list('pk', flat=True))
+    users = set(User.objects.filter(pk__in={user_id for user_id, _ in pairs}).values_list('pk', flat=True))
+    pairs = [(user_id, question_id) for user_id, question_id in pairs
+             if question_id in questions and user_id in users]
+    if not pairs:
+        return set()
+    # write_transaction beginnt mit BEGIN IMMEDIATE und hält schon die Schreibsperre;
+    # zwischen dieser Abfrage und dem INSERT kommt kein anderer Like dazu.
+    liked = set(Like.objects.filter(_pairs_filter(pairs)).values_list('user_id', 'question_id'))
+    created = [pair for pair in pairs if pair not in liked]
+    if not created:
+        return set()
+    started = timezone.now()
+    Like.objects.bulk_create([Like(user_id=user_id, question_id=question_id) for user_id, question_id in created],
+                             ignore_conflicts=True)
+    counts = Counter(question_id for _, question_id in created)
+    adjust_many_question_counters(likes=counts)
+    ranking.record_many(likes=counts, when=started)
+    # bulk_create löst keine Signale aus (Server-Sent Events, Änderungsprotokoll).
+    new_likes = list(Like.objects.filter(_pairs_filter(created)))
+    changes.record_many(new_likes, Change.UPSERT)
+    for like in new_likes:
+        events.publish_on_commit(like.question_id, 'like.created', LikeSerializer(like).data)
+    return set(counts)
+
+
+def _apply_unlikes(pairs):
+    if not pairs:
+        return set()
+    likes = Like.objects.filter(_pairs_filter(pairs))
+    removed = list(likes.values_list('question_id', 'created_at'))
+    if not removed:
+        return set()
+    likes.delete()
+    adjust_many_question_counters(likes={question_id: -count for question_id, count
+                                         in Counter(question_id for question_id, _ in removed).items()})
+    for question_id, created_at in removed:
+        ranking.record_like(question_id, created_at, remove=True)
+    return {question_id for question_id, _ in removed}
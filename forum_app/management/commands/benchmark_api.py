@@ -0,0 +1,88 @@
+import json
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from forum_app import benchmarks
+
+# Datenmengen für --dataset; werden an generate_forum_data weitergereicht.
+DATASETS = {
+    'small': {'users': 200, 'questions': 2000, 'answers': 6000, 'likes': 10000},
+    'medium': {'users': 1000, 'questions': 20000, 'answers': 60000, 'likes': 100000},
+    'large': {'users': 10000, 'questions': 200000, 'answers': 600000, 'likes': 1000000},
+}
+
+
+class Command(BaseCommand):
+    help = ('Misst Latenz (p50/p95/p99), Queries pro Request und Antwortgröße der wichtigsten '
+            'API-Endpunkte und vergleicht optional mit einem gespeicherten Lauf.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database-file',
+                            help='Eigene SQLite-Datei für den Benchmark statt der konfigurierten DB.')
+        parser.add_argument('--dataset', choices=sorted(DATASETS),
+                            help='Die Datei aus --database-file vor dem Lauf migrieren und mit generate_forum_data befüllen.')
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--warmup', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--scenario', action='append', dest='scenarios',
+                            help='Nur dieses Szenario ausführen (mehrfach angebbar).')
+        parser.add_argument('--with-cache', action='store_true',
+                            help='Response-Cache während der Messung eingeschaltet lassen.')
+        parser.add_argument('--servers', action='store_true',
+                            help='Statt der Szenarien Durchsatz von WSGI (sync) und ASGI (sync/async) vergleichen.')
+        parser.add_argument('--concurrency', type=int, default=50,
+                            help='Gleichzeitige Requests für --servers.')
+        parser.add_argument('--requests', type=int, default=1000,
+                            help='Requests pro Endpunkt und Modus für --servers.')
+        parser.add_argument('--output', help='Ergebnis als JSON in diese Datei schreiben.')
+        parser.add_argument('--compare', help='JSON eines früheren Laufs als Baseline.')
+        parser.add_argument('--threshold', type=float, default=0.1,
+                            help='Erlaubte relative Verschlechterung gegenüber der Baseline.')
+
+    def handle(self, *args, **options):
+        if options['dataset'] and not options['database_file']:
+            raise CommandError('--dataset requires --database-file; '
+                               'it would otherwise write into the configured database.')
+        if options['database_file']:
+            if connection.vendor != 'sqlite':
+                raise CommandError('--database-file requires the sqlite backend.')
+            connection.close()
+            connection.settings_dict['NAME'] = options['database_file']
+
+        if options['dataset']:
+            call_command('migrate', verbosity=0)
+            call_command('generate_forum_data', seed=options['seed'], verbosity=0,
+                         **DATASETS[options['dataset']])
+
+        if options['servers']:
+            results = benchmarks.run_server_comparison(
+                concurrency=options['concurrency'], requests=options['requests'], seed=options['seed'])
+            self.stdout.write(benchmarks.format_server_table(results))
+            self.write_output(results, options['output'])
+            return
+
+        results = benchmarks.run_benchmarks(
+            iterations=options['iterations'],
+            warmup=options['warmup'],
+            seed=options['seed'],
+            only=options['scenarios'],
+            use_cache=options['with_cache'],
+        )
+        self.stdout.write(benchmarks.format_table(results))
+
+        self.write_output(results, options['output'])
+
+        if options['compare']:
+            regressions = benchmarks.compare_results(
+                benchmarks.load_results(options['compare']), results, threshold=options['threshold'])
+            if regressions:
+                raise CommandError('Performance regression:\n' + '\n'.join(regressions))
+            self.stdout.write(self.style.SUCCESS('No regression against baseline.'))
+
+    def write_output(self, results, path):
+        if path:
+            with open(path, 'w') as fh:
+                json.dump(results, fh, indent=2)
+            self.stdout.write(f'Results written to {path}.')
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from forum_app import changes
+
+
+class Command(BaseCommand):
+    help = 'Entfernt überholte Einträge aus dem Änderungsprotokoll (forum_app.changes).'
+
+    def handle(self, *args, **options):
+        deleted = changes.compact()
+        self.stdout.write(self.style.SUCCESS(f'Removed {deleted} superseded change entries.'))
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from forum_app import export
+
+
+class Command(BaseCommand):
+    help = ('Exportiert Fragen, Antworten oder Likes als NDJSON oder CSV, gestreamt und '
+            'optional inkrementell ab einem Zeitpunkt bzw. einer id.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(export.EXPORTS))
+        parser.add_argument('--output', choices=sorted(export.FORMATS), default='ndjson')
+        parser.add_argument('--file', help='Zieldatei; ohne Angabe stdout.')
+        parser.add_argument('--since', help='Nur Zeilen mit created_at >= diesem ISO-Datum.')
+        parser.add_argument('--after-id', type=int, help='Nur Zeilen mit id > diesem Wasserzeichen.')
+        parser.add_argument('--chunk-size', type=int, default=export.CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        since = options['since']
+        if since is not None:
+            try:
+                since = export.parse_since(since)
+            except ValueError:
+                raise CommandError('--since expects a valid ISO 8601 date or datetime.')
+
+        fields, rows = export.export_rows(options['kind'], since=since, after_id=options['after_id'],
+                                          chunk_size=options['chunk_size'])
+        count, last_id = 0, options['after_id']
+
+        def counted(rows):
+            nonlocal count, last_id
+            for row in rows:
+                count += 1
+                last_id = row[0]
+                yield row
+
+        lines = export.render(options['output'], fields, counted(rows))
+        if options['file']:
+            with open(options['file'], 'w', newline='') as fh:
+                fh.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
+
+        # Auf stderr, damit stdout nur die Daten enthält.
+        self.stderr.write(f'Exported {count} {options["kind"]}; next --after-id {last_id or 0}.')
@@ -0,0 +1,388 @@
+import itertools
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta, timezone as dt_timezone
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models.constants import OnConflict
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from forum_app import changes, ranking, search, sqlite
+from forum_app.api.caching import response_cache
+from forum_app.counters import rebuild_question_counters
+from forum_app.models import Question, Answer, Like
+
+WORDS = (
+    'django react python api query index cache database model view serializer test deploy '
+    'docker nginx css layout grid flex component state hook async thread process memory '
+    'performance latency throughput migration schema table column join filter sort page '
+    'token auth permission security csrf cors session cookie design color font pipeline '
+    'build release monitor log metric alert pandas numpy plot chart dataset clean merge '
+    'how why what when should could error bug fix slow fast best practice example'
+).split()
+
+# Fester Endpunkt des Zeitraums, damit gleicher Seed auch gleiche Zeitstempel ergibt.
+DEFAULT_END = '2026-01-01T00:00:00+00:00'
+
+
+class ZipfSampler:
+    """
+    Zieht Elemente mit Zipf-Verteilung: Rang r hat Gewicht 1 / r**s. Die Ränge
+    werden deterministisch (über ``rng``) auf die Population verteilt, damit die
+    populärsten Elemente nicht einfach die ältesten sind.
+    """
+
+    def __init__(self, population, s, rng):
+        self.population = list(population)
+        rng.shuffle(self.population)
+        self.cum_weights = list(itertools.accumulate(
+            1.0 / (rank ** s) for rank in range(1, len(self.population) + 1)))
+
+    def sample(self, rng, k):
+        return rng.choices(self.population, cum_weights=self.cum_weights, k=k)
+
+
+def bulk_insert(model, field_names, rows, ignore_conflicts=False):
+    """
+    Schreibt fertige Wertetupel per executemany, mit demselben INSERT, das
+    bulk_create erzeugen würde. bulk_create instanziiert jedes Objekt und
+    bereitet jeden Wert einzeln auf; bei Millionen Zeilen kostet das mehr als
+    das Einfügen selbst. created_at wird hier explizit gesetzt (kein auto_now_add).
+    Gibt die Zahl der tatsächlich eingefügten Zeilen zurück.
+    """
+    opts = model._meta
+    fields = [opts.get_field(name) for name in field_names]
+    on_conflict = OnConflict.IGNORE if ignore_conflicts else None
+    sql = '%s %s (%s) VALUES (%s) %s' % (
+        connection.ops.insert_statement(on_conflict=on_conflict),
+        connection.ops.quote_name(opts.db_table),
+        ', '.join(connection.ops.quote_name(field.column) for field in fields),
+        ', '.join(['%s'] * len(fields)),
+        connection.ops.on_conflict_suffix_sql(fields, on_conflict, None, None),
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+        return cursor.rowcount
+
+
+# Hier steht das DDL entfernter Indizes, bis sie wieder angelegt sind.
+PENDING_INDEX_TABLE = 'forum_deferred_index'
+
+
+def _pending_indexes(cursor):
+    cursor.execute(f'CREATE TABLE IF NOT EXISTS {PENDING_INDEX_TABLE} (name TEXT PRIMARY KEY, sql TEXT NOT NULL)')
+    cursor.execute(f'SELECT name, sql FROM {PENDING_INDEX_TABLE} ORDER BY name')
+    return cursor.fetchall()
+
+
+def restore_indexes():
+    """
+    Legt die Indizes an, die deferred_indexes entfernt und noch nicht wieder
+    angelegt hat (z.B. nach kill -9). Gibt ihre Namen zurück.
+    """
+    if connection.vendor != 'sqlite':
+        return []
+    with connection.cursor() as cursor:
+        pending = _pending_indexes(cursor)
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        existing = {name for name, in cursor.fetchall()}
+        for name, sql in pending:
+            if name not in existing:
+                cursor.execute(sql)
+            cursor.execute(f'DELETE FROM {PENDING_INDEX_TABLE} WHERE name = %s', [name])
+    return [name for name, _sql in pending]
+
+
+@contextmanager
+def deferred_indexes(model, enabled):
+    """
+    Entfernt die nicht-eindeutigen Indizes der Tabelle für die Dauer des Imports
+    und legt sie danach in einem Durchgang neu an. Bei großen Importen ist das
+    deutlich schneller, als jeden B-Baum zeilenweise zu pflegen. Eindeutige
+    Indizes bleiben bestehen, ignore_conflicts braucht sie. Nur für sqlite.
+    Das DDL wird vor dem Entfernen in PENDING_INDEX_TABLE festgehalten; wird der
+    Prozess hart beendet (kill -9), legt der nächste Lauf oder
+    ``generate_forum_data --restore-indexes`` die Indizes wieder an.
+    """
+    if not enabled or connection.vendor != 'sqlite':
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = %s "
+            "AND sql IS NOT NULL AND sql NOT LIKE 'CREATE UNIQUE%%'",
+            [model._meta.db_table])
+        indexes = cursor.fetchall()
+        _pending_indexes(cursor)
+        cursor.executemany(f'INSERT OR REPLACE INTO {PENDING_INDEX_TABLE} (name, sql) VALUES (%s, %s)', indexes)
+        for name, _sql in indexes:
+            cursor.execute(f'DROP INDEX {connection.ops.quote_name(name)}')
+    try:
+        yield
+    finally:
+        restore_indexes()
+
+
+class Command(BaseCommand):
+    help = (
+        'Erzeugt synthetische Benutzer, Fragen, Antworten und Likes für Lasttests. '
+        'Gleicher Seed und gleiche Größen erzeugen dieselben Daten; erneute Läufe '
+        'setzen nach dem letzten vollständigen Batch fort, statt Daten zu duplizieren.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--questions', type=int, default=10000)
+        parser.add_argument('--answers', type=int, default=30000)
+        parser.add_argument('--likes', type=int, default=50000,
+                            help='Anzahl Like-Versuche; doppelte (user, question)-Paare entfallen.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=50000)
+        parser.add_argument('--zipf', type=float, default=0.9,
+                            help='Exponent der Zipf-Verteilung für Popularität und Aktivität.')
+        parser.add_argument('--days', type=int, default=365,
+                            help='Zeitraum, über den created_at verteilt wird.')
+        parser.add_argument('--end', default=DEFAULT_END,
+                            help='Ende des Zeitraums als ISO-Zeitpunkt (ohne Zeitzone: UTC).')
+        parser.add_argument('--password', default='asdasd',
+                            help='Gemeinsames Passwort aller synthetischen Benutzer.')
+        parser.add_argument('--restore-indexes', action='store_true',
+                            help='Nur die Indizes wieder anlegen, die ein abgebrochener Lauf entfernt hat.')
+
+    def handle(self, *args, **options):
+        restored = restore_indexes()
+        if restored:
+            self.stdout.write(f'Restored indexes from an interrupted run: {", ".join(restored)}')
+        if options['restore_indexes']:
+            if not restored:
+                self.stdout.write('No indexes to restore.')
+            return
+        self.seed = options['seed']
+        self.batch_size = options['batch_size']
+        self.zipf = options['zipf']
+        self.prefix = f'synth_{self.seed}_'
+        try:
+            end = parse_datetime(options['end'])
+        except ValueError:
+            end = None
+        if end is None:
+            raise CommandError('--end expects an ISO 8601 datetime.')
+        if timezone.is_aware(end):
+            end = timezone.make_naive(end, dt_timezone.utc)
+        # sqlite speichert naive UTC-Zeitstempel als Text; str() liefert genau dieses Format.
+        self.end = end.replace(microsecond=0)
+        self.start = self.end - timedelta(days=options['days'])
+        self.inserted = 0
+        self.insert_seconds = 0.0
+        started = time.perf_counter()
+
+        previous_pragmas = {}
+        if connection.vendor == 'sqlite':
+            # Großer Page-Cache, damit das Einfügen in die Indizes nicht ständig von der Platte liest.
+            # synchronous=OFF gilt nur für diese Verbindung: Ein Absturz des Prozesses ist
+            # unkritisch, nur bei Stromausfall können die letzten Batches fehlen.
+            # Mit CONN_MAX_AGE lebt die Verbindung weiter; die alten Werte werden am Ende wiederhergestellt.
+            tuned = {'cache_size': -262144}
+            if not connection.in_atomic_block:
+                tuned['synchronous'] = 0
+            with connection.cursor() as cursor:
+                for name, value in tuned.items():
+                    previous_pragmas[name] = cursor.execute(f'PRAGMA {name}').fetchone()[0]
+                    cursor.execute(f'PRAGMA {name} = {value}')
+        try:
+            self.generate(options, started)
+        finally:
+            with connection.cursor() as cursor:
+                for name, value in previous_pragmas.items():
+                    cursor.execute(f'PRAGMA {name} = {value}')
+
+    def generate(self, options, started):
+        # Fester Salt je Seed, damit auch die Benutzerzeilen reproduzierbar sind.
+        salt = 'synth' + str(self.seed).replace('-', 'n')
+        user_ids = self.generate_users(options['users'], make_password(options['password'], salt))
+        question_ids = self.generate_questions(options['questions'], user_ids)
+        popularity = ZipfSampler(range(len(question_ids)), self.zipf, self.rng('question-popularity'))
+        self.generate_answers(options['answers'], user_ids, question_ids, popularity)
+        self.generate_likes(options['likes'], user_ids, question_ids, popularity)
+
+        self.stdout.write('Updating counters, hot scores and search index ...')
+        derived_started = time.perf_counter()
+        rebuild_question_counters()
+        ranking.rebuild_hot_scores()
+        if search.is_available():
+            search.index_new_rows()
+        # bulk_create schreibt nichts ins Änderungsprotokoll.
+        changes.record_new_rows()
+        response_cache.clear()
+        derived = time.perf_counter() - derived_started
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Inserted {self.inserted} rows at '
+            f'{self.inserted / max(self.insert_seconds, 1e-9):,.0f} rows/s; '
+            f'counters and search index took {derived:.1f}s, '
+            f'{time.perf_counter() - started:.1f}s in total.'))
+
+    # Hilfsfunktionen
+
+    def rng(self, kind, batch=0):
+        return random.Random(f'{self.seed}:{kind}:{batch}')
+
+    def synthetic_users(self):
+        return User.objects.filter(username__startswith=self.prefix)
+
+    def timestamps(self, offset, size, total):
+        # Gleichmäßig über den Zeitraum verteilt; Addieren ist schneller als für jede Zeile zu skalieren.
+        step = (self.end - self.start) / max(total, 1)
+        current = self.start + step * offset
+        result = []
+        for _ in range(size):
+            result.append(str(current))
+            current += step
+        return result
+
+    def reaction_times(self, rng, positions, total_questions, mean_hours):
+        # Position in question_ids bestimmt den Zeitstempel der Frage (siehe generate_questions);
+        # Antwort bzw. Like folgt mit exponentiell verteilter Verzögerung, höchstens bis self.end.
+        step = (self.end - self.start) / total_questions
+        hour = timedelta(hours=1)
+        end = str(self.end)
+        return [min(str(self.start + step * position + hour * rng.expovariate(1 / mean_hours)), end)
+                for position in positions]
+
+    def text_pool(self, kind, low, high, size=4096):
+        # Texte aus einem festen Vorrat ziehen ist um ein Vielfaches schneller als
+        # jeden Satz neu zu würfeln und reicht für Suche und Payload-Größen.
+        rng = self.rng(f'{kind}-texts')
+        return [' '.join(rng.choices(WORDS, k=rng.randint(low, high))).capitalize()
+                for _ in range(size)]
+
+    def run_batches(self, kind, model, target, existing, build_batch, insert, defer_indexes=True):
+        """
+        Erzeugt die Zeilen [existing, target) in Batches. Jeder Batch wird
+        deterministisch aus (seed, kind, batch) erzeugt und in einer eigenen
+        Transaktion geschrieben; ein abgebrochener Lauf setzt daher sauber fort.
+        """
+        if existing >= target:
+            self.stdout.write(f'{kind}: {existing} present, nothing to do.')
+            return
+        # Kommen mehr Zeilen hinzu, als die Tabelle schon hat, lohnt sich der Index-Neuaufbau.
+        defer = target - existing > model.objects.count() if defer_indexes else False
+        started = time.perf_counter()
+        with deferred_indexes(model, defer):
+            for batch in range(existing // self.batch_size, -(-target // self.batch_size)):
+                batch_started = time.perf_counter()
+                offset = batch * self.batch_size
+                size = min(self.batch_size, target - offset)
+                # Immer den ganzen Batch erzeugen, damit Zeile n unabhängig vom Ziel gleich
+                # ausfällt. Ein Batch, der bereits teilweise existiert (Lauf mit kleinerem
+                # Ziel), wird ergänzt.
+                rows = build_batch(self.rng(kind, batch), offset, self.batch_size)
+                rows = rows[max(existing - offset, 0):size]
+                with sqlite.write_transaction():
+                    inserted = insert(rows)
+                self.inserted += inserted
+                elapsed = time.perf_counter() - batch_started
+                self.stdout.write(
+                    f'{kind}: {offset + size}/{target} ({inserted / max(elapsed, 1e-9):,.0f} rows/s)')
+                self.stdout.flush()
+            if defer:
+                self.stdout.write(f'{kind}: rebuilding indexes ...')
+        self.insert_seconds += time.perf_counter() - started
+
+    # Generatoren
+
+    def generate_users(self, target, password):
+        joined = str(self.start)
+
+        def build(rng, offset, size):
+            return [(f'{self.prefix}{offset + i:07d}', password, '', '', '', False, True, False, joined)
+                    for i in range(size)]
+
+        def insert(rows):
+            return bulk_insert(User, ['username', 'password', 'first_name', 'last_name', 'email',
+                                      'is_staff', 'is_active', 'is_superuser', 'date_joined'],
+                               rows, ignore_conflicts=True)
+
+        self.run_batches('users', User, target, self.synthetic_users().count(), build, insert)
+        return list(self.synthetic_users().order_by('id').values_list('id', flat=True))
+
+    def generate_questions(self, target, user_ids):
+        categories = [choice[0] for choice in Question.CATEGORY_CHOICES]
+        authors = ZipfSampler(user_ids, self.zipf, self.rng('question-authors'))
+        questions = Question.objects.filter(author__in=self.synthetic_users())
+        titles = [title + '?' for title in self.text_pool('question-titles', 4, 12)]
+        contents = self.text_pool('question-contents', 15, 60)
+
+        def build(rng, offset, size):
+            return list(zip(
+                rng.choices(titles, k=size),
+                rng.choices(contents, k=size),
+                authors.sample(rng, size),
+                rng.choices(categories, k=size),
+                self.timestamps(offset, size, target),
+                itertools.repeat(0, size),
+                itertools.repeat(0, size),
+                # hot_score wird wie die Zähler am Ende neu berechnet.
+                itertools.repeat(0.0, size),
+            ))
+
+        def insert(rows):
+            return bulk_insert(Question, ['title', 'content', 'author', 'category', 'created_at',
+                                          'like_count', 'answer_count', 'hot_score'], rows)
+
+        self.run_batches('questions', Question, target, questions.count(), build, insert)
+        return list(questions.order_by('id').values_list('id', flat=True))
+
+    def generate_answers(self, target, user_ids, question_ids, popularity):
+        if not question_ids:
+            return
+        authors = ZipfSampler(user_ids, self.zipf, self.rng('answer-authors'))
+        contents = self.text_pool('answer-contents', 8, 40)
+        total_questions = len(question_ids)
+
+        def build(rng, offset, size):
+            positions = popularity.sample(rng, size)
+            created = self.reaction_times(rng, positions, total_questions, mean_hours=12)
+            return list(zip(
+                rng.choices(contents, k=size),
+                authors.sample(rng, size),
+                [question_ids[position] for position in positions],
+                created,
+            ))
+
+        def insert(rows):
+            return bulk_insert(Answer, ['content', 'author', 'question', 'created_at'], rows)
+
+        existing = Answer.objects.filter(author__in=self.synthetic_users()).count()
+        self.run_batches('answers', Answer, target, existing, build, insert)
+
+    def generate_likes(self, target, user_ids, question_ids, popularity):
+        if not question_ids:
+            return
+        users = ZipfSampler(user_ids, self.zipf, self.rng('like-users'))
+        total_questions = len(question_ids)
+
+        def build(rng, offset, size):
+            liked_by = users.sample(rng, size)
+            positions = popularity.sample(rng, size)
+            return list(zip(
+                liked_by,
+                [question_ids[position] for position in positions],
+                # Nie vor der Frage, sonst verzerrt das die Hot-Scores.
+                self.reaction_times(rng, positions, total_questions, mean_hours=24),
+            ))
+
+        def insert(rows):
+            # Doppelte (user, question)-Paare verwirft der unique_together-Constraint.
+            return bulk_insert(Like, ['user', 'question', 'created_at'], rows, ignore_conflicts=True)
+
+        # Wegen verworfener Duplikate lässt sich der Fortschritt nicht aus der
+        # Zeilenzahl ableiten; Likes werden daher immer komplett durchlaufen,
+        # ignore_conflicts macht das idempotent.
+        self.run_batches('likes', Like, target, 0, build, insert,
+                         defer_indexes=not Like.objects.filter(user__in=self.synthetic_users()).exists())
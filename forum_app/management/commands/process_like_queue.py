@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from forum_app import likequeue
+
+
+class Command(BaseCommand):
+    help = ('Überträgt Likes und Unlikes aus der Write-behind-Queue (FORUM_LIKE_QUEUE) '
+            'in Batches in die Datenbank.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int,
+                            help="Einträge pro Transaktion (Standard: FORUM_LIKE_QUEUE['BATCH_SIZE']).")
+        parser.add_argument('--interval', type=float,
+                            help='Nach dem Leeren alle N Sekunden erneut prüfen, bis zum Abbruch.')
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+            processed = 0
+            while True:
+                count = likequeue.process_batch(options['batch_size'])
+                if not count:
+                    break
+                processed += count
+            if processed or not options['interval']:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Processed {processed} queued likes in {(time.perf_counter() - started) * 1000:.0f} ms.'))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
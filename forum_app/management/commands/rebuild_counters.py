@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from forum_app.counters import rebuild_question_counters
+
+
+class Command(BaseCommand):
+    help = 'Berechnet like_count und answer_count aller Fragen aus den Like-/Answer-Zeilen neu.'
+
+    def handle(self, *args, **options):
+        updated = rebuild_question_counters()
+        self.stdout.write(self.style.SUCCESS(f'Counters rebuilt for {updated} questions.'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from forum_app.ranking import rebuild_hot_scores
+
+
+class Command(BaseCommand):
+    help = 'Berechnet hot_score aller Fragen aus Fragen, Likes und Antworten neu.'
+
+    def handle(self, *args, **options):
+        updated = rebuild_hot_scores()
+        self.stdout.write(self.style.SUCCESS(f'Hot scores rebuilt for {updated} questions.'))
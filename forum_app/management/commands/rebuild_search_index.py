@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from forum_app import search
+
+
+class Command(BaseCommand):
+    help = 'Baut die FTS5-Volltextindizes für Fragen und Antworten komplett neu auf.'
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            raise CommandError('Full-text search requires the sqlite backend.')
+        search.create_indexes()
+        counts = search.rebuild()
+        for table, rows in counts.items():
+            self.stdout.write(f'{table}: {rows} rows')
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt.'))
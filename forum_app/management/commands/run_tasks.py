@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from forum_app import tasks
+
+
+class Command(BaseCommand):
+    help = 'Arbeitet die Hintergrundaufgaben aus forum_app.tasks ab (Zähler, Hot-Ranking, Suchindex).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int,
+                            help="Aufgaben pro Durchgang (Standard: FORUM_TASKS['BATCH_SIZE']).")
+        parser.add_argument('--interval', type=float,
+                            help='Nach dem Abarbeiten alle N Sekunden erneut prüfen, bis zum Abbruch.')
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+            succeeded = failed = 0
+            while True:
+                done, errors = tasks.run_pending(options['batch_size'])
+                if not done and not errors:
+                    break
+                succeeded += done
+                failed += errors
+            if succeeded or failed or not options['interval']:
+                style = self.style.WARNING if failed else self.style.SUCCESS
+                self.stdout.write(style(
+                    f'Ran {succeeded} tasks, {failed} failed, in {(time.perf_counter() - started) * 1000:.0f} ms.'))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
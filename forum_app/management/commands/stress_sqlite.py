@@ -0,0 +1,53 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from forum_app import benchmarks
+
+
+class Command(BaseCommand):
+    help = ('Misst gemischten Lese-/Schreibdurchsatz mehrerer Threads auf einer eigenen '
+            'SQLite-Datei, mit SQLite-Standardeinstellungen und mit dem Profil aus FORUM_SQLITE.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database-file',
+                            help='SQLite-Datei für den Lauf; wird neu angelegt (Standard: temporär).')
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=5.0, help='Sekunden pro Profil.')
+        parser.add_argument('--write-ratio', type=float, default=0.2,
+                            help='Anteil der Operationen, die ein Like setzen oder entfernen.')
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--questions', type=int, default=500)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--profile', action='append', dest='profiles',
+                            choices=sorted(benchmarks.STRESS_PROFILES),
+                            help='Nur dieses Profil messen (mehrfach angebbar).')
+        parser.add_argument('--output', help='Ergebnis als JSON in diese Datei schreiben.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('stress_sqlite requires the sqlite backend.')
+        path = options['database_file']
+        if path and Path(path).resolve() == Path(connection.settings_dict['NAME']).resolve():
+            raise CommandError('--database-file must not be the configured database; it is recreated.')
+
+        with tempfile.TemporaryDirectory() as directory:
+            results = benchmarks.run_stress(
+                path or Path(directory) / 'forum_stress.sqlite3',
+                threads=options['threads'],
+                duration=options['duration'],
+                write_ratio=options['write_ratio'],
+                users=options['users'],
+                questions=options['questions'],
+                seed=options['seed'],
+                profiles=options['profiles'] or tuple(benchmarks.STRESS_PROFILES),
+            )
+        self.stdout.write(benchmarks.format_stress_table(results))
+
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(results, fh, indent=2)
+            self.stdout.write(f"Results written to {options['output']}.")
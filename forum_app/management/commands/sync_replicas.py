@@ -0,0 +1,49 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from forum_app.replicas import get_settings
+
+
+class Command(BaseCommand):
+    help = ('Kopiert die SQLite-Datenbank des Primary per Online-Backup in die Replikate '
+            '(lokaler Ersatz für echte Replikation).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', action='append', dest='databases',
+                            help="Nur dieses Replikat kopieren (Standard: FORUM_REPLICAS['DATABASES']).")
+        parser.add_argument('--interval', type=float,
+                            help='Alle N Sekunden erneut kopieren, bis zum Abbruch.')
+
+    def handle(self, *args, **options):
+        aliases = options['databases'] or get_settings()['DATABASES']
+        if not aliases:
+            raise CommandError("No replicas configured; set FORUM_REPLICAS['DATABASES'] or pass --database.")
+        for alias in [DEFAULT_DB_ALIAS, *aliases]:
+            if alias not in connections:
+                raise CommandError(f'Unknown database alias "{alias}".')
+            if connections[alias].vendor != 'sqlite':
+                raise CommandError('sync_replicas requires the sqlite backend.')
+
+        while True:
+            started = time.perf_counter()
+            for alias in aliases:
+                self.copy(alias)
+            self.stdout.write(self.style.SUCCESS(
+                f'Synced {", ".join(aliases)} in {(time.perf_counter() - started) * 1000:.0f} ms.'))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+
+    def copy(self, alias):
+        primary = connections[DEFAULT_DB_ALIAS]
+        primary.ensure_connection()
+        connections[alias].close()
+        target = sqlite3.connect(connections[alias].settings_dict['NAME'])
+        try:
+            # Das Backup liefert einen konsistenten Stand, auch während auf dem Primary geschrieben wird.
+            primary.connection.backup(target)
+        finally:
+            target.close()
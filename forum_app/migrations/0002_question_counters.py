@@ -0,0 +1,40 @@
+# Generated by Django 5.2.3 on 2026-10-18 07:06
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_counters(apps, schema_editor):
+    Question = apps.get_model('forum_app', 'Question')
+    Answer = apps.get_model('forum_app', 'Answer')
+    Like = apps.get_model('forum_app', 'Like')
+
+    def count_of(model):
+        counts = (model.objects.filter(question=OuterRef('pk'))
+                  .order_by().values('question').annotate(total=Count('pk')).values('total'))
+        return Coalesce(Subquery(counts), Value(0))
+
+    Question.objects.using(schema_editor.connection.alias).update(
+        like_count=count_of(Like), answer_count=count_of(Answer))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='answer_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations
+
+from forum_app import search
+
+
+def create_search_index(apps, schema_editor):
+    if not search.is_available(schema_editor.connection):
+        return
+    search.create_indexes(schema_editor)
+    search.rebuild(schema_editor.connection)
+
+
+def drop_search_index(apps, schema_editor):
+    if search.is_available(schema_editor.connection):
+        search.drop_indexes(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum_app', '0002_question_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.3 on 2026-10-18 07:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum_app', '0003_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='answer',
+            index=models.Index(fields=['content', 'id'], name='answer_content_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='answer',
+            index=models.Index(fields=['author', 'content'], name='answer_author_content_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['created_at', 'id'], name='question_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['category', 'created_at'], name='question_category_idx'),
+        ),
+    ]
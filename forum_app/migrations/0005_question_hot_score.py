@@ -0,0 +1,37 @@
+# Generated by Django 5.2.3 on 2026-10-18 07:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+from forum_app import ranking
+
+
+def compute_hot_scores(apps, schema_editor):
+    ranking.rebuild_hot_scores(
+        apps.get_model('forum_app', 'Question'), apps.get_model('forum_app', 'Like'),
+        apps.get_model('forum_app', 'Answer'), using=schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum_app', '0004_access_pattern_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='hot_score',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['-hot_score', '-id'], name='question_hot_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['category', '-hot_score', '-id'], name='question_category_hot_idx'),
+        ),
+        migrations.RunPython(compute_hot_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-18 07:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum_app', '0005_question_hot_score'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='question',
+            name='question_category_idx',
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['category', 'created_at', 'id'], name='question_category_created_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.3 on 2026-10-18 08:39
+
+import django.utils.timezone
+from django.db import migrations, models
+
+from forum_app import changes
+
+
+def record_existing_rows(apps, schema_editor):
+    # Damit Cursor 0 den kompletten Bestand liefert.
+    models = {apps.get_model('forum_app', name)._meta.db_table: (name.lower(), name == 'Question')
+              for name in ('Question', 'Answer', 'Like')}
+    changes.record_new_rows(models, using=schema_editor.connection,
+                            change_model=apps.get_model('forum_app', 'Change'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum_app', '0007_tasks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('action', models.CharField(choices=[('upsert', 'Created or updated'), ('delete', 'Deleted')], max_length=6)),
+                ('question_id', models.BigIntegerField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['model', 'object_id', 'id'], name='change_object_idx')],
+            },
+        ),
+        migrations.RunPython(record_existing_rows, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
 
 # Create your models here.
@@ -19,6 +20,22 @@ class Question(models.Model):
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, default='frontend')
+    # Denormalisierte Zähler, gepflegt über forum_app.counters (rebuild_counters repariert sie).
+    like_count = models.PositiveIntegerField(default=0)
+    answer_count = models.PositiveIntegerField(default=0)
+    # Zeitverfallender Rang für /questions/hot/, gepflegt über forum_app.ranking.
+    hot_score = models.FloatField(default=0.0)
+
+    class Meta:
+        indexes = [
+            # Cursor-Pagination der Fragenliste (ORDER BY created_at, id).
+            models.Index(fields=['created_at', 'id'], name='question_created_idx'),
+            # Kategorie-Feeds und ?category= (ORDER BY created_at, id in beide Richtungen).
+            models.Index(fields=['category', 'created_at', 'id'], name='question_category_created_idx'),
+            # Hot-Ranking gesamt und je Kategorie (ORDER BY hot_score DESC, id DESC).
+            models.Index(fields=['-hot_score', '-id'], name='question_hot_idx'),
+            models.Index(fields=['category', '-hot_score', '-id'], name='question_category_hot_idx'),
+        ]
 
 
 class Answer(models.Model):
@@ -27,6 +44,14 @@ class Answer(models.Model):
     question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name='answers')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Standardsortierung der Antwortliste (ordering = ['content']).
+            models.Index(fields=['content', 'id'], name='answer_content_idx'),
+            # Filter ?author= / author__username mit Sortierung nach content.
+            models.Index(fields=['author', 'content'], name='answer_author_content_idx'),
+        ]
+
 
 class Like(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -35,3 +60,62 @@ class Like(models.Model):
 
     class Meta:
         unique_together = ('user', 'question')
+
+
+class Task(models.Model):
+    """Hintergrundaufgabe für forum_app.tasks (Funktion als Import-Pfad plus JSON-Argumente)."""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (FAILED, 'Failed'),
+    ]
+
+    name = models.CharField(max_length=255)
+    args = models.JSONField(default=list)
+    # Gleiche Aufgaben (Funktion + Argumente) stehen höchstens einmal in der Warteschlange.
+    dedup_key = models.CharField(max_length=255)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    # Frühester Start; bei RUNNING das Ende der Sperre, danach darf ein anderer Worker übernehmen.
+    run_after = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Fällige Aufgaben in Reihenfolge (WHERE status ... AND run_after <= jetzt).
+            models.Index(fields=['status', 'run_after', 'id'], name='task_due_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['dedup_key'], condition=models.Q(status='pending'),
+                                    name='task_pending_dedup'),
+        ]
+
+
+class Change(models.Model):
+    """
+    Eintrag im Änderungsprotokoll für /api/forum/changes/ (siehe forum_app.changes).
+    Die id ist der Cursor; pro Objekt zählt nur der jüngste Eintrag.
+    """
+    UPSERT = 'upsert'
+    DELETE = 'delete'
+    ACTION_CHOICES = [
+        (UPSERT, 'Created or updated'),
+        (DELETE, 'Deleted'),
+    ]
+
+    model = models.CharField(max_length=10)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=6, choices=ACTION_CHOICES)
+    # Frage, zu der das Objekt gehört (bei Fragen die eigene id), damit Clients Zähler nachladen.
+    question_id = models.BigIntegerField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Verdichten: ältere Einträge desselben Objekts finden.
+            models.Index(fields=['model', 'object_id', 'id'], name='change_object_idx'),
+        ]
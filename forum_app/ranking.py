@@ -0,0 +1,158 @@
+"""
+"Hot"-Ranking der Fragen mit exponentiellem Zeitverfall.
+
+Jede Frage sammelt Ereignisse (die Frage selbst, Likes, Antworten) mit Gewicht w
+und Zeitpunkt t. Der aktuelle Wert ist  sum(w * exp(-(jetzt - t) / tau)).  Da alle
+Fragen gleich schnell verfallen, genügt für die Reihenfolge
+
+    hot_score = ln(sum(w * exp((t - EPOCH) / tau)))
+
+Dieser Wert ändert sich nur bei neuen oder gelöschten Ereignissen und lässt sich
+per F-Ausdruck inkrementell fortschreiben (log-add-exp), ohne Likes oder
+Antworten neu zu aggregieren. Ein Index auf (category, hot_score, id) liefert
+damit die Top-N je Kategorie in O(Seite). ``manage.py rebuild_hot_scores``
+berechnet alle Werte aus den Zeilen neu.
+
+Eine eigene, materialisierte Top-N-Tabelle je Kategorie gibt es bewusst nicht:
+Die Indizes question_hot_idx und question_category_hot_idx halten die
+Reihenfolge bereits sortiert vor, und eine Seite ist ein Bereichs-Scan ohne
+Sortierschritt. Der Preis liegt beim Schreiben: Jeder Like und jede Antwort
+verschiebt den Eintrag der Frage in beiden Indizes (je ein B-Baum-Update,
+O(log n)), auch für Fragen weit außerhalb jeder Top-N. Dafür gibt es keine
+zweite Tabelle, die mit Löschungen und Kategorie-Wechseln konsistent bleiben
+muss, und kein festes N; die Cursor-Pagination reicht beliebig tief.
+
+Konfiguration über settings.FORUM_HOT:
+    'HALF_LIFE_HOURS': Halbwertszeit eines Ereignisses,
+    'QUESTION_WEIGHT', 'LIKE_WEIGHT', 'ANSWER_WEIGHT': Gewichte der Ereignisse.
+"""
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F, Value
+from django.db.models.functions import Abs, Exp, Greatest, Ln
+from django.utils import timezone
+
+from forum_app import tasks
+from forum_app.api.caching import invalidate
+from forum_app.models import Question, Like, Answer
+
+DEFAULT_SETTINGS = {
+    'HALF_LIFE_HOURS': 24,
+    'QUESTION_WEIGHT': 1.0,
+    'LIKE_WEIGHT': 1.0,
+    'ANSWER_WEIGHT': 2.0,
+}
+
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+# Untergrenze für 1 - exp(...) beim Entfernen, damit der Logarithmus endlich bleibt.
+_MIN_REMAINDER = 1e-9
+
+
+def get_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'FORUM_HOT', {})}
+
+
+def tau():
+    return get_settings()['HALF_LIFE_HOURS'] * 3600 / math.log(2)
+
+
+def event_score(weight, when):
+    """Log-Beitrag eines einzelnen Ereignisses: ln(w) + (t - EPOCH) / tau."""
+    return math.log(weight) + (when - EPOCH).total_seconds() / tau()
+
+
+def question_score(created_at):
+    return event_score(get_settings()['QUESTION_WEIGHT'], created_at)
+
+
+def logaddexp(a, b):
+    high = max(a, b)
+    return high + math.log1p(math.exp(-abs(a - b)))
+
+
+def _adjust(question_ids, value, remove):
+    if not question_ids:
+        return
+    if tasks.is_deferred():
+        # Statt inkrementell im Request: später aus den Zeilen neu berechnen (siehe forum_app.tasks).
+        tasks.enqueue_many(rescore_question, [(pk,) for pk in sorted(question_ids)])
+        return
+    if remove:
+        # ln(e^s - e^x) = s + ln(1 - e^(x - s))
+        expression = F('hot_score') + Ln(Greatest(
+            Value(1.0) - Exp(Value(value) - F('hot_score')), Value(_MIN_REMAINDER)))
+    else:
+        # ln(e^s + e^x) = max(s, x) + ln(1 + e^-|s - x|)
+        expression = Greatest(F('hot_score'), Value(value)) + Ln(
+            Value(1.0) + Exp(-Abs(F('hot_score') - Value(value))))
+    Question.objects.filter(pk__in=question_ids).update(hot_score=expression)
+
+
+def record_like(question_id, created_at, remove=False):
+    _adjust([question_id], event_score(get_settings()['LIKE_WEIGHT'], created_at), remove)
+
+
+def record_answer(question_id, created_at, remove=False):
+    _adjust([question_id], event_score(get_settings()['ANSWER_WEIGHT'], created_at), remove)
+
+
+def record_many(likes=None, answers=None, when=None):
+    """
+    Für Bulk-Pfade: ``likes``/``answers`` bilden question_id auf die Anzahl neuer
+    Ereignisse ab, die alle zum Zeitpunkt ``when`` zählen. Fragen mit gleicher
+    Kombination teilen sich ein UPDATE (wie adjust_many_question_counters).
+    """
+    likes, answers = likes or {}, answers or {}
+    config = get_settings()
+    offset = event_score(1.0, when or timezone.now())
+    groups = {}
+    for question_id in likes.keys() | answers.keys():
+        key = (likes.get(question_id, 0), answers.get(question_id, 0))
+        groups.setdefault(key, []).append(question_id)
+    for (like_count, answer_count), question_ids in groups.items():
+        weight = like_count * config['LIKE_WEIGHT'] + answer_count * config['ANSWER_WEIGHT']
+        if weight > 0:
+            _adjust(question_ids, offset + math.log(weight), remove=False)
+
+
+def rebuild_hot_scores(question_model=None, like_model=None, answer_model=None, using=connection,
+                       question_ids=None):
+    """
+    Berechnet hot_score aller Fragen (bzw. der Fragen ``question_ids``) aus Fragen, Likes und Antworten neu.
+    Liest die Zeilen gestreamt und schreibt per executemany; gibt die Anzahl Fragen zurück.
+    Die Modelle sind austauschbar, damit Migrationen die historischen Modelle übergeben können.
+    """
+    question_model = question_model or Question
+    like_model = like_model or Like
+    answer_model = answer_model or Answer
+    config = get_settings()
+
+    scores = {}
+    questions = question_model.objects.using(using.alias)
+    if question_ids is not None:
+        questions = questions.filter(pk__in=question_ids)
+    for question_id, created_at in questions.values_list('id', 'created_at').iterator():
+        scores[question_id] = event_score(config['QUESTION_WEIGHT'], created_at)
+    for model, weight in ((like_model, config['LIKE_WEIGHT']), (answer_model, config['ANSWER_WEIGHT'])):
+        rows = model.objects.using(using.alias).values_list('question_id', 'created_at')
+        if question_ids is not None:
+            rows = rows.filter(question_id__in=question_ids)
+        for question_id, created_at in rows.iterator():
+            if question_id in scores:
+                scores[question_id] = logaddexp(scores[question_id], event_score(weight, created_at))
+
+    table = using.ops.quote_name(question_model._meta.db_table)
+    with using.cursor() as cursor:
+        cursor.executemany(f'UPDATE {table} SET hot_score = %s WHERE id = %s',
+                           [(score, question_id) for question_id, score in scores.items()])
+    return len(scores)
+
+
+def rescore_question(question_id):
+    """Aufgabe für forum_app.tasks: hot_score einer Frage neu berechnen (idempotent)."""
+    if rebuild_hot_scores(question_ids=[question_id]):
+        invalidate('questions', f'question:{question_id}')
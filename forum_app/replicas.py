@@ -0,0 +1,160 @@
+"""
+Lesereplikate mit Read-your-writes-Garantie.
+
+ReplicaMiddleware schickt die Lesezugriffe von GET/HEAD/OPTIONS-Requests auf
+Views mit ``use_read_replica = True`` an eines der Replikate aus
+settings.FORUM_REPLICAS['DATABASES'] (ein Replikat pro Request). ReplicaRouter
+leitet dazu alle Lesezugriffe während des Requests dorthin, Schreibzugriffe
+immer auf 'default'. Nach einem schreibenden Request (POST, PUT, PATCH, DELETE)
+liest derselbe Client für 'PIN_SECONDS' Sekunden wieder vom Primary, damit er
+seine eigenen Änderungen sieht, auch wenn die Replikate hinterherhängen.
+Erkannt wird der Client am Authorization-Header, sonst am Session-Cookie, sonst
+an der IP; die Markierung liegt im Django-Cache 'CACHE'. Für alle Worker gilt
+sie nur, wenn dieser Cache geteilt ist (Redis, Memcached, Datenbank). Ein
+prozesslokaler LocMemCache (Djangos Standard ohne settings.CACHES) pinnt nur
+Requests, die zufällig im selben Worker landen; ist er konfiguriert, schlägt
+jeder Request auf einer Replikat-View mit ImproperlyConfigured fehl, außer
+'ALLOW_LOCAL_CACHE' erlaubt ihn ausdrücklich (ein Prozess, z.B. runserver, Tests).
+
+Antworten, die von einem Replikat gelesen wurden, landen nicht im
+Response-Cache (siehe forum_app.api.caching): Das Replikat kann hinter einer
+Version liegen, die ein Schreibzugriff gerade erst erhöht hat.
+
+Lokal sind die Replikate Kopien der SQLite-Datei, die ``manage.py sync_replicas``
+aktualisiert. In Tests zeigen sie per TEST['MIRROR'] auf die Testdatenbank.
+
+Konfiguration über settings.FORUM_REPLICAS:
+    'DATABASES': Aliase der Replikate (leer = alles auf 'default'),
+    'PIN_SECONDS': Dauer der Bindung an den Primary, 'CACHE': Alias in settings.CACHES,
+    'ALLOW_LOCAL_CACHE': prozesslokalen Cache für die Bindung zulassen.
+"""
+import hashlib
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS
+
+DEFAULT_SETTINGS = {
+    'DATABASES': [],
+    'PIN_SECONDS': 5,
+    'CACHE': 'default',
+    'ALLOW_LOCAL_CACHE': False,
+}
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_replica = ContextVar('forum_read_replica', default=None)
+
+
+def get_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'FORUM_REPLICAS', {})}
+
+
+def _pin_key(request):
+    credential = (request.headers.get('Authorization')
+                  or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+                  or request.META.get('REMOTE_ADDR', ''))
+    return 'forum:pin:' + hashlib.sha256(credential.encode()).hexdigest()
+
+
+def _pin_cache(config):
+    cache = caches[config['CACHE']]
+    if isinstance(cache, LocMemCache) and not config['ALLOW_LOCAL_CACHE']:
+        raise ImproperlyConfigured(
+            f"FORUM_REPLICAS['CACHE'] = {config['CACHE']!r} is process-local; read-your-writes would only "
+            "hold within one worker. Use a shared cache backend or set 'ALLOW_LOCAL_CACHE'.")
+    return cache
+
+
+def is_pinned(request, config):
+    return _pin_cache(config).get(_pin_key(request)) is not None
+
+
+def pin(request, config):
+    _pin_cache(config).set(_pin_key(request), 1, config['PIN_SECONDS'])
+
+
+def reading_from_replica():
+    """True, solange der aktuelle Request von einem Replikat liest."""
+    return _replica.get() is not None
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _replica.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replikate enthalten dieselben Zeilen wie der Primary.
+        databases = {DEFAULT_DB_ALIAS, *get_settings()['DATABASES']}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Replikate bekommen das Schema über die Kopie vom Primary.
+        if db in get_settings()['DATABASES']:
+            return False
+        return None
+
+
+class ReplicaMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+            self.process_view = self._aprocess_view
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token = _replica.set(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica.reset(token)
+        self._finish(request)
+        return response
+
+    async def __acall__(self, request):
+        token = _replica.set(None)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _replica.reset(token)
+        self._finish(request)
+        return response
+
+    async def _aprocess_view(self, request, view_func, view_args, view_kwargs):
+        return self._choose(request, view_func)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        return self._choose(request, view_func)
+
+    def _choose(self, request, view_func):
+        if request.method not in SAFE_METHODS:
+            return None
+        view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+        if not getattr(view_class, 'use_read_replica', False):
+            return None
+        config = get_settings()
+        if config['DATABASES'] and not is_pinned(request, config):
+            _replica.set(random.choice(config['DATABASES']))
+        return None
+
+    def _finish(self, request):
+        if request.method not in SAFE_METHODS:
+            config = get_settings()
+            if config['DATABASES']:
+                pin(request, config)
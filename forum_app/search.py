@@ -0,0 +1,193 @@
+"""
+Volltextsuche über SQLite FTS5.
+
+Fragen (title, content) und Antworten (content) werden in eigenen FTS5-Tabellen
+gespiegelt; die rowid entspricht jeweils der id des Objekts. Die Signale in
+forum_app.signals halten den Index beim Speichern/Löschen aktuell,
+``manage.py rebuild_search_index`` baut ihn komplett neu auf.
+Auf anderen Datenbanken ist der Index nicht verfügbar (siehe is_available()).
+"""
+import re
+
+from django.db import connection
+
+from forum_app import sqlite
+
+QUESTION_INDEX = 'forum_app_question_fts'
+ANSWER_INDEX = 'forum_app_answer_fts'
+
+# Spalten je Index (ohne rowid) und die Quelltabelle, aus der sie stammen.
+INDEXES = {
+    QUESTION_INDEX: (('title', 'content'), 'forum_app_question'),
+    ANSWER_INDEX: (('content',), 'forum_app_answer'),
+}
+
+TOKENIZE = "unicode61 remove_diacritics 2"
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def is_available(using=connection):
+    return using.vendor == 'sqlite'
+
+
+def create_indexes(schema_editor=None):
+    cursor_owner = schema_editor.connection if schema_editor else connection
+    with cursor_owner.cursor() as cursor:
+        for table, (columns, _source) in INDEXES.items():
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+                f"{', '.join(columns)}, tokenize='{TOKENIZE}', prefix='2 3')"
+            )
+
+
+def drop_indexes(schema_editor=None):
+    cursor_owner = schema_editor.connection if schema_editor else connection
+    with cursor_owner.cursor() as cursor:
+        for table in INDEXES:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
+
+def rebuild(using=connection):
+    """Leert beide Indizes und füllt sie per INSERT ... SELECT neu. Gibt die Zeilenzahl je Index zurück."""
+    counts = {}
+    with sqlite.write_transaction(using=using.alias), using.cursor() as cursor:
+        for table, (columns, source) in INDEXES.items():
+            column_list = ', '.join(columns)
+            cursor.execute(f"DELETE FROM {table}")
+            cursor.execute(
+                f"INSERT INTO {table} (rowid, {column_list}) SELECT id, {column_list} FROM {source}"
+            )
+            counts[table] = cursor.rowcount
+    return counts
+
+
+def index_new_rows(using=connection):
+    """
+    Indiziert nur Zeilen, deren id größer als die höchste indizierte rowid ist,
+    z.B. nach Massenimporten per bulk_create, die keine Signale auslösen.
+    """
+    counts = {}
+    with sqlite.write_transaction(using=using.alias), using.cursor() as cursor:
+        for table, (columns, source) in INDEXES.items():
+            column_list = ', '.join(columns)
+            cursor.execute(
+                f"INSERT INTO {table} (rowid, {column_list}) SELECT id, {column_list} FROM {source} "
+                f"WHERE id > (SELECT COALESCE(MAX(rowid), 0) FROM {table})"
+            )
+            counts[table] = cursor.rowcount
+    return counts
+
+
+def _write(table, rowid, values):
+    columns = INDEXES[table][0]
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE rowid = %s", [rowid])
+        if values is not None:
+            placeholders = ', '.join(['%s'] * (len(columns) + 1))
+            cursor.execute(
+                f"INSERT INTO {table} (rowid, {', '.join(columns)}) VALUES ({placeholders})",
+                [rowid, *values],
+            )
+
+
+def index_question(question):
+    if is_available():
+        _write(QUESTION_INDEX, question.pk, [question.title, question.content])
+
+
+def index_answer(answer):
+    if is_available():
+        _write(ANSWER_INDEX, answer.pk, [answer.content])
+
+
+def index_answers(answers):
+    """Indiziert frisch angelegte Antworten (z.B. aus bulk_create) in einem executemany."""
+    if answers and is_available():
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {ANSWER_INDEX} (rowid, content) VALUES (%s, %s)",
+                [(answer.pk, answer.content) for answer in answers],
+            )
+
+
+def remove_question(question_id):
+    if is_available():
+        _write(QUESTION_INDEX, question_id, None)
+
+
+def remove_answer(answer_id):
+    if is_available():
+        _write(ANSWER_INDEX, answer_id, None)
+
+
+def refresh_question(question_id):
+    """Aufgabe für forum_app.tasks: Index einer Frage an den aktuellen Stand anpassen."""
+    from forum_app.models import Question
+    question = Question.objects.filter(pk=question_id).only('title', 'content').first()
+    if question is None:
+        remove_question(question_id)
+    else:
+        index_question(question)
+
+
+def refresh_answer(answer_id):
+    """Aufgabe für forum_app.tasks: Index einer Antwort an den aktuellen Stand anpassen."""
+    from forum_app.models import Answer
+    answer = Answer.objects.filter(pk=answer_id).only('content').first()
+    if answer is None:
+        remove_answer(answer_id)
+    else:
+        index_answer(answer)
+
+
+def build_match_query(text):
+    """
+    Wandelt freie Benutzereingaben in einen sicheren FTS5-Ausdruck um:
+    jedes Wort wird gequotet und als Präfix gesucht, alle Wörter müssen vorkommen.
+    Gibt '' zurück, wenn die Eingabe keine Wörter enthält.
+    """
+    return ' '.join(f'"{token}"*' for token in _TOKEN_RE.findall(text or ''))
+
+
+def matching_ids_sql(table):
+    """SQL-Fragment (mit einem Parameter für den MATCH-Ausdruck) für rowid-Subqueries."""
+    return f"SELECT rowid FROM {table} WHERE {table} MATCH %s"
+
+
+def search(text, kinds=('question', 'answer'), limit=20):
+    """
+    Sucht in Fragen und/oder Antworten und liefert Treffer sortiert nach bm25
+    (kleiner = relevanter) als Liste von Dicts.
+    """
+    match = build_match_query(text)
+    if not match or not is_available():
+        return []
+
+    parts, params = [], []
+    if 'question' in kinds:
+        parts.append(
+            f"SELECT 'question' AS type, rowid AS id, rowid AS question_id, "
+            f"snippet({QUESTION_INDEX}, -1, '[', ']', '…', 12) AS snippet, "
+            f"bm25({QUESTION_INDEX}, 2.0, 1.0) AS rank "
+            f"FROM {QUESTION_INDEX} WHERE {QUESTION_INDEX} MATCH %s"
+        )
+        params.append(match)
+    if 'answer' in kinds:
+        parts.append(
+            f"SELECT 'answer' AS type, f.rowid AS id, a.question_id AS question_id, "
+            f"snippet({ANSWER_INDEX}, 0, '[', ']', '…', 12) AS snippet, "
+            f"bm25({ANSWER_INDEX}) AS rank "
+            f"FROM {ANSWER_INDEX} f JOIN forum_app_answer a ON a.id = f.rowid "
+            f"WHERE {ANSWER_INDEX} MATCH %s"
+        )
+        params.append(match)
+    if not parts:
+        return []
+
+    sql = ' UNION ALL '.join(parts) + ' ORDER BY rank LIMIT %s'
+    params.append(limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
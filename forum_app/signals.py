@@ -0,0 +1,185 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from forum_app import changes, events, ranking, search, sqlite, tasks
+from forum_app.api.authentication import token_cache
+from forum_app.api.caching import invalidate
+from forum_app.api.serializers import AnswerSerializer, LikeSerializer
+from forum_app.models import Question, Answer, Like, Change
+
+SEARCHABLE_FIELDS = {
+    Question: {'title', 'content'},
+    Answer: {'content'},
+}
+
+
+def _touches_search_fields(sender, update_fields):
+    # Speichern mit update_fields ohne Textfelder (z.B. Zähler) muss den Index nicht anfassen.
+    return update_fields is None or bool(SEARCHABLE_FIELDS[sender] & set(update_fields))
+
+
+# Mit FORUM_TASKS['DEFERRED'] aktualisiert run_tasks den Index (siehe forum_app.tasks).
+
+@receiver(post_save, sender=Question)
+def index_question(sender, instance, update_fields=None, **kwargs):
+    if not _touches_search_fields(sender, update_fields):
+        return
+    if tasks.is_deferred():
+        tasks.enqueue(search.refresh_question, instance.pk)
+    else:
+        search.index_question(instance)
+
+
+@receiver(post_delete, sender=Question)
+def unindex_question(sender, instance, **kwargs):
+    if tasks.is_deferred():
+        tasks.enqueue(search.refresh_question, instance.pk)
+    else:
+        search.remove_question(instance.pk)
+
+
+@receiver(post_save, sender=Answer)
+def index_answer(sender, instance, update_fields=None, **kwargs):
+    if not _touches_search_fields(sender, update_fields):
+        return
+    if tasks.is_deferred():
+        tasks.enqueue(search.refresh_answer, instance.pk)
+    else:
+        search.index_answer(instance)
+
+
+@receiver(post_delete, sender=Answer)
+def unindex_answer(sender, instance, **kwargs):
+    if tasks.is_deferred():
+        tasks.enqueue(search.refresh_answer, instance.pk)
+    else:
+        search.remove_answer(instance.pk)
+
+
+# Hot-Ranking: jede neue Frage startet mit dem Beitrag ihres eigenen Zeitpunkts.
+# Likes und Antworten schreiben die Views zusammen mit den Zählern fort.
+
+@receiver(pre_save, sender=Question)
+def initial_hot_score(sender, instance, raw=False, **kwargs):
+    if instance._state.adding and not raw and not instance.hot_score:
+        instance.hot_score = ranking.question_score(instance.created_at or timezone.now())
+
+
+# Response-Cache: nur die Versionen der betroffenen Ressourcen erhöhen.
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_question(sender, instance, **kwargs):
+    invalidate('questions', f'question:{instance.pk}')
+
+
+@receiver(pre_save, sender=Answer)
+def remember_answer_question(sender, instance, **kwargs):
+    # Wechselt eine Antwort die Frage, muss auch die alte Frage invalidiert werden.
+    if instance.pk is not None:
+        instance._previous_question_id = (
+            Answer.objects.filter(pk=instance.pk).values_list('question_id', flat=True).first())
+
+
+@receiver(post_save, sender=Answer)
+@receiver(post_delete, sender=Answer)
+def invalidate_answer(sender, instance, **kwargs):
+    question_ids = {instance.question_id, getattr(instance, '_previous_question_id', None)}
+    invalidate('answers', 'questions', *(f'question:{pk}' for pk in question_ids if pk is not None))
+
+
+@receiver(post_save, sender=Like)
+@receiver(post_delete, sender=Like)
+def invalidate_like(sender, instance, **kwargs):
+    invalidate('questions', f'question:{instance.question_id}')
+
+
+# Änderungsprotokoll für /changes/ (siehe forum_app.changes), in derselben Transaktion.
+
+@receiver(post_save, sender=Question)
+@receiver(post_save, sender=Answer)
+@receiver(post_save, sender=Like)
+def record_change(sender, instance, **kwargs):
+    changes.record(instance, Change.UPSERT)
+    previous = getattr(instance, '_previous_question_id', None)
+    if sender is Answer and previous is not None and previous != instance.question_id:
+        # Die alte Frage hat eine Antwort weniger.
+        changes.record_many([Question(pk=previous)], Change.UPSERT, using=instance._state.db)
+
+
+@receiver(post_delete, sender=Question)
+@receiver(post_delete, sender=Answer)
+@receiver(post_delete, sender=Like)
+def record_deletion(sender, instance, **kwargs):
+    changes.record(instance, Change.DELETE)
+
+
+# Server-Sent Events (siehe forum_app.events): Deltas je Frage nach dem Commit.
+
+@receiver(post_save, sender=Answer)
+def publish_answer(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous_question_id', None)
+    if previous is not None and previous != instance.question_id:
+        # Für die alte Frage ist die Antwort weg, für die neue hinzugekommen.
+        events.publish_on_commit(previous, 'answer.deleted', {'id': instance.pk, 'question': previous})
+        created = True
+    events.publish_on_commit(instance.question_id, 'answer.created' if created else 'answer.updated',
+                             AnswerSerializer(instance).data)
+
+
+@receiver(post_delete, sender=Answer)
+def publish_answer_deleted(sender, instance, **kwargs):
+    events.publish_on_commit(instance.question_id, 'answer.deleted',
+                             {'id': instance.pk, 'question': instance.question_id})
+
+
+@receiver(post_save, sender=Like)
+def publish_like(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        events.publish_on_commit(instance.question_id, 'like.created', LikeSerializer(instance).data)
+
+
+@receiver(post_delete, sender=Like)
+def publish_like_deleted(sender, instance, **kwargs):
+    events.publish_on_commit(instance.question_id, 'like.deleted',
+                             {'id': instance.pk, 'user': instance.user_id, 'question': instance.question_id})
+
+
+@receiver(post_delete, sender=Question)
+def publish_question_deleted(sender, instance, **kwargs):
+    events.publish_on_commit(instance.pk, 'question.deleted', {'id': instance.pk})
+
+
+# Token-Cache: wie beim Response-Cache sofort und nochmals nach dem Commit leeren.
+
+def _invalidate_tokens(keys):
+    if keys:
+        token_cache.invalidate(*keys)
+        transaction.on_commit(lambda: token_cache.invalidate(*keys))
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_token(sender, instance, **kwargs):
+    _invalidate_tokens([instance.key])
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_tokens(sender, instance, created=False, update_fields=None, **kwargs):
+    # Login aktualisiert nur last_login; der gecachte User bleibt dafür gültig.
+    if created or (update_fields is not None and set(update_fields) <= {'last_login'}):
+        return
+    _invalidate_tokens(list(Token.objects.filter(user=instance).values_list('key', flat=True)))
+
+
+# SQLite-Profil (WAL, busy_timeout, ...) für jede neue Datenbankverbindung.
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    sqlite.configure_connection(connection)
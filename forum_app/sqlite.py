@@ -0,0 +1,97 @@
+"""
+Tuning-Profil für SQLite-Verbindungen.
+
+Ohne Anpassung läuft SQLite im Rollback-Journal-Modus: Ein Schreiber sperrt die
+ganze Datei, Leser warten bzw. bekommen "database is locked". Für jede neue
+Django-Verbindung setzt configure_connection (über das Signal
+connection_created, siehe forum_app.signals) die PRAGMAs aus
+settings.FORUM_SQLITE:
+
+    'JOURNAL_MODE': 'WAL' - Leser und ein Schreiber blockieren sich nicht mehr,
+    'SYNCHRONOUS': 'NORMAL' - mit WAL sicher, fsync nur noch beim Checkpoint,
+    'BUSY_TIMEOUT_MS': wie lange auf eine Sperre gewartet wird,
+    'MMAP_SIZE': Bytes der Datei, die per mmap gelesen werden,
+    'CACHE_SIZE_KIB': Page-Cache pro Verbindung in KiB.
+
+None lässt den jeweiligen PRAGMA unverändert. 'WRITE_TRANSACTION_MODE' gilt
+nur für write_transaction: Schreibpfade starten mit BEGIN IMMEDIATE und holen
+die Schreibsperre sofort, sodass busy_timeout greift, statt dass das spätere
+Upgrade einer Lesesperre mit "database is locked" scheitert. Alle übrigen
+Transaktionen bleiben DEFERRED und nehmen Lesern keine Sperre weg. Zusammen mit CONN_MAX_AGE
+(Verbindungen bleiben über Requests hinweg offen) fallen die PRAGMAs nur einmal
+pro Verbindung an. ``manage.py stress_sqlite`` vergleicht den Durchsatz mit
+und ohne Profil.
+"""
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+
+DEFAULT_SETTINGS = {
+    'JOURNAL_MODE': 'WAL',
+    'SYNCHRONOUS': 'NORMAL',
+    'BUSY_TIMEOUT_MS': 5000,
+    'MMAP_SIZE': 256 * 1024 * 1024,
+    'CACHE_SIZE_KIB': 64 * 1024,
+    'WRITE_TRANSACTION_MODE': 'IMMEDIATE',
+}
+
+
+def get_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'FORUM_SQLITE', {})}
+
+
+def pragmas(config=None):
+    """Die auszuführenden PRAGMA-Statements für ``config`` in fester Reihenfolge."""
+    config = get_settings() if config is None else config
+    statements = []
+    if config['BUSY_TIMEOUT_MS'] is not None:
+        # Zuerst, damit schon das Umschalten des Journals auf Sperren wartet.
+        statements.append(f"PRAGMA busy_timeout = {int(config['BUSY_TIMEOUT_MS'])}")
+    if config['JOURNAL_MODE'] is not None:
+        statements.append(f"PRAGMA journal_mode = {config['JOURNAL_MODE']}")
+    if config['SYNCHRONOUS'] is not None:
+        statements.append(f"PRAGMA synchronous = {config['SYNCHRONOUS']}")
+    if config['MMAP_SIZE'] is not None:
+        statements.append(f"PRAGMA mmap_size = {int(config['MMAP_SIZE'])}")
+    if config['CACHE_SIZE_KIB'] is not None:
+        # Negative Werte bedeuten KiB statt Seiten.
+        statements.append(f"PRAGMA cache_size = {-int(config['CACHE_SIZE_KIB'])}")
+    return statements
+
+
+def configure_connection(connection):
+    if connection.vendor != 'sqlite':
+        return
+    statements = pragmas()
+    if connection.is_in_memory_db():
+        # In-Memory-Datenbanken (Tests) kennen kein WAL.
+        statements = [sql for sql in statements if 'journal_mode' not in sql]
+    # Direkt auf der DB-API-Verbindung, damit die PRAGMAs nicht als Queries gezählt werden.
+    for sql in statements:
+        connection.connection.execute(sql)
+
+
+@contextmanager
+def write_transaction(using=None):
+    """
+    transaction.atomic für Schreibpfade. Die äußerste Transaktion beginnt unter
+    SQLite mit dem Modus aus 'WRITE_TRANSACTION_MODE'; verschachtelt ist es ein
+    gewöhnlicher Savepoint.
+    """
+    connection = transaction.get_connection(using)
+    mode = get_settings()['WRITE_TRANSACTION_MODE']
+    if connection.vendor != 'sqlite' or connection.in_atomic_block or mode is None:
+        with transaction.atomic(using=using):
+            yield
+        return
+    # transaction_mode wird beim Verbinden aus OPTIONS gesetzt, also erst danach überschreiben.
+    connection.ensure_connection()
+    previous = connection.transaction_mode
+    connection.transaction_mode = mode
+    try:
+        with transaction.atomic(using=using):
+            connection.transaction_mode = previous
+            yield
+    finally:
+        connection.transaction_mode = previous
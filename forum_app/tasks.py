@@ -0,0 +1,142 @@
+"""
+Hintergrundaufgaben über eine Tabelle in der Forum-Datenbank (ohne externen Broker).
+
+Abgeleitete Daten (Zähler, Hot-Ranking, Suchindex) werden standardmäßig im
+Request gepflegt. Mit settings.FORUM_TASKS['DEFERRED'] legen die Signal-Handler
+und die Zähler-/Ranking-Funktionen stattdessen Aufgaben an (enqueue), die
+``manage.py run_tasks`` abarbeitet. Die Aufgabe wird in derselben Transaktion
+wie die Änderung geschrieben und geht daher nicht verloren.
+
+- Eine Aufgabe ist eine importierbare Funktion plus JSON-Argumente. Die
+  Funktionen müssen idempotent sein (z.B. "Zähler von Frage 7 neu zählen"),
+  weil sie wiederholt und zusammengelegt werden.
+- Deduplizierung: Dieselbe Funktion mit denselben Argumenten steht höchstens
+  einmal in der Warteschlange (partieller Unique-Index auf dedup_key). Läuft
+  sie gerade, darf eine neue eingereiht werden, da die laufende den neuen
+  Stand eventuell nicht mehr sieht.
+- Wiederholung: Schlägt eine Aufgabe fehl, läuft sie nach
+  'RETRY_DELAY_SECONDS' * 2^(Versuche - 1) erneut, nach 'MAX_ATTEMPTS'
+  Versuchen bleibt sie als 'failed' mit Fehlermeldung stehen (Admin).
+- Ein Worker sperrt eine Aufgabe für 'LEASE_SECONDS'; stürzt er ab, übernimmt
+  danach ein anderer.
+
+Konfiguration über settings.FORUM_TASKS:
+    'DEFERRED': Aufgaben in die Warteschlange statt sofort ausführen,
+    'BATCH_SIZE', 'MAX_ATTEMPTS', 'RETRY_DELAY_SECONDS', 'LEASE_SECONDS'.
+"""
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from forum_app import sqlite
+from forum_app.models import Task
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'DEFERRED': False,
+    'BATCH_SIZE': 100,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_DELAY_SECONDS': 10,
+    'LEASE_SECONDS': 300,
+}
+
+
+def get_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'FORUM_TASKS', {})}
+
+
+def is_deferred():
+    return get_settings()['DEFERRED']
+
+
+def task_name(func):
+    return f'{func.__module__}.{func.__qualname__}'
+
+
+def enqueue(func, *args):
+    """Führt ``func(*args)`` sofort aus bzw. reiht es ein (DEFERRED); doppelte Aufgaben entfallen."""
+    enqueue_many(func, [args])
+
+
+def enqueue_many(func, args_list):
+    """Wie enqueue für mehrere Argumentlisten, mit einem INSERT."""
+    if not is_deferred():
+        for args in args_list:
+            func(*args)
+        return
+    name = task_name(func)
+    tasks = {}
+    for args in args_list:
+        args = list(args)
+        dedup_key = f'{name}:{json.dumps(args, separators=(",", ":"))}'
+        tasks[dedup_key] = Task(name=name, args=args, dedup_key=dedup_key)
+    # Der partielle Unique-Index verwirft Aufgaben, die schon warten.
+    Task.objects.bulk_create(tasks.values(), ignore_conflicts=True)
+
+
+def _due(now):
+    return Q(run_after__lte=now) & Q(status__in=[Task.PENDING, Task.RUNNING])
+
+
+def claim(limit, now=None):
+    """Sperrt bis zu ``limit`` fällige Aufgaben für diesen Worker und gibt sie zurück."""
+    config = get_settings()
+    now = now or timezone.now()
+    candidates = list(Task.objects.filter(_due(now)).order_by('run_after', 'id')
+                      .values_list('pk', flat=True)[:limit])
+    claimed = []
+    for pk in candidates:
+        # Nur wer die Zeile im fälligen Zustand erwischt, bekommt sie (mehrere Worker).
+        if Task.objects.filter(_due(now), pk=pk).update(
+                status=Task.RUNNING, attempts=F('attempts') + 1,
+                run_after=now + timedelta(seconds=config['LEASE_SECONDS'])):
+            claimed.append(pk)
+    return list(Task.objects.filter(pk__in=claimed).order_by('id'))
+
+
+def execute(task):
+    """Führt eine gesperrte Aufgabe aus; gibt True bei Erfolg zurück."""
+    try:
+        with sqlite.write_transaction():
+            import_string(task.name)(*task.args)
+    except Exception as exc:
+        _failed(task, exc)
+        return False
+    Task.objects.filter(pk=task.pk).delete()
+    return True
+
+
+def _failed(task, exc):
+    config = get_settings()
+    error = f'{type(exc).__name__}: {exc}'
+    if task.attempts >= config['MAX_ATTEMPTS']:
+        logger.error('Task %s%s failed permanently: %s', task.name, task.args, error)
+        Task.objects.filter(pk=task.pk).update(status=Task.FAILED, last_error=error)
+        return
+    logger.warning('Task %s%s failed (attempt %d): %s', task.name, task.args, task.attempts, error)
+    delay = config['RETRY_DELAY_SECONDS'] * 2 ** (task.attempts - 1)
+    try:
+        with sqlite.write_transaction():
+            Task.objects.filter(pk=task.pk).update(
+                status=Task.PENDING, last_error=error, run_after=timezone.now() + timedelta(seconds=delay))
+    except IntegrityError:
+        # Inzwischen wartet dieselbe Aufgabe erneut; die übernimmt den Wiederholungsversuch.
+        Task.objects.filter(pk=task.pk).delete()
+
+
+def run_pending(limit=None):
+    """Arbeitet bis zu ``limit`` fällige Aufgaben ab; gibt (erfolgreich, fehlgeschlagen) zurück."""
+    succeeded = failed = 0
+    for task in claim(limit or get_settings()['BATCH_SIZE']):
+        if execute(task):
+            succeeded += 1
+        else:
+            failed += 1
+    return succeeded, failed
@@ -0,0 +1,45 @@
+from django.core.cache import caches
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import iter_test_cases
+
+from forum_app.api import throttling
+from forum_app.api.authentication import token_cache
+from forum_app.api.caching import response_cache
+
+
+def clear_caches():
+    """Django-Caches, Response-Cache und das prozesslokale LRU des Token-Caches."""
+    for cache in caches.all():
+        cache.clear()
+    response_cache.clear()
+    token_cache.clear()
+
+
+class ForumTestRunner(DiscoverRunner):
+    """
+    Drosselt während der Tests mit einem LocMemThrottleStore statt in der
+    SQLite-Datei einer laufenden Instanz und leert ihn nach jedem Test, ebenso
+    alle Caches (clear_caches). Tests beginnen so ohne Einträge früherer Tests.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._throttle_settings = override_settings(FORUM_THROTTLE={
+            'BACKEND': 'forum_app.api.throttling.LocMemThrottleStore', 'OPTIONS': {}})
+        self._throttle_settings.enable()
+        throttling.reload_store()
+        clear_caches()
+
+    def teardown_test_environment(self, **kwargs):
+        self._throttle_settings.disable()
+        throttling.reload_store()
+        super().teardown_test_environment(**kwargs)
+
+    def build_suite(self, *args, **kwargs):
+        suite = super().build_suite(*args, **kwargs)
+        for test in iter_test_cases(suite):
+            # Läuft nach tearDown, auch in den Worker-Prozessen von --parallel.
+            test.addCleanup(throttling.clear_throttles)
+            test.addCleanup(clear_caches)
+        return suite
@@ -0,0 +1,56 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from django.contrib.auth.models import User
+from forum_app.admin import CappedCountPaginator
+from forum_app.models import Question, Answer, Like
+
+
+class AdminChangelistTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', password='password')
+        self.client.force_login(self.admin)
+
+    def create_rows(self, count):
+        offset = Question.objects.count()
+        for i in range(offset, offset + count):
+            user = User.objects.create(username=f'user{i}')
+            question = Question.objects.create(title=f'Question {i}', content='x' * 5000, author=user)
+            Answer.objects.create(content='y' * 5000, author=user, question=question)
+            Like.objects.create(user=user, question=question)
+
+    def changelist_queries(self, model):
+        url = reverse(f'admin:forum_app_{model}_changelist')
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, ctx.captured_queries
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self.create_rows(3)
+        few = {model: len(self.changelist_queries(model)[1]) for model in ('question', 'answer', 'like')}
+        self.create_rows(20)
+        for model, count in few.items():
+            with self.subTest(model=model):
+                response, queries = self.changelist_queries(model)
+                self.assertEqual(len(queries), count)
+                # Session, User, gedeckelter COUNT, Seite; kein ungefiltertes COUNT(*).
+                self.assertEqual(len(queries), 4)
+
+    def test_large_text_is_truncated_in_sql(self):
+        self.create_rows(2)
+        for model in ('question', 'answer'):
+            response, queries = self.changelist_queries(model)
+            page_sql = queries[-1]['sql']
+            self.assertIn('SUBSTR', page_sql.upper())
+            self.assertNotContains(response, 'x' * 100)
+            self.assertNotContains(response, 'y' * 100)
+
+    def test_paginator_caps_count(self):
+        self.create_rows(5)
+        paginator = CappedCountPaginator(Question.objects.order_by('id'), 2)
+        paginator.max_count = 3
+        self.assertEqual(paginator.count, 3)
+        self.assertEqual(paginator.num_pages, 2)
@@ -0,0 +1,100 @@
+import base64
+import json
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from django.contrib.auth.models import User
+from forum_app.api.caching import response_cache
+from forum_app.models import Question, Answer
+
+
+class AnswerKeysetPaginationTest(APITestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice', password='password')
+        self.bob = User.objects.create_user(username='bob', password='password')
+        question = Question.objects.create(title='Question', content='Content', author=self.alice)
+        # Viele gleiche Inhalte, damit Seitengrenzen mitten in Gleichständen liegen.
+        for i in range(7):
+            Answer.objects.create(content=f'answer {i % 3}', author=self.bob if i % 2 else self.alice,
+                                  question=question)
+        self.url = reverse('answer-list-create')
+
+    def collect(self, params):
+        ids, url, pages = [], self.url, 0
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [item['id'] for item in response.data['results']]
+            pages += 1
+            if response.data['next'] is None:
+                return ids, pages
+            response = self.client.get(response.data['next'])
+
+    def expected(self, *ordering):
+        return list(Answer.objects.order_by(*ordering).values_list('id', flat=True))
+
+    def test_pages_follow_ordering_with_id_tie_break(self):
+        for ordering, expected in (
+                ('content', ('content', 'id')),
+                ('-content', ('-content', '-id')),
+                ('author__username', ('author__username', 'id')),
+                ('-author__username', ('-author__username', '-id'))):
+            ids, pages = self.collect({'page_size': 2, 'ordering': ordering})
+            self.assertEqual(ids, self.expected(*expected), ordering)
+            self.assertEqual(pages, 4)
+
+    def test_pages_do_not_count(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {'page_size': 2, 'content': 'answer'})
+        self.assertNotIn('count_estimate', response.data)
+        self.assertFalse([q for q in ctx.captured_queries if 'COUNT(' in q['sql'].upper()])
+
+    def test_count_estimate_only_when_asked_and_cached(self):
+        response = self.client.get(self.url, {'page_size': 2, 'count': 'approx', 'author': 'bob'})
+        self.assertEqual(response.data['count_estimate'], 3)
+        response_cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.url, {'page_size': 2, 'count': 'approx', 'author': 'bob'})
+        self.assertFalse([q for q in ctx.captured_queries if 'COUNT(' in q['sql'].upper()])
+
+    def test_without_page_params_list_is_unpaginated(self):
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 7)
+
+    def test_cursor_from_other_ordering_is_rejected(self):
+        next_url = self.client.get(self.url, {'page_size': 2}).data['next']
+        response = self.client.get(next_url + '&ordering=author__username')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(self.url, {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_malformed_cursor_values_are_rejected(self):
+        for position in (['content', None, 1], ['content', {'a': 1}, 1], ['content', 'x', True],
+                         ['content', 'x', 1, False], ['content', 5, 1, True]):
+            cursor = base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+            response = self.client.get(self.url, {'cursor': cursor})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, position)
+
+    def test_long_values_keep_the_cursor_short(self):
+        question = Question.objects.first()
+        for i in range(4):
+            Answer.objects.create(content=f'{"x" * 5000} {i % 2}', author=self.alice, question=question)
+        for ordering, expected in (('content', ('content', 'id')), ('-content', ('-content', '-id'))):
+            response = self.client.get(self.url, {'page_size': 8, 'ordering': ordering})
+            self.assertLess(len(response.data['next']), 300)
+            ids, _ = self.collect({'page_size': 1, 'ordering': ordering})
+            self.assertEqual(ids, self.expected(*expected), ordering)
+
+    def test_deleted_row_behind_truncated_cursor_skips_nothing(self):
+        question = Question.objects.first()
+        long = [Answer.objects.create(content=f'{"x" * 100} {i}', author=self.alice, question=question)
+                for i in range(3)]
+        response = self.client.get(self.url, {'page_size': 8})
+        long[0].delete()
+        response_cache.clear()
+        rest = self.client.get(response.data['next'])
+        self.assertEqual([item['id'] for item in rest.data['results']], [long[1].pk, long[2].pk])
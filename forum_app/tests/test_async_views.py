@@ -0,0 +1,95 @@
+import base64
+import json
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from django.contrib.auth.models import User
+from forum_app.api.throttling import AsyncAnonRateThrottle
+from forum_app.models import Question, Answer, Like
+
+
+class AsyncReadViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        now = timezone.now()
+        self.questions = []
+        for i in range(5):
+            question = Question.objects.create(title=f'Question {i}', content='Content', author=self.user)
+            # Zwei Fragen mit gleichem Zeitstempel prüfen den id-Tie-Break des Cursors.
+            Question.objects.filter(pk=question.pk).update(created_at=now + timedelta(seconds=min(i, 3)))
+            self.questions.append(question)
+        self.answer = Answer.objects.create(question=self.questions[0], author=self.user, content='Answer')
+        Like.objects.create(question=self.questions[0], user=self.user)
+
+    async def test_detail_matches_sync_endpoint(self):
+        pk = self.questions[0].pk
+        response = await self.async_client.get(reverse('async-question-detail', kwargs={'pk': pk}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+        expected = await self._sync_json(reverse('question-detail', kwargs={'pk': pk}))
+        self.assertEqual(json.loads(response.content), expected)
+
+    async def _sync_json(self, url):
+        response = await sync_to_async(APIClient().get)(url)
+        return json.loads(response.content)
+
+    async def test_list_pages_through_all_questions(self):
+        url = reverse('async-question-list') + '?page_size=2'
+        seen = []
+        while url:
+            response = await self.async_client.get(url)
+            self.assertEqual(response.status_code, 200)
+            data = json.loads(response.content)
+            self.assertLessEqual(len(data['results']), 2)
+            seen.extend(item['id'] for item in data['results'])
+            url = data['next']
+        self.assertEqual(seen, [q.pk for q in self.questions])
+
+    async def test_list_supports_sparse_fields_and_expand(self):
+        response = await self.async_client.get(
+            reverse('async-question-list'), {'fields': 'id,title', 'expand': 'answers'})
+        first = json.loads(response.content)['results'][0]
+        self.assertEqual(set(first), {'id', 'title', 'answers'})
+        self.assertEqual(first['answers'][0]['id'], self.answer.pk)
+
+    async def test_answer_list_and_detail(self):
+        response = await self.async_client.get(reverse('async-answer-list'), {'question': self.questions[0].pk})
+        self.assertEqual([a['id'] for a in json.loads(response.content)['results']], [self.answer.pk])
+
+        response = await self.async_client.get(reverse('async-answer-detail', kwargs={'pk': self.answer.pk}))
+        self.assertEqual(json.loads(response.content)['content'], 'Answer')
+
+    async def test_missing_object_and_bad_cursor(self):
+        response = await self.async_client.get(reverse('async-question-detail', kwargs={'pk': 999}))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(json.loads(response.content), {'detail': 'No Question matches the given query.'})
+
+        response = await self.async_client.get(reverse('async-question-list'), {'cursor': 'bm9wZQ=='})
+        self.assertEqual(response.status_code, 404)
+
+    async def test_impossible_date_in_cursor_is_invalid(self):
+        cursor = base64.urlsafe_b64encode(b'2024-13-45T00:00:00|5').decode()
+        response = await self.async_client.get(reverse('async-question-list'), {'cursor': cursor})
+        self.assertEqual(response.status_code, 404)
+
+    async def test_throttle_check_runs_outside_the_event_loop(self):
+        threads = []
+
+        def allow_request(throttle, request, view):
+            threads.append(threading.get_ident())
+            return True
+
+        with mock.patch.object(AsyncAnonRateThrottle, 'allow_request', allow_request):
+            response = await self.async_client.get(reverse('async-question-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], threading.get_ident())
@@ -0,0 +1,94 @@
+import time
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from django.contrib.auth.models import User
+from forum_app.api.authentication import CachedTokenAuthentication, TokenCache, token_cache
+from forum_app.models import Question
+
+
+class CachedTokenAuthenticationTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.token = Token.objects.create(user=self.user)
+        self.question = Question.objects.create(title='Question', content='Content', author=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        self.url = reverse('like-list')
+
+    def token_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        return response, [q for q in ctx.captured_queries if 'authtoken_token' in q['sql']]
+
+    def test_second_request_skips_token_lookup(self):
+        response, queries = self.token_queries()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 1)
+
+        response, queries = self.token_queries()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(queries, [])
+
+    def test_shared_cache_serves_other_processes(self):
+        self.token_queries()
+        # Ein anderer Prozess hat ein leeres LRU, aber denselben geteilten Cache.
+        token_cache.clear()
+        response, queries = self.token_queries()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(queries, [])
+
+    def test_deleted_token_is_rejected(self):
+        self.token_queries()
+        self.token.delete()
+        response, _ = self.token_queries()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_rejected(self):
+        self.token_queries()
+        self.user.is_active = False
+        self.user.save()
+        response, _ = self.token_queries()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cache_holds_no_credentials(self):
+        self.token_queries()
+        entry = cache.get(TokenCache.shared_key(self.token.key))
+        self.assertEqual(entry, {'id': self.user.pk, 'is_active': True, 'is_staff': False, 'is_superuser': False})
+        # Weitere Felder lädt der User aus dem Cache bei Bedarf nach.
+        user, token = CachedTokenAuthentication().authenticate_credentials(self.token.key)
+        self.assertEqual((user.pk, token.user_id), (self.user.pk, self.user.pk))
+        self.assertEqual(user.username, 'testuser')
+
+    def test_cached_entry_is_not_shared_between_requests(self):
+        self.token_queries()
+        token_cache.get(self.token.key)['is_active'] = False
+        self.assertTrue(token_cache.get(self.token.key)['is_active'])
+
+
+class TokenCacheTest(SimpleTestCase):
+    def test_local_lru_is_bounded(self):
+        tokens = TokenCache('default', timeout=300, local_ttl=30, max_entries=2)
+        for key in ('a', 'b', 'c'):
+            tokens.set(key, key.upper())
+        self.assertEqual(list(tokens._local), ['b', 'c'])
+        # 'a' kommt weiterhin aus dem geteilten Cache.
+        self.assertEqual(tokens.get('a'), 'A')
+
+    def test_process_local_cache_keeps_entries_only_for_local_ttl(self):
+        # LocMemCache ist nicht zwischen Workern geteilt.
+        self.assertEqual(TokenCache('default', timeout=300, local_ttl=30, max_entries=10).shared_timeout, 30)
+
+    def test_local_entries_expire(self):
+        tokens = TokenCache('default', timeout=300, local_ttl=0.01, max_entries=10)
+        tokens.set('a', 'A')
+        cache.clear()
+        self.assertEqual(tokens.get('a'), 'A')
+        time.sleep(0.02)
+        self.assertIsNone(tokens.get('a'))
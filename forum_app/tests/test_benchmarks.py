@@ -0,0 +1,51 @@
+import io
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from forum_app import benchmarks
+from forum_app.models import Question, Like
+
+
+class BenchmarkHarnessTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('generate_forum_data', users=20, questions=60, answers=150, likes=200,
+                     seed=3, stdout=io.StringIO())
+
+    def test_run_reports_every_scenario_and_removes_its_likes(self):
+        likes = Like.objects.count()
+        like_counts = list(Question.objects.order_by('id').values_list('like_count', flat=True))
+        results = benchmarks.run_benchmarks(iterations=5, warmup=1)
+
+        self.assertEqual(set(results['scenarios']), {
+            'question_list', 'question_list_expanded', 'question_detail',
+            'answer_search', 'answer_ordering', 'like_create'})
+        for result in results['scenarios'].values():
+            self.assertLessEqual(result['p50_ms'], result['p95_ms'])
+            self.assertLessEqual(result['p95_ms'], result['p99_ms'])
+            self.assertGreater(result['bytes_per_response'], 0)
+        self.assertEqual(results['scenarios']['question_list']['queries_per_request'], 1)
+        self.assertEqual(Like.objects.count(), likes)
+        self.assertEqual(list(Question.objects.order_by('id').values_list('like_count', flat=True)), like_counts)
+
+    def test_dataset_requires_a_database_file(self):
+        with self.assertRaisesMessage(CommandError, '--database-file'):
+            call_command('benchmark_api', dataset='small', stdout=io.StringIO())
+
+    def test_compare_flags_latency_and_query_regressions(self):
+        baseline = {'scenarios': {'question_list': {'p50_ms': 10, 'p95_ms': 20, 'queries_per_request': 1}}}
+        faster = {'scenarios': {'question_list': {'p50_ms': 10.5, 'p95_ms': 15, 'queries_per_request': 1}}}
+        slower = {'scenarios': {'question_list': {'p50_ms': 10, 'p95_ms': 25, 'queries_per_request': 2}}}
+
+        self.assertEqual(benchmarks.compare_results(baseline, faster, threshold=0.1), [])
+        regressions = benchmarks.compare_results(baseline, slower, threshold=0.1)
+        self.assertEqual(len(regressions), 2)
+        self.assertIn('p95_ms', regressions[0])
+
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(benchmarks.percentile(values, 50), 50)
+        self.assertEqual(benchmarks.percentile(values, 99), 99)
+        self.assertEqual(benchmarks.percentile([7], 95), 7)
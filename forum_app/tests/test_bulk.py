@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from django.contrib.auth.models import User
+from forum_app import search
+from forum_app.models import Question, Answer, Like
+
+
+class BulkEndpointTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.questions = [Question.objects.create(title=f'Question {i}', content='Content', author=self.user)
+                          for i in range(3)]
+        self.client.force_authenticate(self.user)
+
+    def counts(self):
+        return {q.id: (q.like_count, q.answer_count)
+                for q in Question.objects.filter(pk__in=[q.id for q in self.questions])}
+
+    def test_bulk_like_reports_per_item_status(self):
+        first, second, third = self.questions
+        Like.objects.create(user=self.user, question=second)
+        response = self.client.post(reverse('like-bulk'),
+                                    {'questions': [first.id, second.id, 999, first.id]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['results'], [
+            {'question': first.id, 'status': 'created'},
+            {'question': second.id, 'status': 'exists'},
+            {'question': 999, 'status': 'not_found'},
+        ])
+        self.assertEqual(Like.objects.filter(user=self.user).count(), 2)
+        self.assertEqual(self.counts()[first.id], (1, 0))
+        # Der Zähler der bereits gelikten Frage bleibt unverändert (Like wurde am Zähler vorbei angelegt).
+        self.assertEqual(self.counts()[second.id], (0, 0))
+
+    def test_bulk_like_query_count_is_independent_of_batch_size(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(reverse('like-bulk'), {'questions': [q.id for q in self.questions]}, format='json')
+        self.assertEqual(Like.objects.count(), 3)
+        writes = [q for q in ctx.captured_queries if q['sql'].startswith(('INSERT', 'UPDATE'))]
+        # Je ein INSERT für alle Likes und ihre Einträge im Änderungsprotokoll,
+        # je ein UPDATE für alle Zähler und alle hot_scores.
+        self.assertEqual(len(writes), 4)
+
+    def test_bulk_like_ignores_likes_committed_meanwhile(self):
+        first, second, _ = self.questions
+        # Ein paralleler Request hat nach Beginn dieses Requests committet.
+        like = Like.objects.create(user=self.user, question=second)
+        Like.objects.filter(pk=like.pk).update(created_at=timezone.now() + timedelta(seconds=5))
+        response = self.client.post(reverse('like-bulk'), {'questions': [first.id, second.id]}, format='json')
+        self.assertEqual([r['status'] for r in response.data['results']], ['created', 'exists'])
+        self.assertEqual(self.counts()[second.id], (0, 0))
+
+    def test_bulk_unlike(self):
+        first, second, _ = self.questions
+        self.client.post(reverse('like-bulk'), {'questions': [first.id, second.id]}, format='json')
+        response = self.client.delete(reverse('like-bulk'), {'questions': [first.id, self.questions[2].id]},
+                                      format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([r['status'] for r in response.data['results']], ['deleted', 'not_liked'])
+        self.assertEqual(list(Like.objects.values_list('question_id', flat=True)), [second.id])
+        self.assertEqual(self.counts()[first.id], (0, 0))
+        self.assertEqual(self.counts()[second.id], (1, 0))
+
+    def test_bulk_like_rejects_oversized_batches(self):
+        response = self.client.post(reverse('like-bulk'), {'questions': list(range(1, 102))}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_answers(self):
+        first, second, _ = self.questions
+        response = self.client.post(reverse('answer-bulk-create'), [
+            {'question': first.id, 'content': 'Use select_related'},
+            {'question': 999, 'content': 'Lost'},
+            {'question': first.id},
+            {'question': second.id, 'content': 'Try prefetch_related'},
+            {'question': first.id, 'content': 'Or only()'},
+        ], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        results = response.data['results']
+        self.assertEqual([r['status'] for r in results],
+                         ['created', 'invalid', 'invalid', 'created', 'created'])
+        self.assertIn('question', results[1]['errors'])
+        self.assertIn('content', results[2]['errors'])
+        self.assertEqual(Answer.objects.get(pk=results[0]['id']).author, self.user)
+        self.assertEqual(self.counts()[first.id], (0, 2))
+        self.assertEqual(self.counts()[second.id], (0, 1))
+        if search.is_available():
+            self.assertEqual({hit['id'] for hit in search.search('prefetch', kinds=('answer',))},
+                             {results[3]['id']})
+
+    def test_bulk_answers_require_a_list(self):
+        response = self.client.post(reverse('answer-bulk-create'), {'question': 1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_duplicate_single_like_is_rejected_by_constraint(self):
+        url = reverse('like-list')
+        self.client.post(url, {'question': self.questions[0].id}, format='json')
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(url, {'question': self.questions[0].id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['non_field_errors'], ['You have already liked this question.'])
+        self.assertFalse(any('EXISTS' in q['sql'] or 'LIMIT 1' in q['sql'] for q in ctx.captured_queries
+                             if 'forum_app_like' in q['sql']))
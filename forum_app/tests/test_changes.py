@@ -0,0 +1,103 @@
+import io
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from django.contrib.auth.models import User
+from forum_app import changes
+from forum_app.models import Question, Answer, Like, Change
+
+
+class ChangesFeedTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.question = Question.objects.create(title='Frage', content='Inhalt', author=self.user)
+
+    def sync(self, since=0, **params):
+        response = self.client.get(reverse('changes'), {'since': since, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def ids(self, data):
+        return {name: [item['id'] for item in data[name]] for name in ('questions', 'answers', 'likes')}
+
+    def test_initial_sync_returns_current_state(self):
+        answer = Answer.objects.create(question=self.question, content='Antwort', author=self.user)
+        data = self.sync()
+        self.assertEqual(self.ids(data), {'questions': [self.question.pk], 'answers': [answer.pk], 'likes': []})
+        self.assertNotIn('answers', data['questions'][0])
+        self.assertFalse(data['has_more'])
+        self.assertEqual(self.sync(data['cursor']),
+                         {'cursor': data['cursor'], 'has_more': False, 'questions': [], 'answers': [], 'likes': [],
+                          'deleted': {'questions': [], 'answers': [], 'likes': []}})
+
+    def test_updates_include_parent_question(self):
+        cursor = self.sync()['cursor']
+        self.client.force_authenticate(self.user)
+        like = self.client.post(reverse('like-list'), {'question': self.question.pk}, format='json').data
+        data = self.sync(cursor)
+        self.assertEqual(self.ids(data), {'questions': [self.question.pk], 'answers': [], 'likes': [like['id']]})
+        self.assertEqual(data['questions'][0]['like_count'], 1)
+
+    def test_cascade_delete_leaves_tombstones(self):
+        answer = Answer.objects.create(question=self.question, content='Antwort', author=self.user)
+        like = Like.objects.create(question=self.question, user=self.user)
+        cursor, question_id = self.sync()['cursor'], self.question.pk
+        self.question.delete()
+        data = self.sync(cursor)
+        self.assertEqual(self.ids(data), {'questions': [], 'answers': [], 'likes': []})
+        self.assertEqual(data['deleted'], {'questions': [question_id], 'answers': [answer.pk],
+                                           'likes': [like.pk]})
+
+    def test_pages_until_caught_up(self):
+        answers = [Answer.objects.create(question=self.question, content=f'Antwort {i}', author=self.user)
+                   for i in range(5)]
+        cursor, seen, pages = 0, set(), 0
+        while True:
+            data = self.sync(cursor, limit=2)
+            seen.update(self.ids(data)['answers'])
+            cursor, pages = data['cursor'], pages + 1
+            if not data['has_more']:
+                break
+        self.assertEqual(seen, {answer.pk for answer in answers})
+        self.assertEqual(pages, 3)
+
+    def test_compaction_keeps_the_result(self):
+        answer = Answer.objects.create(question=self.question, content='Antwort', author=self.user)
+        answer.content = 'Geändert'
+        answer.save()
+        Like.objects.create(question=self.question, user=self.user).delete()
+        before = self.sync()
+
+        out = io.StringIO()
+        call_command('compact_changes', stdout=out)
+        self.assertIn('Removed 2 superseded', out.getvalue())
+        self.assertEqual(Change.objects.count(), 3)
+        self.assertEqual(self.sync(), before)
+        self.assertEqual(before['answers'][0]['content'], 'Geändert')
+
+    def test_bulk_likes_are_recorded(self):
+        other = Question.objects.create(title='Andere', content='Inhalt', author=self.user)
+        cursor = self.sync()['cursor']
+        self.client.force_authenticate(self.user)
+        self.client.post(reverse('like-bulk'), {'questions': [self.question.pk, other.pk]}, format='json')
+        data = self.sync(cursor)
+        self.assertEqual(len(data['likes']), 2)
+        self.assertEqual(self.ids(data)['questions'], [self.question.pk, other.pk])
+
+    def test_record_new_rows_fills_gaps(self):
+        Change.objects.all().delete()
+        self.assertEqual(changes.record_new_rows(), {'question': 1, 'answer': 0, 'like': 0})
+        self.assertEqual(changes.record_new_rows(), {'question': 0, 'answer': 0, 'like': 0})
+
+    @override_settings(FORUM_CHANGES={'MAX_PAGE_SIZE': 1})
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get(reverse('changes'), {'since': 'x'}).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(reverse('changes'), {'limit': 'x'}).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+        Answer.objects.create(question=self.question, content='Antwort', author=self.user)
+        self.assertTrue(self.sync(limit=50)['has_more'])
@@ -0,0 +1,64 @@
+import io
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from django.contrib.auth.models import User
+from forum_app.models import Question, Answer, Like
+
+
+class QuestionCounterTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.question = Question.objects.create(title='Test Question', content='Test Content', author=self.user)
+        self.client.force_authenticate(user=self.user)
+
+    def assertCounts(self, likes, answers, question=None):
+        question = question or self.question
+        question.refresh_from_db()
+        self.assertEqual(question.like_count, likes)
+        self.assertEqual(question.answer_count, answers)
+
+    def test_like_and_unlike_update_like_count(self):
+        response = self.client.post(reverse('like-list'), {'question': self.question.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertCounts(likes=1, answers=0)
+
+        response = self.client.delete(reverse('like-detail', kwargs={'pk': response.data['id']}))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertCounts(likes=0, answers=0)
+
+    def test_duplicate_like_does_not_change_count(self):
+        url = reverse('like-list')
+        self.client.post(url, {'question': self.question.id}, format='json')
+        response = self.client.post(url, {'question': self.question.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertCounts(likes=1, answers=0)
+
+    def test_answer_create_move_and_delete_update_answer_count(self):
+        response = self.client.post(
+            reverse('answer-list-create'), {'content': 'Answer', 'author': self.user.id, 'question': self.question.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertCounts(likes=0, answers=1)
+
+        other = Question.objects.create(title='Other', content='Other', author=self.user)
+        detail_url = reverse('answer-detail', args=[response.data['id']])
+        self.client.patch(detail_url, {'question': other.id}, format='json')
+        self.assertCounts(likes=0, answers=0)
+        self.assertCounts(likes=0, answers=1, question=other)
+
+        self.client.delete(detail_url)
+        self.assertCounts(likes=0, answers=0, question=other)
+
+    def test_rebuild_counters_command(self):
+        Like.objects.create(user=self.user, question=self.question)
+        Answer.objects.create(content='A', author=self.user, question=self.question)
+        Answer.objects.create(content='B', author=self.user, question=self.question)
+        Question.objects.create(title='Empty', content='Empty', author=self.user, like_count=5)
+
+        call_command('rebuild_counters', stdout=io.StringIO())
+
+        self.assertCounts(likes=1, answers=2)
+        self.assertFalse(Question.objects.filter(title='Empty').exclude(like_count=0).exists())
@@ -0,0 +1,146 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from django.contrib.auth.models import User
+from forum_app import events
+from forum_app.api.serializers import LikeSerializer
+from forum_app.models import Question, Answer, Like
+
+
+class BrokerTest(SimpleTestCase):
+    def setUp(self):
+        self.broker = events.Broker()
+
+    def subscribe(self, question_id, last_event_id=None):
+        subscription, backlog = self.broker.subscribe(
+            question_id, asyncio.get_running_loop(), asyncio.Event(), last_event_id)
+        self.addCleanup(subscription.close)
+        return subscription, [(event.name, event.data) for event in backlog]
+
+    async def test_delivers_only_to_subscribers_of_the_question(self):
+        subscription, backlog = self.subscribe(1)
+        self.assertEqual(backlog, [])
+        self.broker.publish(2, 'like.created', {'id': 1})
+        self.broker.publish(1, 'answer.created', {'id': 5})
+        await asyncio.wait_for(subscription.ready.wait(), 1)
+        self.assertEqual([event.name for event in subscription.drain()], ['answer.created'])
+        self.assertEqual(self.broker.subscriber_count(1), 1)
+        subscription.close()
+        self.assertEqual(self.broker.subscriber_count(), 0)
+
+    async def test_resume_from_ring_buffer(self):
+        first = self.broker.publish(1, 'answer.created', {'id': 1})
+        self.broker.publish(1, 'answer.updated', {'id': 1})
+        self.broker.publish(2, 'answer.created', {'id': 2})
+        _, backlog = self.subscribe(1, last_event_id=self.broker.event_id(first))
+        self.assertEqual(backlog, [('answer.updated', {'id': 1})])
+
+    async def test_ids_of_other_processes_reset(self):
+        first = self.broker.publish(1, 'answer.created', {'id': 1})
+        self.broker.publish(1, 'answer.updated', {'id': 1})
+        # Neustart oder anderer Worker: dieselbe Nummer, aber eine andere Epoche.
+        restarted = events.Broker()
+        for _ in range(3):
+            restarted.publish(1, 'answer.created', {'id': 2})
+        self.assertEqual(self.subscribe(1, last_event_id=restarted.event_id(first))[1], [(events.RESET, {})])
+        self.assertEqual(self.subscribe(1, last_event_id='garbage')[1], [(events.RESET, {})])
+
+    @override_settings(FORUM_EVENTS={'BUFFER_SIZE': 2})
+    async def test_gap_in_buffer_resets(self):
+        first = self.broker.publish(1, 'like.created', {'id': 1})
+        for i in range(2, 5):
+            self.broker.publish(1, 'like.created', {'id': i})
+        self.assertEqual(self.subscribe(1, last_event_id=self.broker.event_id(first))[1], [(events.RESET, {})])
+        # Unbekannte Nummern ebenso.
+        self.assertEqual(self.subscribe(1, last_event_id=f'{self.broker.epoch}-1000')[1], [(events.RESET, {})])
+        self.assertEqual(len(self.subscribe(1, last_event_id=f'{self.broker.epoch}-{first.id + 1}')[1]), 2)
+
+    @override_settings(FORUM_EVENTS={'MAX_BUFFERED_QUESTIONS': 2})
+    async def test_evicted_question_resets(self):
+        first = self.broker.publish(1, 'like.created', {'id': 1})
+        second = self.broker.publish(1, 'like.deleted', {'id': 1})
+        self.broker.publish(2, 'like.created', {'id': 2})
+        self.broker.publish(3, 'like.created', {'id': 3})
+        # Frage 1 ist verdrängt; ob nach ``first`` noch etwas kam, weiß der Broker nicht mehr.
+        self.assertEqual(self.subscribe(1, last_event_id=self.broker.event_id(first))[1], [(events.RESET, {})])
+        self.assertEqual(self.subscribe(3, last_event_id=self.broker.event_id(second))[1],
+                         [('like.created', {'id': 3})])
+
+    @override_settings(FORUM_EVENTS={'QUEUE_SIZE': 2})
+    async def test_slow_subscriber_is_reset(self):
+        subscription, _ = self.subscribe(1)
+        for i in range(3):
+            self.broker.publish(1, 'like.created', {'id': i})
+        await asyncio.sleep(0)
+        self.assertEqual([event.name for event in subscription.drain()], [events.RESET])
+
+
+@override_settings(FORUM_EVENTS={'HEARTBEAT_SECONDS': 0.05})
+class QuestionEventsViewTest(TestCase):
+    def setUp(self):
+        events.broker.clear()
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.question = Question.objects.create(title='Frage', content='Inhalt', author=self.user)
+
+    async def open(self, **headers):
+        response = await self.async_client.get(
+            reverse('question-events', kwargs={'pk': self.question.pk}), headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b'retry: 3000\n\n')
+        return stream
+
+    async def next_event(self, stream):
+        while True:
+            chunk = (await asyncio.wait_for(anext(stream), 1)).decode()
+            if not chunk.startswith(':'):
+                fields = dict(line.split(': ', 1) for line in chunk.strip().split('\n'))
+                return fields['id'], fields['event'], json.loads(fields['data'])
+
+    def write(self, action):
+        with self.captureOnCommitCallbacks(execute=True):
+            return action()
+
+    async def test_streams_answer_and_like_deltas(self):
+        stream = await self.open()
+        answer = await sync_to_async(self.write)(
+            lambda: Answer.objects.create(question=self.question, content='Antwort', author=self.user))
+        _, name, data = await self.next_event(stream)
+        self.assertEqual((name, data['id'], data['content']), ('answer.created', answer.pk, 'Antwort'))
+
+        like = await sync_to_async(self.write)(lambda: Like.objects.create(question=self.question, user=self.user))
+        self.assertEqual((await self.next_event(stream))[1:], ('like.created', dict(LikeSerializer(like).data)))
+
+        await sync_to_async(self.write)(lambda: self.question.delete())
+        names = [(await self.next_event(stream))[1] for _ in range(3)]
+        self.assertEqual(names, ['answer.deleted', 'like.deleted', 'question.deleted'])
+        with self.assertRaises(StopAsyncIteration):
+            await anext(stream)
+        self.assertEqual(events.broker.subscriber_count(), 0)
+
+    async def test_sends_heartbeats(self):
+        stream = await self.open()
+        self.assertEqual(await asyncio.wait_for(anext(stream), 1), b': heartbeat\n\n')
+        await stream.aclose()
+
+    async def test_resumes_after_last_event_id(self):
+        first = events.broker.publish(self.question.pk, 'answer.created', {'id': 1})
+        events.broker.publish(self.question.pk, 'answer.updated', {'id': 1})
+        stream = await self.open(**{'Last-Event-ID': events.broker.event_id(first)})
+        self.assertEqual((await self.next_event(stream))[1:], ('answer.updated', {'id': 1}))
+        await stream.aclose()
+
+    async def test_unstarted_stream_holds_no_subscription(self):
+        response = await self.async_client.get(reverse('question-events', kwargs={'pk': self.question.pk}))
+        self.assertEqual(response.status_code, 200)
+        del response
+        self.assertEqual(events.broker.subscriber_count(), 0)
+
+    async def test_unknown_question_is_not_found(self):
+        response = await self.async_client.get(reverse('question-events', kwargs={'pk': 999}))
+        self.assertEqual(response.status_code, 404)
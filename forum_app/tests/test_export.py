@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+import os
+import tempfile
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from django.contrib.auth.models import User
+from forum_app.models import Question, Answer, Like
+
+
+class ExportTest(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', password='password')
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.questions = [Question.objects.create(title=f'Question {i}', content='Content, "quoted"',
+                                                  author=self.user) for i in range(5)]
+        Answer.objects.create(question=self.questions[0], author=self.user, content='Answer')
+        Like.objects.create(question=self.questions[1], user=self.user)
+        self.client.force_authenticate(self.admin)
+
+    def stream(self, kind, **params):
+        response = self.client.get(reverse('export', kwargs={'kind': kind}), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_ndjson_export(self):
+        response, body = self.stream('questions')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([row['id'] for row in rows], [q.id for q in self.questions])
+        self.assertEqual(rows[0]['content'], 'Content, "quoted"')
+        self.assertEqual(rows[0]['author_id'], self.user.id)
+
+    def test_csv_export(self):
+        response, body = self.stream('answers', output='csv')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['question_id'], str(self.questions[0].id))
+
+    def test_incremental_export(self):
+        _, body = self.stream('questions', after_id=self.questions[2].id)
+        self.assertEqual([json.loads(line)['id'] for line in body.splitlines()],
+                         [q.id for q in self.questions[3:]])
+
+        Question.objects.filter(pk=self.questions[4].pk).update(created_at=timezone.now() + timedelta(days=1))
+        _, body = self.stream('questions', since=(timezone.now() + timedelta(hours=1)).isoformat())
+        self.assertEqual([json.loads(line)['id'] for line in body.splitlines()], [self.questions[4].id])
+
+    def test_invalid_parameters(self):
+        url = reverse('export', kwargs={'kind': 'questions'})
+        self.assertEqual(self.client.get(url, {'output': 'xml'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url, {'since': 'yesterday'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url, {'since': '2024-02-30'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(reverse('export', kwargs={'kind': 'users'})).status_code,
+                         status.HTTP_404_NOT_FOUND)
+
+    def test_export_is_admin_only(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse('export', kwargs={'kind': 'likes'}))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_management_command(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'likes.csv')
+            err = io.StringIO()
+            call_command('export_forum', 'likes', output='csv', file=path, stderr=err)
+            with open(path, newline='') as fh:
+                rows = list(csv.DictReader(fh))
+        self.assertEqual([row['question_id'] for row in rows], [str(self.questions[1].id)])
+        self.assertIn(f'next --after-id {rows[0]["id"]}', err.getvalue())
+
+        out = io.StringIO()
+        call_command('export_forum', 'questions', after_id=self.questions[3].id, stdout=out, stderr=io.StringIO())
+        self.assertEqual([json.loads(line)['id'] for line in out.getvalue().splitlines()], [self.questions[4].id])
+
+    def test_management_command_rejects_impossible_since(self):
+        with self.assertRaisesMessage(CommandError, '--since'):
+            call_command('export_forum', 'likes', since='2024-02-30', stdout=io.StringIO(), stderr=io.StringIO())
@@ -0,0 +1,120 @@
+import json
+import re
+import time
+from unittest import mock, skipIf
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from django.contrib.auth.models import User
+from forum_app.api.caching import response_cache
+from forum_app.api.fastpath import RowSerializer
+from forum_app.api.renderers import FastJSONRenderer, orjson
+from forum_app.api.serializers import QuestionSerializer, AnswerSerializer
+from forum_app.api.throttling import clear_throttles
+from forum_app.models import Question, Answer, Like
+
+
+class FastPathSchemaTest(APITestCase):
+    """Der values()-Pfad muss byte-genau dasselbe liefern wie die Serializer."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        other = User.objects.create_user(username='other', password='password')
+        for i in range(5):
+            question = Question.objects.create(title=f'Frage {i}  ', content=f'Inhalt {i} äöü',
+                                               author=self.user, category='backend' if i % 2 else 'frontend')
+            for j, author in enumerate([self.user, other][:i % 3]):
+                Answer.objects.create(question=question, content=f'Antwort {i}/{j}', author=author)
+            if i % 2:
+                Like.objects.create(question=question, user=other)
+        Question.objects.create(title='Leer', content='', author=self.user, category='backend')
+
+    def get(self, url, params=None):
+        clear_throttles()
+        response_cache.clear()
+        response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def assertSameAsSerializers(self, url, params=None):
+        fast = self.get(url, params)
+        with override_settings(FORUM_FAST_PATH={'ENABLED': False}):
+            slow = self.get(url, params)
+        self.assertEqual(fast.content, slow.content, params)
+        # Folgeseiten ebenfalls vergleichen.
+        if isinstance(slow.data, dict) and slow.data.get('next'):
+            self.assertSameAsSerializers(slow.data['next'])
+
+    def test_question_list(self):
+        url = reverse('question-list')
+        for params in [None, {'expand': 'answers,likes'}, {'expand': 'answers', 'fields': 'id,title'},
+                       {'fields': 'created_at,author'}, {'page_size': 2, 'expand': 'likes'},
+                       {'category': 'backend', 'page_size': 1}]:
+            self.assertSameAsSerializers(url, params)
+
+    def test_hot_and_feed(self):
+        self.assertSameAsSerializers(reverse('question-hot'), {'page_size': 2, 'expand': 'answers'})
+        self.assertSameAsSerializers(reverse('question-feed', kwargs={'category': 'backend'}), {'page_size': 2})
+
+    def test_answer_list(self):
+        url = reverse('answer-list-create')
+        for params in [None, {'ordering': '-author__username'}, {'page_size': 2},
+                       {'page_size': 2, 'ordering': '-content', 'fields': 'id,content'},
+                       {'author': 'other', 'count': 'approx', 'page_size': 1}]:
+            self.assertSameAsSerializers(url, params)
+
+    def test_fields_match_serializers(self):
+        response = self.get(reverse('question-list'), {'expand': 'answers,likes'})
+        question = next(item for item in response.data if item['answers'])
+        self.assertEqual(list(question), list(QuestionSerializer().fields))
+        self.assertEqual(list(question['answers'][0]), list(AnswerSerializer().fields))
+
+    def test_list_skips_serializers(self):
+        with mock.patch.object(QuestionSerializer, 'to_representation') as to_representation:
+            self.get(reverse('question-list'), {'expand': 'answers'})
+        to_representation.assert_not_called()
+
+    @override_settings(FORUM_INSTRUMENTATION={'ENABLED': True, 'SAMPLE_RATE': 1.0, 'SERVER_TIMING': True})
+    def test_list_reports_serializer_time(self):
+        format_rows = RowSerializer._format
+
+        def slow(row_serializer, *args):
+            time.sleep(0.01)
+            return format_rows(row_serializer, *args)
+
+        with mock.patch.object(RowSerializer, '_format', slow):
+            response = self.get(reverse('question-list'))
+        serializer_ms = float(re.search(r'serializer;dur=([\d.]+)', response['Server-Timing']).group(1))
+        self.assertGreaterEqual(serializer_ms, 10)
+
+
+class FastJSONRendererTest(SimpleTestCase):
+    def test_same_bytes_as_json_renderer(self):
+        data = {'text': 'äöü \u2028\u2029 "x"', 'when': timezone.now(), 'items': [1, 2.5, None, True],
+                'nested': {'empty': [], 1: 'int key'}}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_floats_keep_their_value_but_not_their_spelling(self):
+        data = {'rank': -1.375e-6, 'big': 1e16}
+        fast = FastJSONRenderer().render(data)
+        self.assertEqual(json.loads(fast), data)
+        if orjson is not None:
+            self.assertEqual(fast, b'{"rank":-1.375e-6,"big":1e16}')
+        self.assertEqual(JSONRenderer().render(data), b'{"rank":-1.375e-06,"big":1e+16}')
+
+    @skipIf(orjson is None, 'orjson is not installed')
+    def test_non_finite_floats_become_null(self):
+        self.assertEqual(FastJSONRenderer().render({'rank': float('nan'), 'max': float('inf')}),
+                         b'{"rank":null,"max":null}')
+        with self.assertRaises(ValueError):
+            JSONRenderer().render({'rank': float('nan')})
+
+    def test_indent_falls_back(self):
+        rendered = FastJSONRenderer().render({'a': 1}, 'application/json; indent=2')
+        self.assertEqual(rendered, JSONRenderer().render({'a': 1}, 'application/json; indent=2'))
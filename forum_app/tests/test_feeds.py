@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from django.contrib.auth.models import User
+from forum_app.models import Question
+
+
+class CategoryFeedTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        now = timezone.now()
+        self.backend = []
+        for i, category in enumerate(['backend', 'frontend', 'backend', 'backend']):
+            question = Question.objects.create(title=f'Question {i}', content='Content', author=self.user,
+                                               category=category)
+            Question.objects.filter(pk=question.pk).update(created_at=now - timedelta(minutes=10 - i))
+            if category == 'backend':
+                self.backend.append(question.id)
+
+    def test_feed_is_newest_first_and_paginated(self):
+        url = reverse('question-feed', kwargs={'category': 'backend'})
+        response = self.client.get(url, {'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in response.data['results']], self.backend[::-1][:2])
+        self.assertNotIn('answers', response.data['results'][0])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual([item['id'] for item in response.data['results']], [self.backend[0]])
+        self.assertIsNone(response.data['next'])
+
+    def test_unknown_category_is_not_found(self):
+        response = self.client.get(reverse('question-feed', kwargs={'category': 'unknown'}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_category_filter(self):
+        response = self.client.get(reverse('question-list'), {'category': 'backend'})
+        self.assertEqual([item['id'] for item in response.data], self.backend)
+        response = self.client.get(reverse('question-list'), {'category': 'unknown'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,105 @@
+import io
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase
+from django.utils import timezone
+
+from django.contrib.auth.models import User
+from forum_app import search
+from forum_app.management.commands.generate_forum_data import deferred_indexes
+from forum_app.models import Question, Answer, Like
+
+
+class GenerateForumDataTest(TestCase):
+    OPTIONS = dict(users=30, questions=120, answers=300, likes=400, batch_size=50, seed=7)
+
+    def generate(self, **overrides):
+        call_command('generate_forum_data', stdout=io.StringIO(), **{**self.OPTIONS, **overrides})
+
+    def snapshot(self):
+        return (
+            list(Question.objects.order_by('id').values_list('title', 'author__username', 'category', 'created_at')),
+            list(Answer.objects.order_by('id').values_list('question__title', 'author__username', 'created_at')),
+            sorted(Like.objects.values_list('user__username', 'question_id')),
+        )
+
+    def test_rerun_is_idempotent(self):
+        self.generate()
+        first = self.snapshot()
+        self.assertEqual(User.objects.count(), 30)
+        self.assertEqual(len(first[0]), 120)
+        self.assertEqual(len(first[1]), 300)
+        self.assertTrue(0 < len(first[2]) <= 400)
+
+        self.generate()
+        self.assertEqual(self.snapshot(), first)
+
+    def test_resume_matches_single_run(self):
+        self.generate(questions=70, answers=0, likes=0)
+        self.generate(answers=0, likes=0)
+        resumed = self.snapshot()[0]
+        Question.objects.all().delete()
+        self.generate(answers=0, likes=0)
+        self.assertEqual([row[:3] for row in self.snapshot()[0]], [row[:3] for row in resumed])
+
+    def test_same_seed_gives_identical_rows_at_any_time(self):
+        def rows():
+            return (
+                list(User.objects.order_by('username').values_list('username', 'password', 'date_joined')),
+                *self.snapshot()[:2],
+                sorted(Like.objects.values_list('user__username', 'question__title', 'created_at')),
+            )
+
+        self.generate()
+        first = rows()
+        User.objects.all().delete()
+        with mock.patch('django.utils.timezone.now', return_value=timezone.now() + timedelta(days=3)):
+            self.generate()
+        self.assertEqual(rows(), first)
+
+    def test_invalid_end_is_rejected(self):
+        with self.assertRaisesMessage(CommandError, '--end'):
+            self.generate(end='2024-13-01T00:00:00')
+
+    def test_derived_data_is_consistent(self):
+        self.generate()
+        question = Question.objects.order_by('-answer_count').first()
+        self.assertEqual(question.answer_count, question.answers.count())
+        self.assertEqual(question.like_count, question.likes.count())
+        self.assertTrue(search.search(question.title.split()[0]))
+
+    def test_popularity_is_skewed(self):
+        self.generate()
+        counts = sorted(Question.objects.values_list('answer_count', flat=True), reverse=True)
+        top_decile = sum(counts[:len(counts) // 10])
+        self.assertGreater(top_decile, sum(counts) * 0.3)
+
+    def test_likes_follow_their_question(self):
+        self.generate()
+        self.assertFalse(Like.objects.filter(created_at__lt=F('question__created_at')).exists())
+
+    def test_interrupted_run_leaves_restorable_indexes(self):
+        def interrupted():
+            with deferred_indexes(Answer, True):
+                raise KeyboardInterrupt
+        # Ein harter Abbruch überspringt das Wiederanlegen.
+        with mock.patch('forum_app.management.commands.generate_forum_data.restore_indexes'):
+            with self.assertRaises(KeyboardInterrupt):
+                interrupted()
+        self.assertNotIn('answer_author_content_idx', self.index_names())
+
+        out = io.StringIO()
+        call_command('generate_forum_data', restore_indexes=True, stdout=out)
+        self.assertIn('answer_author_content_idx', out.getvalue())
+        self.assertIn('answer_author_content_idx', self.index_names())
+        self.assertEqual(Answer.objects.count(), 0)
+
+    def index_names(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'forum_app_answer'")
+            return {name for name, in cursor.fetchall()}
@@ -0,0 +1,111 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from django.contrib.auth.models import User
+from forum_app.api.caching import response_cache
+from forum_app.api.instrumentation import RequestProfile, metrics
+from forum_app.models import Question, Answer
+
+INSTRUMENTATION = {'ENABLED': True, 'SAMPLE_RATE': 1.0, 'SERVER_TIMING': True,
+                   'DUPLICATE_QUERY_THRESHOLD': 3}
+
+
+@override_settings(FORUM_INSTRUMENTATION=INSTRUMENTATION)
+class InstrumentationMiddlewareTest(APITestCase):
+    def setUp(self):
+        metrics.reset()
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.admin = User.objects.create_superuser(username='admin', password='password')
+        self.question = Question.objects.create(title='Question', content='Content', author=self.user)
+        Answer.objects.create(question=self.question, author=self.user, content='Answer')
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse('question-detail', kwargs={'pk': self.question.id}))
+        timing = response['Server-Timing']
+        for metric in ('db;dur=', 'serializer;dur=', 'view;dur=', 'total;dur='):
+            self.assertIn(metric, timing)
+        self.assertRegex(timing, r'desc="[1-9]\d* queries"')
+
+    def test_metrics_are_aggregated_per_route(self):
+        self.client.get(reverse('question-detail', kwargs={'pk': self.question.id}))
+        self.client.get(reverse('question-detail', kwargs={'pk': self.question.id}))
+        self.client.get(reverse('answer-list-create'))
+
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        routes = {(entry['method'], entry['route']): entry for entry in response.data['routes']}
+        detail = routes[('GET', 'question-detail')]
+        self.assertEqual(detail['count'], 2)
+        self.assertEqual(sum(detail['histogram_ms'].values()), 2)
+        self.assertGreater(detail['mean_queries'], 0)
+        self.assertIn(('GET', 'answer-list-create'), routes)
+
+    def test_metrics_include_response_cache_hits(self):
+        detail = reverse('question-detail', kwargs={'pk': self.question.id})
+        self.client.get(detail)
+        self.client.get(detail)
+
+        self.client.force_authenticate(self.admin)
+        stats = self.client.get(reverse('metrics')).data['response_cache']
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertGreater(stats['entries'], 0)
+
+        self.client.delete(reverse('metrics'))
+        stats = self.client.get(reverse('metrics')).data['response_cache']
+        self.assertEqual((stats['hits'], stats['misses']), (0, 0))
+
+    def test_metrics_endpoint_is_admin_only(self):
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_non_api_views_are_not_recorded(self):
+        self.client.get('/admin/login/')
+        self.assertEqual(metrics.snapshot(), [])
+
+    @override_settings(FORUM_INSTRUMENTATION={**INSTRUMENTATION, 'SAMPLE_RATE': 0.0})
+    def test_unsampled_requests_are_not_measured(self):
+        response = self.client.get(reverse('question-list'))
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(metrics.snapshot(), [])
+
+
+class RequestProfileTest(TestCase):
+    def test_repeated_statements_are_flagged(self):
+        user = User.objects.create_user(username='testuser', password='password')
+        questions = [Question.objects.create(title=f'Q{i}', content='C', author=user) for i in range(4)]
+        profile = RequestProfile()
+        with connection.execute_wrapper(profile):
+            for question in questions:
+                Question.objects.get(pk=question.pk)
+            list(Question.objects.filter(pk__in=[q.pk for q in questions[:2]]))
+            list(Question.objects.filter(pk__in=[q.pk for q in questions]))
+
+        self.assertEqual(profile.queries, 6)
+        duplicates = profile.duplicates(threshold=3)
+        self.assertEqual(list(duplicates.values()), [4])
+        # IN-Listen unterschiedlicher Länge zählen als dasselbe Statement.
+        self.assertEqual(len(profile.statements), 2)
+
+
+@override_settings(FORUM_INSTRUMENTATION=INSTRUMENTATION)
+class AsyncInstrumentationTest(TestCase):
+    """Unter ASGI (async Middleware) zählen die Queries ebenso."""
+
+    def setUp(self):
+        metrics.reset()
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.question = Question.objects.create(title='Question', content='Content', author=self.user)
+
+    async def test_sync_and_async_views_report_queries(self):
+        for name in ('question-detail', 'async-question-detail'):
+            with self.subTest(view=name):
+                response = await self.async_client.get(reverse(name, kwargs={'pk': self.question.id}))
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertRegex(response['Server-Timing'], r'desc="[1-9]\d* queries"')
+        routes = {entry['route']: entry for entry in metrics.snapshot()}
+        self.assertGreater(routes['question-detail']['max_queries'], 0)
+        self.assertGreater(routes['async-question-detail']['max_queries'], 0)
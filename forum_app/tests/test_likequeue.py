@@ -0,0 +1,127 @@
+import io
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from django.contrib.auth.models import User
+from forum_app import likequeue
+from forum_app.models import Question, Like
+
+
+class LikeQueueTest(APITestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(FORUM_LIKE_QUEUE={
+            'ENABLED': True, 'PATH': Path(directory.name) / 'queue.sqlite3', 'SYNCHRONOUS': 'NORMAL'})
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.addCleanup(likequeue.close)
+
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.questions = [Question.objects.create(title=f'Question {i}', content='Content', author=self.user)
+                          for i in range(3)]
+        self.client.force_authenticate(self.user)
+
+    def like_count(self, question):
+        return Question.objects.get(pk=question.pk).like_count
+
+    def pending(self):
+        response = self.client.get(reverse('like-pending'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(item['question'], item['action']) for item in response.data['results']]
+
+    def test_like_is_acknowledged_and_applied_by_worker(self):
+        question = self.questions[0]
+        response = self.client.post(reverse('like-list'), {'question': question.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data, {'question': question.id, 'status': 'queued', 'action': 'like'})
+        self.assertFalse(Like.objects.exists())
+        self.assertEqual(self.pending(), [(question.id, 'like')])
+
+        self.assertEqual(likequeue.process_batch(), 1)
+        self.assertTrue(Like.objects.filter(user=self.user, question=question).exists())
+        self.assertEqual(self.like_count(question), 1)
+        self.assertEqual(self.pending(), [])
+        self.assertEqual(likequeue.process_batch(), 0)
+
+    def test_last_action_per_question_wins(self):
+        first, second, _ = self.questions
+        for _ in range(3):
+            self.client.post(reverse('like-list'), {'question': first.id}, format='json')
+        self.client.post(reverse('like-list'), {'question': second.id}, format='json')
+        self.client.delete(reverse('like-bulk'), {'questions': [second.id]}, format='json')
+        self.assertEqual(sorted(self.pending()), [(first.id, 'like'), (second.id, 'unlike')])
+
+        likequeue.process_batch()
+        self.assertEqual(list(Like.objects.values_list('question_id', flat=True)), [first.id])
+        self.assertEqual((self.like_count(first), self.like_count(second)), (1, 0))
+
+    def test_replayed_entries_are_idempotent(self):
+        question = self.questions[0]
+        likequeue.enqueue(self.user.pk, [question.id], likequeue.LIKE)
+        likequeue.process_batch()
+        likequeue.enqueue(self.user.pk, [question.id], likequeue.LIKE)
+        likequeue.process_batch()
+        self.assertEqual(Like.objects.count(), 1)
+        self.assertEqual(self.like_count(question), 1)
+
+    def test_unlike_via_destroy(self):
+        question = self.questions[0]
+        like = Like.objects.create(user=self.user, question=question)
+        Question.objects.filter(pk=question.pk).update(like_count=1)
+
+        response = self.client.delete(reverse('like-detail', kwargs={'pk': like.pk}))
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertTrue(Like.objects.filter(pk=like.pk).exists())
+        likequeue.process_batch()
+        self.assertFalse(Like.objects.filter(pk=like.pk).exists())
+        self.assertEqual(self.like_count(question), 0)
+
+    def test_bulk_drops_missing_questions(self):
+        deleted = self.questions[2]
+        response = self.client.post(reverse('like-bulk'),
+                                    {'questions': [self.questions[0].id, deleted.id, 999]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        deleted.delete()
+        likequeue.process_batch()
+        self.assertEqual(list(Like.objects.values_list('question_id', flat=True)), [self.questions[0].id])
+        self.assertEqual(likequeue.backlog(), 0)
+
+    def test_changes_during_processing_stay_queued(self):
+        question = self.questions[0]
+        likequeue.enqueue(self.user.pk, [question.id], likequeue.LIKE)
+        apply_likes = likequeue._apply_likes
+
+        def like_then_unlike(pairs):
+            # Während der Worker überträgt, nimmt der User den Like schon wieder zurück.
+            likequeue.enqueue(self.user.pk, [question.id], likequeue.UNLIKE)
+            return apply_likes(pairs)
+
+        with mock.patch.object(likequeue, '_apply_likes', like_then_unlike):
+            likequeue.process_batch()
+        self.assertEqual(self.pending(), [(question.id, 'unlike')])
+        likequeue.process_batch()
+        self.assertFalse(Like.objects.exists())
+
+    def test_worker_command_drains_in_batches(self):
+        other = User.objects.create_user(username='other', password='password')
+        for user in (self.user, other):
+            likequeue.enqueue(user.pk, [q.id for q in self.questions], likequeue.LIKE)
+        out = io.StringIO()
+        call_command('process_like_queue', batch_size=4, stdout=out)
+        self.assertIn('Processed 6 queued likes', out.getvalue())
+        self.assertEqual(Like.objects.count(), 6)
+        self.assertEqual([self.like_count(q) for q in self.questions], [2, 2, 2])
+
+    @override_settings(FORUM_LIKE_QUEUE={'ENABLED': False})
+    def test_disabled_writes_synchronously(self):
+        response = self.client.post(reverse('like-list'), {'question': self.questions[0].id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.pending(), [])
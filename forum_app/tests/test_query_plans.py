@@ -0,0 +1,137 @@
+import random
+import re
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from django.contrib.auth.models import User
+from forum_app.api.caching import response_cache
+from forum_app.models import Question, Answer, Like
+
+# "SCAN <tabelle>" ohne Index ist ein Full Table Scan. Erlaubt sind SEARCH,
+# SCAN ... USING [COVERING] INDEX, die FTS5-Tabellen (VIRTUAL TABLE) und das
+# Durchlaufen einer per LIMIT begrenzten Unterabfrage ("SCAN subquery").
+FULL_SCAN_RE = re.compile(r'^SCAN (?!subquery$)(\w+)(?: AS \w+)?$')
+
+
+class QueryPlanTest(APITestCase):
+    """
+    Führt die API-Endpunkte gegen eine größere Datenbank aus und prüft per
+    EXPLAIN QUERY PLAN, dass keine der ausgeführten Queries die Tabelle
+    komplett durchläuft. Ungefilterte Komplettlisten ohne Pagination (z.B.
+    GET /likes/) lesen per Definition alle Zeilen und sind nicht Teil der Suite.
+    """
+    USERS = 200
+    QUESTIONS = 2000
+    ANSWERS = 6000
+    LIKES = 6000
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(42)
+        categories = [choice[0] for choice in Question.CATEGORY_CHOICES]
+        User.objects.bulk_create(User(username=f'user{i}') for i in range(cls.USERS))
+        user_ids = list(User.objects.values_list('id', flat=True))
+        Question.objects.bulk_create(
+            Question(title=f'Question {i}', content=f'Content {i}', author_id=rng.choice(user_ids),
+                     category=rng.choice(categories))
+            for i in range(cls.QUESTIONS))
+        question_ids = list(Question.objects.values_list('id', flat=True))
+        Answer.objects.bulk_create(
+            Answer(content=f'Answer {rng.random()}', author_id=rng.choice(user_ids),
+                   question_id=rng.choice(question_ids))
+            for _ in range(cls.ANSWERS))
+        pairs = {(rng.choice(user_ids), rng.choice(question_ids)) for _ in range(cls.LIKES)}
+        Like.objects.bulk_create(Like(user_id=u, question_id=q) for u, q in pairs)
+        cls.user = User.objects.get(username='user0')
+        cls.question_id = question_ids[len(question_ids) // 2]
+        cls.answer_id = Answer.objects.values_list('id', flat=True).first()
+        cls.like_id = Like.objects.values_list('id', flat=True).first()
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertNoFullScans(self, method, url, data=None):
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(self.client, method)(url, data, format='json')
+        self.assertLess(response.status_code, 400, response.content)
+        for query in ctx.captured_queries:
+            sql = query['sql']
+            if not sql.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE')):
+                continue
+            plan = self.explain(sql)
+            scans = [line for line in plan if FULL_SCAN_RE.match(line)]
+            self.assertEqual(scans, [], f'{method.upper()} {url}\n{sql}\n' + '\n'.join(plan))
+
+    def test_question_list_pages(self):
+        url = reverse('question-list') + '?page_size=20&expand=answers,likes'
+        self.assertNoFullScans('get', url)
+        next_url = self.client.get(url).data['next']
+        self.assertNoFullScans('get', next_url)
+
+    def test_question_detail(self):
+        self.assertNoFullScans('get', reverse('question-detail', kwargs={'pk': self.question_id}))
+
+    def test_answer_list_orderings(self):
+        url = reverse('answer-list-create')
+        self.assertNoFullScans('get', url)
+        self.assertNoFullScans('get', url + '?ordering=-content')
+        self.assertNoFullScans('get', url + '?author=user1')
+        self.assertNoFullScans('get', url + '?author__username=user1&ordering=content')
+        self.assertNoFullScans('get', url + '?ordering=author__username')
+
+    def test_answer_keyset_pages(self):
+        for ordering in ('content', '-content', 'author__username'):
+            url = reverse('answer-list-create') + f'?page_size=20&ordering={ordering}'
+            self.assertNoFullScans('get', url)
+            next_url = self.client.get(url).data['next']
+            self.assertNoFullScans('get', next_url)
+
+    def test_answer_search(self):
+        self.assertNoFullScans('get', reverse('answer-list-create') + '?search=answer')
+        self.assertNoFullScans('get', reverse('search') + '?q=question')
+
+    def test_answer_detail_and_update(self):
+        answer = Answer.objects.get(pk=self.answer_id)
+        self.client.force_authenticate(user=answer.author)
+        url = reverse('answer-detail', args=[answer.id])
+        self.assertNoFullScans('get', url)
+        self.assertNoFullScans('patch', url, {'content': 'Updated'})
+
+    def test_like_create_and_delete(self):
+        question = Question.objects.exclude(likes__user=self.user).first()
+        self.assertNoFullScans('post', reverse('like-list'), {'question': question.id})
+        like = Like.objects.get(user=self.user, question=question)
+        self.assertNoFullScans('delete', reverse('like-detail', kwargs={'pk': like.id}))
+
+    def test_hot_questions_use_index_order(self):
+        for url in (reverse('question-hot'), reverse('question-hot') + '?category=backend'):
+            self.assertNoFullScans('get', url)
+            response_cache.clear()
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.get(url)
+            plan = '\n'.join(self.explain(ctx.captured_queries[0]['sql']))
+            self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_category_feed_pages(self):
+        url = reverse('question-feed', kwargs={'category': 'backend'}) + '?page_size=20'
+        self.assertNoFullScans('get', url)
+        next_url = self.client.get(url).data['next']
+        self.assertNoFullScans('get', next_url)
+        response_cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url)
+        self.assertNotIn('TEMP B-TREE', '\n'.join(self.explain(ctx.captured_queries[0]['sql'])))
+        self.assertNoFullScans('get', reverse('question-list') + '?category=backend&page_size=20')
+
+    def test_admin_category_filter(self):
+        admin = User.objects.create_superuser(username='admin', password='password')
+        self.client.force_login(admin)
+        self.assertNoFullScans('get', reverse('admin:forum_app_question_changelist') + '?category__exact=backend')
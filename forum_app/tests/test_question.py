@@ -0,0 +1,65 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from django.contrib.auth.models import User
+from forum_app.models import Question, Answer, Like
+from forum_app.counters import rebuild_question_counters
+
+
+class QuestionListPaginationTest(APITestCase):
+    def setUp(self):
+        self.users = [User.objects.create_user(username=f'user{i}', password='password') for i in range(3)]
+        for i in range(7):
+            question = Question.objects.create(
+                title=f'Question {i}', content='Content', author=self.users[i % 3])
+            for user in self.users:
+                Answer.objects.create(content=f'Answer {i}', author=user, question=question)
+                Like.objects.create(user=user, question=question)
+        # Direkt über das ORM angelegt, daher Zähler einmal aus den Zeilen berechnen.
+        rebuild_question_counters()
+
+    def test_list_without_cursor_is_unpaginated(self):
+        response = self.client.get(reverse('question-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 7)
+
+    def test_cursor_pages_cover_all_questions_in_order(self):
+        url = reverse('question-list') + '?page_size=3'
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [item['id'] for item in response.data['results']]
+            url = response.data['next']
+        expected = list(Question.objects.order_by('created_at', 'id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_query_count_is_constant_per_page(self):
+        # 1 Query für die Seite + 1 für Antworten + 1 für Likes, egal wie groß die Seite ist.
+        for page_size in (1, 3, 7):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(
+                    reverse('question-list') + f'?page_size={page_size}&expand=answers,likes')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data['results']), page_size)
+            self.assertEqual(len(ctx.captured_queries), 3, [q['sql'] for q in ctx.captured_queries])
+
+    def test_list_without_expand_uses_single_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('question-list') + '?page_size=5')
+        self.assertEqual(len(ctx.captured_queries), 1)
+        item = response.data['results'][0]
+        self.assertNotIn('answers', item)
+        self.assertNotIn('likes', item)
+        self.assertEqual(item['like_count'], 3)
+        self.assertEqual(item['answer_count'], 3)
+
+    def test_detail_includes_nested_lists(self):
+        question = Question.objects.first()
+        response = self.client.get(reverse('question-detail', kwargs={'pk': question.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['answers']), 3)
+        self.assertEqual(len(response.data['likes']), 3)
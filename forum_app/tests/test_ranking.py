@@ -0,0 +1,125 @@
+import io
+
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from django.contrib.auth.models import User
+from forum_app import ranking
+from forum_app.models import Question, Like
+
+
+class HotScoreTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.other = User.objects.create_user(username='other', password='password')
+        self.question = Question.objects.create(title='Question', content='Content', author=self.user)
+        self.second = Question.objects.create(title='Second', content='Content', author=self.user)
+        self.client.force_authenticate(user=self.user)
+
+    def scores(self):
+        return dict(Question.objects.values_list('id', 'hot_score'))
+
+    def assertMatchesRebuild(self):
+        incremental = self.scores()
+        ranking.rebuild_hot_scores()
+        for question_id, score in self.scores().items():
+            self.assertAlmostEqual(incremental[question_id], score, places=6)
+
+    def test_new_question_starts_with_own_score(self):
+        self.assertAlmostEqual(self.question.hot_score, ranking.question_score(self.question.created_at), places=4)
+        self.assertGreater(self.second.hot_score, self.question.hot_score)
+
+    def test_likes_and_answers_update_incrementally(self):
+        self.client.post(reverse('like-list'), {'question': self.question.id}, format='json')
+        self.client.post(reverse('answer-list-create'),
+                         {'question': self.question.id, 'content': 'A', 'author': self.user.id}, format='json')
+        self.client.force_authenticate(user=self.other)
+        self.client.post(reverse('like-list'), {'question': self.question.id}, format='json')
+
+        self.assertGreater(self.scores()[self.question.id], self.scores()[self.second.id])
+        self.assertMatchesRebuild()
+
+    def test_deletes_and_moves_are_reverted(self):
+        like = self.client.post(reverse('like-list'), {'question': self.question.id}, format='json').data
+        answer = self.client.post(reverse('answer-list-create'),
+                                  {'question': self.question.id, 'content': 'A', 'author': self.user.id}, format='json').data
+        self.client.patch(reverse('answer-detail', args=[answer['id']]), {'question': self.second.id}, format='json')
+        self.assertMatchesRebuild()
+
+        self.client.delete(reverse('like-detail', kwargs={'pk': like['id']}))
+        self.client.delete(reverse('answer-detail', args=[answer['id']]))
+        self.assertMatchesRebuild()
+
+    def test_bulk_endpoints_update_scores(self):
+        self.client.post(reverse('like-bulk'), {'questions': [self.question.id, self.second.id]}, format='json')
+        self.client.post(reverse('answer-bulk-create'),
+                         [{'question': self.second.id, 'content': 'A'}, {'question': self.second.id, 'content': 'B'}],
+                         format='json')
+        self.assertMatchesRebuild()
+
+        self.client.delete(reverse('like-bulk'), {'questions': [self.question.id]}, format='json')
+        self.assertMatchesRebuild()
+
+    def test_recent_activity_outranks_old_activity(self):
+        old = self.question.created_at - timedelta(days=7)
+        Question.objects.filter(pk=self.question.pk).update(created_at=old)
+        Like.objects.create(user=self.other, question=self.question)
+        Like.objects.filter(question=self.question).update(created_at=old)
+        ranking.rebuild_hot_scores()
+        scores = self.scores()
+        self.assertGreater(scores[self.second.id], scores[self.question.id])
+
+    def test_rebuild_command(self):
+        Question.objects.update(hot_score=0)
+        call_command('rebuild_hot_scores', stdout=io.StringIO())
+        self.assertAlmostEqual(self.scores()[self.question.id],
+                               ranking.question_score(self.question.created_at), places=4)
+
+
+class HotQuestionEndpointTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        now = timezone.now()
+        self.questions = []
+        for i, category in enumerate(['frontend', 'backend', 'backend', 'devops']):
+            question = Question.objects.create(title=f'Question {i}', content='Content', author=self.user,
+                                               category=category)
+            Question.objects.filter(pk=question.pk).update(
+                hot_score=ranking.question_score(now - timedelta(hours=i)))
+            self.questions.append(question)
+        self.url = reverse('question-hot')
+
+    def test_hot_orders_by_score_and_is_public(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in response.data['results']], [q.id for q in self.questions])
+        self.assertNotIn('answers', response.data['results'][0])
+
+    def test_category_filter(self):
+        response = self.client.get(self.url, {'category': 'backend'})
+        self.assertEqual([item['id'] for item in response.data['results']],
+                         [self.questions[1].id, self.questions[2].id])
+        response = self.client.get(self.url, {'category': 'unknown'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cursor_pagination(self):
+        response = self.client.get(self.url, {'page_size': 3})
+        self.assertEqual(len(response.data['results']), 3)
+        response = self.client.get(response.data['next'])
+        self.assertEqual([item['id'] for item in response.data['results']], [self.questions[3].id])
+        self.assertIsNone(response.data['next'])
+
+    def test_new_like_invalidates_cached_ranking(self):
+        self.client.get(self.url)
+        for name in ('a', 'b', 'c'):
+            user = User.objects.create_user(username=name, password='password')
+            self.client.force_authenticate(user=user)
+            self.client.post(reverse('like-list'), {'question': self.questions[3].id}, format='json')
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['results'][0]['id'], self.questions[3].id)
@@ -0,0 +1,100 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from django.contrib.auth.models import User
+from forum_app.models import Question
+from forum_app.replicas import ReplicaRouter
+
+# Die Tests laufen in einem Prozess; der LocMemCache reicht für die Bindung.
+REPLICAS = {'DATABASES': ['replica'], 'PIN_SECONDS': 5, 'CACHE': 'default', 'ALLOW_LOCAL_CACHE': True}
+
+
+@override_settings(FORUM_REPLICAS=REPLICAS)
+class ReadReplicaTest(TransactionTestCase):
+    # 'replica' spiegelt in Tests die Testdatenbank, hat aber eine eigene Verbindung.
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='writer', password='password')
+        self.reader = User.objects.create_user(username='reader', password='password')
+        self.question = Question.objects.create(title='Question', content='Content', author=self.user)
+        self.writer_client = self.client_for(self.user)
+        self.reader_client = self.client_for(self.reader)
+
+    def client_for(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+        return client
+
+    def queries(self, client, method, url, data=None):
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            response = getattr(client, method)(url, data, format='json')
+        self.assertLess(response.status_code, 400, response.content)
+        return len(primary), len(replica)
+
+    def test_safe_requests_read_from_replica(self):
+        primary, replica = self.queries(self.reader_client, 'get', reverse('question-list'))
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+        primary, replica = self.queries(self.reader_client, 'get', reverse('answer-list-create'))
+        self.assertEqual(primary, 0)
+
+    def test_writes_pin_the_writer_to_the_primary(self):
+        primary, replica = self.queries(self.writer_client, 'post', reverse('like-list'),
+                                        {'question': self.question.id})
+        self.assertEqual(replica, 0)
+
+        detail = reverse('question-detail', kwargs={'pk': self.question.id})
+        primary, replica = self.queries(self.writer_client, 'get', detail)
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+        # Andere Clients lesen weiter vom Replikat.
+        primary, replica = self.queries(self.reader_client, 'get', detail)
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    def test_replica_reads_do_not_fill_the_response_cache(self):
+        detail = reverse('question-detail', kwargs={'pk': self.question.id})
+        self.writer_client.post(reverse('like-list'), {'question': self.question.id}, format='json')
+        # Der Leser landet nach dem Schreibzugriff auf dem (womöglich nachhängenden) Replikat.
+        response = self.reader_client.get(detail)
+        self.assertEqual(response['X-Cache'], 'BYPASS')
+        self.assertNotIn('ETag', response)
+
+        # Der Writer liest also nicht den Stand des Replikats aus dem Cache, sondern den Primary.
+        with CaptureQueriesContext(connections['default']) as primary:
+            response = self.writer_client.get(detail)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertGreater(len(primary), 0)
+        self.assertEqual(response.data['like_count'], 1)
+        # Aus dem Primary gefüllte Einträge bekommen auch Leser auf dem Replikat.
+        self.assertEqual(self.reader_client.get(detail)['X-Cache'], 'HIT')
+
+    def test_views_without_replica_flag_use_primary(self):
+        primary, replica = self.queries(self.reader_client, 'get', reverse('like-list'))
+        self.assertEqual(replica, 0)
+
+    def test_router_keeps_schema_and_writes_on_primary(self):
+        router = ReplicaRouter()
+        self.assertFalse(router.allow_migrate('replica', 'forum_app'))
+        self.assertIsNone(router.allow_migrate('default', 'forum_app'))
+        self.assertEqual(router.db_for_write(Question), 'default')
+        self.assertIsNone(router.db_for_read(Question))
+
+    @override_settings(FORUM_INSTRUMENTATION={'ENABLED': True, 'SAMPLE_RATE': 1.0, 'SERVER_TIMING': True})
+    def test_instrumentation_counts_replica_queries(self):
+        with CaptureQueriesContext(connections['replica']) as replica:
+            response = self.reader_client.get(reverse('question-list'))
+        self.assertGreater(len(replica), 0)
+        self.assertIn(f'desc="{len(replica)} queries"', response['Server-Timing'])
+
+    @override_settings(FORUM_REPLICAS={**REPLICAS, 'ALLOW_LOCAL_CACHE': False})
+    def test_process_local_pin_cache_is_rejected(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, 'process-local'):
+            self.reader_client.get(reverse('question-list'))
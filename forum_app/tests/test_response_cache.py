@@ -0,0 +1,121 @@
+import os
+import stat
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import parse_http_date
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from django.contrib.auth.models import User
+from forum_app.api.caching import response_cache, LocMemLRUBackend, FileLRUBackend
+from forum_app.models import Question, Answer, Like
+
+
+class ResponseCacheTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.question = Question.objects.create(title='Question', content='Content', author=self.user)
+        self.other = Question.objects.create(title='Other', content='Content', author=self.user)
+        self.detail_url = reverse('question-detail', kwargs={'pk': self.question.id})
+        self.other_url = reverse('question-detail', kwargs={'pk': self.other.id})
+
+    def test_second_read_is_served_from_cache(self):
+        first = self.client.get(self.detail_url)
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.client.get(self.detail_url)
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(response_cache.stats()['hits'], 1)
+
+    def test_conditional_requests_return_304(self):
+        first = self.client.get(self.detail_url)
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_if_modified_since_sees_writes_within_the_same_second(self):
+        with mock.patch('forum_app.api.caching.time') as clock:
+            clock.time_ns.return_value = 100_200_000_000
+            response_cache.bump(f'question:{self.question.id}')
+            # Innerhalb der Sekunde der letzten Änderung gibt es kein Last-Modified.
+            clock.time_ns.return_value = 100_300_000_000
+            self.assertNotIn('Last-Modified', self.client.get(self.detail_url))
+
+            clock.time_ns.return_value = 101_500_000_000
+            last_modified = self.client.get(self.detail_url)['Last-Modified']
+            self.assertEqual(parse_http_date(last_modified), 101)
+            response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+            # Eine Änderung in der Sekunde des Datums selbst ist neuer.
+            clock.time_ns.return_value = 101_700_000_000
+            Like.objects.create(user=self.user, question=self.question)
+            response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data['likes']), 1)
+
+    def test_orm_write_invalidates_only_affected_resources(self):
+        first = self.client.get(self.detail_url)
+        self.client.get(self.other_url)
+        Like.objects.create(user=self.user, question=self.question)
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['likes']), 1)
+        self.assertEqual(self.client.get(self.other_url)['X-Cache'], 'HIT')
+
+    def test_api_write_invalidates_lists(self):
+        self.client.force_authenticate(user=self.user)
+        answers_url = reverse('answer-list-create')
+        self.assertEqual(self.client.get(answers_url).data, [])
+        self.client.post(answers_url, {'content': 'New', 'author': self.user.id,
+                                       'question': self.question.id}, format='json')
+        response = self.client.get(answers_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.data), 1)
+
+    def test_moving_answer_invalidates_previous_question(self):
+        answer = Answer.objects.create(content='A', author=self.user, question=self.question)
+        self.assertEqual(len(self.client.get(self.detail_url).data['answers']), 1)
+        answer.question = self.other
+        answer.save()
+        self.assertEqual(self.client.get(self.detail_url).data['answers'], [])
+
+
+class CacheBackendTest(SimpleTestCase):
+    def test_locmem_backend_evicts_least_recently_used(self):
+        backend = LocMemLRUBackend(max_entries=2)
+        backend.set('a', b'1')
+        backend.set('b', b'2')
+        backend.get('a')
+        backend.set('c', b'3')
+        self.assertIsNone(backend.get('b'))
+        self.assertEqual(backend.get('a'), b'1')
+        self.assertEqual(len(backend), 2)
+
+    def test_file_backend_is_bounded(self):
+        with tempfile.TemporaryDirectory() as location:
+            backend = FileLRUBackend(location=location, max_entries=3, cull_frequency=1)
+            for i in range(5):
+                backend.set(f'key{i}', str(i).encode())
+            self.assertEqual(len(backend), 3)
+            self.assertEqual(backend.get('key4'), b'4')
+            self.assertIsNone(backend.get('key0'))
+
+    def test_file_backend_requires_a_private_directory(self):
+        with tempfile.TemporaryDirectory() as parent:
+            location = os.path.join(parent, 'cache')
+            FileLRUBackend(location=location)
+            self.assertEqual(stat.S_IMODE(os.stat(location).st_mode), 0o700)
+
+            os.chmod(location, 0o777)
+            with self.assertRaisesMessage(ImproperlyConfigured, '0700'):
+                FileLRUBackend(location=location)
@@ -0,0 +1,69 @@
+import io
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from django.contrib.auth.models import User
+from forum_app import search
+from forum_app.models import Question, Answer
+
+
+class FullTextSearchTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.django_question = Question.objects.create(
+            title='Django migrations', content='How do I squash migrations?', author=self.user)
+        self.react_question = Question.objects.create(
+            title='React hooks', content='When does useEffect run? Django is not involved.', author=self.user)
+        self.answer = Answer.objects.create(
+            content='Run squashmigrations in Django.', author=self.user, question=self.react_question)
+
+    def search(self, query):
+        response = self.client.get(reverse('search'), {'q': query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(hit['type'], hit['id']) for hit in response.data]
+
+    def test_search_ranks_title_matches_first(self):
+        hits = self.search('django')
+        self.assertEqual(hits[0], ('question', self.django_question.id))
+        self.assertIn(('question', self.react_question.id), hits)
+        self.assertIn(('answer', self.answer.id), hits)
+
+    def test_prefix_and_type_filter(self):
+        response = self.client.get(reverse('search'), {'q': 'squash', 'type': 'answer'})
+        self.assertEqual([hit['id'] for hit in response.data], [self.answer.id])
+        self.assertEqual(response.data[0]['question_id'], self.react_question.id)
+
+    def test_index_follows_updates_and_deletes(self):
+        self.django_question.title = 'Flask blueprints'
+        self.django_question.content = 'Routing question'
+        self.django_question.save()
+        self.assertEqual(self.search('blueprints'), [('question', self.django_question.id)])
+        self.assertNotIn(('question', self.django_question.id), self.search('django'))
+
+        # Löschen der Frage entfernt per CASCADE auch die Antwort aus dem Index.
+        self.react_question.delete()
+        self.assertEqual(self.search('django'), [])
+
+    def test_malicious_query_is_quoted(self):
+        self.assertEqual(self.search('"django OR'), self.search('django or'))
+        self.assertEqual(self.search('***'), [])
+
+    def test_answer_list_search_uses_index(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('answer-list-create') + '?search=squash')
+        self.assertEqual([item['id'] for item in response.data], [self.answer.id])
+        sql = ctx.captured_queries[-1]['sql']
+        self.assertIn('MATCH', sql)
+        self.assertNotIn('LIKE', sql)
+
+    def test_rebuild_command_restores_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {search.QUESTION_INDEX}')
+        self.assertEqual(self.search('hooks'), [])
+        call_command('rebuild_search_index', stdout=io.StringIO())
+        self.assertEqual(self.search('hooks'), [('question', self.react_question.id)])
@@ -0,0 +1,54 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from django.contrib.auth.models import User
+from forum_app.models import Question, Answer, Like
+
+
+class SparseFieldsetTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.question = Question.objects.create(title='Test Question', content='Test Content', author=self.user)
+        self.answer = Answer.objects.create(content='Test Answer', author=self.user, question=self.question)
+        Like.objects.create(user=self.user, question=self.question)
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, [query['sql'] for query in ctx.captured_queries]
+
+    def test_question_list_fields_narrow_columns(self):
+        response, queries = self.get(reverse('question-list') + '?fields=id,title')
+        self.assertEqual(set(response.data[0]), {'id', 'title'})
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"content"', queries[0])
+
+    def test_question_list_expand_fetches_only_requested_relation(self):
+        response, queries = self.get(reverse('question-list') + '?fields=id&expand=answers')
+        self.assertEqual(set(response.data[0]), {'id', 'answers'})
+        self.assertEqual(response.data[0]['answers'][0]['content'], 'Test Answer')
+        self.assertEqual(len(queries), 2)
+        self.assertFalse(any('forum_app_like' in sql for sql in queries))
+
+    def test_question_detail_expand_overrides_default(self):
+        url = reverse('question-detail', kwargs={'pk': self.question.id}) + '?expand=likes'
+        response, queries = self.get(url)
+        self.assertIn('likes', response.data)
+        self.assertNotIn('answers', response.data)
+        self.assertEqual(len(queries), 2)
+
+    def test_answer_list_fields(self):
+        response, queries = self.get(reverse('answer-list-create') + '?fields=id,question')
+        self.assertEqual(response.data, [{'id': self.answer.id, 'question': self.question.id}])
+        self.assertNotIn('"content"', queries[0].split('FROM')[0])
+
+    def test_fields_ignored_for_writes(self):
+        self.client.force_authenticate(user=self.user)
+        url = reverse('answer-detail', args=[self.answer.id]) + '?fields=id'
+        response = self.client.patch(url, {'content': 'Updated'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['content'], 'Updated')
@@ -0,0 +1,73 @@
+import tempfile
+from pathlib import Path
+
+from django.db import connections, transaction
+from django.test import SimpleTestCase, TestCase
+
+from forum_app import benchmarks, sqlite
+
+
+class SQLiteProfileTest(SimpleTestCase):
+    # Die Signal-Handler der Like-Schreibpfade prüfen per on_commit die Standardverbindung.
+    databases = {'default'}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # stress_database registriert seinen Alias erst zur Laufzeit; Verbindungen dorthin erlauben.
+        cls.databases = cls.databases | {benchmarks.STRESS_ALIAS}
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / 'forum.sqlite3'
+
+    def test_new_connections_get_pragmas(self):
+        with benchmarks.stress_database(self.path, users=2, questions=2) as (alias, _, _):
+            connections[alias].close()
+            with connections[alias].cursor() as cursor:
+                values = {name: cursor.execute(f'PRAGMA {name}').fetchone()[0]
+                          for name in ('journal_mode', 'synchronous', 'busy_timeout', 'cache_size')}
+        self.assertEqual(values, {'journal_mode': 'wal', 'synchronous': 1, 'busy_timeout': 5000,
+                                  'cache_size': -64 * 1024})
+
+    def test_none_leaves_pragma_unchanged(self):
+        config = {**sqlite.DEFAULT_SETTINGS, 'MMAP_SIZE': None, 'JOURNAL_MODE': None}
+        statements = sqlite.pragmas(config)
+        self.assertFalse([sql for sql in statements if 'mmap_size' in sql or 'journal_mode' in sql])
+        self.assertEqual(statements[0], 'PRAGMA busy_timeout = 5000')
+
+    def test_only_write_transactions_begin_immediate(self):
+        statements = []
+
+        def record(execute, sql, params, many, context):
+            statements.append(sql)
+            return execute(sql, params, many, context)
+
+        with benchmarks.stress_database(self.path, users=1, questions=1) as (alias, _, _):
+            with connections[alias].execute_wrapper(record):
+                with transaction.atomic(using=alias):
+                    pass
+                with sqlite.write_transaction(using=alias):
+                    with sqlite.write_transaction(using=alias):
+                        pass
+                with transaction.atomic(using=alias):
+                    pass
+        self.assertEqual([sql for sql in statements if sql.startswith('BEGIN')],
+                         ['BEGIN', 'BEGIN IMMEDIATE', 'BEGIN'])
+
+    def test_stress_compares_profiles(self):
+        results = benchmarks.run_stress(self.path, threads=2, duration=0.2, users=5, questions=20)
+        self.assertEqual(results['profiles']['baseline']['journal_mode'], 'delete')
+        self.assertEqual(results['profiles']['tuned']['journal_mode'], 'wal')
+        self.assertEqual(results['profiles']['baseline']['transaction_mode'], 'DEFERRED')
+        self.assertEqual(results['profiles']['tuned']['transaction_mode'], 'IMMEDIATE')
+        for result in results['profiles'].values():
+            self.assertGreater(result['operations_per_second'], 0)
+
+
+class InMemoryProfileTest(TestCase):
+    def test_test_database_is_configured_without_wal(self):
+        with connections['default'].cursor() as cursor:
+            self.assertEqual(cursor.execute('PRAGMA cache_size').fetchone()[0], -64 * 1024)
+            self.assertEqual(cursor.execute('PRAGMA journal_mode').fetchone()[0], 'memory')
@@ -0,0 +1,135 @@
+import io
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from django.contrib.auth.models import User
+from forum_app import counters, search, tasks
+from forum_app.models import Question, Answer, Task
+
+calls = []
+
+
+def record(value):
+    calls.append(value)
+
+
+def fail(value):
+    raise ValueError(f'failed {value}')
+
+
+DEFERRED = {'DEFERRED': True, 'MAX_ATTEMPTS': 2, 'RETRY_DELAY_SECONDS': 0}
+
+
+@override_settings(FORUM_TASKS=DEFERRED)
+class DeferredMaintenanceTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.question = Question.objects.create(title='Frage', content='Inhalt', author=self.user)
+        tasks.run_pending()
+        self.client.force_authenticate(self.user)
+
+    def test_answer_counters_and_index_follow_after_worker(self):
+        hot_score = Question.objects.get(pk=self.question.pk).hot_score
+        response = self.client.post(reverse('answer-list-create'),
+                                    {'question': self.question.id, 'content': 'Zitronenkuchen',
+                                     'author': self.user.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Question.objects.get(pk=self.question.pk).answer_count, 0)
+        self.assertEqual(sorted(Task.objects.values_list('name', flat=True)), [
+            'forum_app.counters.refresh_question_counters',
+            'forum_app.ranking.rescore_question',
+            'forum_app.search.refresh_answer',
+        ])
+
+        self.assertEqual(tasks.run_pending(), (3, 0))
+        question = Question.objects.get(pk=self.question.pk)
+        self.assertEqual(question.answer_count, 1)
+        self.assertGreater(question.hot_score, hot_score)
+        if search.is_available():
+            hits = search.search('Zitronenkuchen', kinds=('answer',))
+            self.assertEqual([hit['id'] for hit in hits], [response.data['id']])
+        self.assertFalse(Task.objects.exists())
+
+    def test_bulk_likes_enqueue_one_task_per_question(self):
+        other = Question.objects.create(title='Andere', content='Inhalt', author=self.user)
+        tasks.run_pending()
+        self.client.post(reverse('like-bulk'), {'questions': [self.question.id, other.id]}, format='json')
+        self.assertEqual(Task.objects.filter(name='forum_app.counters.refresh_question_counters').count(), 2)
+        tasks.run_pending()
+        self.assertEqual(sorted(Question.objects.values_list('like_count', flat=True)), [1, 1])
+
+    def test_deleted_question_is_removed_from_index(self):
+        self.question.delete()
+        tasks.run_pending()
+        if search.is_available():
+            self.assertEqual(search.search('Frage', kinds=('question',)), [])
+
+
+@override_settings(FORUM_TASKS=DEFERRED)
+class TaskQueueTest(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_duplicates_are_merged_while_pending(self):
+        tasks.enqueue(record, 1)
+        tasks.enqueue_many(record, [(1,), (2,), (1,)])
+        self.assertEqual(Task.objects.count(), 2)
+        # Läuft die Aufgabe schon, darf sie erneut eingereiht werden.
+        Task.objects.filter(args=[1]).update(status=Task.RUNNING)
+        tasks.enqueue(record, 1)
+        self.assertEqual(Task.objects.filter(args=[1]).count(), 2)
+
+    def test_failures_are_retried_then_kept(self):
+        tasks.enqueue(fail, 'x')
+        with self.assertLogs('forum_app.tasks', 'WARNING'):
+            self.assertEqual(tasks.run_pending(), (0, 1))
+        task = Task.objects.get()
+        self.assertEqual((task.status, task.attempts), (Task.PENDING, 1))
+        self.assertEqual(task.last_error, 'ValueError: failed x')
+
+        with self.assertLogs('forum_app.tasks', 'ERROR'):
+            self.assertEqual(tasks.run_pending(), (0, 1))
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), (Task.FAILED, 2))
+        self.assertEqual(tasks.run_pending(), (0, 0))
+
+    def test_retry_gives_way_to_newer_duplicate(self):
+        tasks.enqueue(fail, 'x')
+        task = tasks.claim(10)[0]
+        tasks.enqueue(fail, 'x')
+        with self.assertLogs('forum_app.tasks', 'WARNING'):
+            tasks.execute(task)
+        self.assertEqual(list(Task.objects.values_list('status', 'attempts')), [(Task.PENDING, 0)])
+
+    def test_expired_lease_is_taken_over(self):
+        tasks.enqueue(record, 1)
+        self.assertEqual(len(tasks.claim(10)), 1)
+        self.assertEqual(tasks.claim(10), [])
+        later = timezone.now() + timedelta(seconds=tasks.get_settings()['LEASE_SECONDS'] + 1)
+        self.assertEqual(len(tasks.claim(10, now=later)), 1)
+
+    def test_command_runs_due_tasks(self):
+        tasks.enqueue_many(record, [(1,), (2,)])
+        out = io.StringIO()
+        call_command('run_tasks', stdout=out)
+        self.assertIn('Ran 2 tasks, 0 failed', out.getvalue())
+        self.assertEqual(calls, [1, 2])
+
+    @override_settings(FORUM_TASKS={'DEFERRED': False})
+    def test_not_deferred_runs_inline(self):
+        tasks.enqueue(record, 1)
+        self.assertEqual(calls, [1])
+        self.assertFalse(Task.objects.exists())
+
+    def test_refresh_question_counters_counts_rows(self):
+        user = User.objects.create_user(username='testuser', password='password')
+        question = Question.objects.create(title='Frage', content='Inhalt', author=user)
+        Answer.objects.create(question=question, content='Antwort', author=user)
+        counters.refresh_question_counters(question.pk)
+        self.assertEqual(Question.objects.get(pk=question.pk).answer_count, 1)
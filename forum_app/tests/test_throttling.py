@@ -0,0 +1,86 @@
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from django.contrib.auth.models import User
+from forum_app.api import throttling
+from forum_app.api.throttling import (
+    LocMemThrottleStore, SQLiteThrottleStore, retry_after)
+from forum_app.models import Question
+
+
+class ThrottleStoreTest(SimpleTestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.location = os.path.join(self.tmpdir.name, 'throttle.sqlite3')
+
+    def stores(self):
+        return [LocMemThrottleStore(), SQLiteThrottleStore(self.location)]
+
+    def test_limit_within_window(self):
+        for store in self.stores():
+            with self.subTest(store=type(store).__name__):
+                results = [store.hit('k', 3, 60, now=600 + i).allowed for i in range(5)]
+                self.assertEqual(results, [True, True, True, False, False])
+
+    def test_previous_window_decays(self):
+        for store in self.stores():
+            with self.subTest(store=type(store).__name__):
+                for _ in range(4):
+                    store.hit('k', 4, 60, now=600)
+                # 15s ins nächste Fenster: 4 * 0.75 = 3 -> noch genau ein Request frei.
+                self.assertTrue(store.hit('k', 4, 60, now=675).allowed)
+                self.assertFalse(store.hit('k', 4, 60, now=675).allowed)
+                # Ein ganzes Fenster später zählt nur noch der vorige Request.
+                self.assertTrue(store.hit('k', 4, 60, now=750).allowed)
+                # Nach zwei leeren Fenstern ist alles vergessen.
+                hit = store.hit('k', 4, 60, now=1000)
+                self.assertEqual((hit.current, hit.previous), (1, 0))
+
+    def test_state_is_shared_between_store_instances(self):
+        first, second = SQLiteThrottleStore(self.location), SQLiteThrottleStore(self.location)
+        first.hit('k', 2, 60, now=600)
+        first.hit('k', 2, 60, now=600)
+        self.assertFalse(second.hit('k', 2, 60, now=600).allowed)
+        self.assertTrue(second.hit('other', 2, 60, now=600).allowed)
+
+    def test_retry_after(self):
+        store = LocMemThrottleStore()
+        for _ in range(3):
+            store.hit('k', 2, 60, now=600)
+        hit = store.hit('k', 2, 60, now=615)
+        self.assertFalse(hit.allowed)
+        # Rest des Fensters (45s) + bis 2 * (1 - f) < 2 gilt (f > 0, also sofort).
+        self.assertAlmostEqual(retry_after(hit, 2, 60), 45)
+
+
+class TestStoreTest(SimpleTestCase):
+    def test_suite_does_not_touch_the_shared_file(self):
+        # Siehe forum_app/tests/runner.py.
+        self.assertIsInstance(throttling.throttle_store, LocMemThrottleStore)
+
+
+class MethodScopedThrottleTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.client.force_authenticate(self.user)
+
+    def test_post_uses_its_own_scope(self):
+        url = reverse('question-list')
+        data = {'title': 'Title', 'content': 'Content', 'author': self.user.id}
+        # 'question-post': 2/day
+        for _ in range(2):
+            self.assertEqual(self.client.post(url, data, format='json').status_code,
+                             status.HTTP_201_CREATED)
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(Question.objects.count(), 2)
+
+        # Lesen hat ein eigenes Kontingent ('question-get').
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)